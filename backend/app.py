@@ -1,12 +1,31 @@
 import os
+import atexit
+import hmac
+import ipaddress
 import logging
-from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_file
+import time
+from datetime import datetime, timedelta
+from flask import Flask, Response, request, jsonify, render_template, send_file, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
-import io
+import json
+from urllib.parse import unquote, urlparse
 
-from scraper import ECourtsScraper
+from scraper import DelhiHighCourtScraper, ECourtsScraper, portal_url
+from cache import CaseCache, TTLCache, make_case_key
+from courts import CourtBackend, CourtBusy, CourtRegistry, UnknownCourt
+from breaker import CircuitOpen, HostBreakers
+from ratelimit import HostRateLimiter
+from singleflight import SingleFlight
+from jobs import JobManager, JobQueueFull
+from bulk import BulkSearchRunner, PolitenessGate, parse_cases_csv
+from documents import DocumentCache, DocumentTooLarge
+from prefetch import PdfPrefetcher
+from querylog import QueryLogWriter
+from profiling import SearchProfiler
+from watcher import CaseWatcher
+from revalidate import Revalidator, case_age
+from metrics import REGISTRY, CACHE_REQUESTS, CONTENT_CHECKS, SEARCH_SECONDS, SEARCHES_IN_FLIGHT, STAGE_SECONDS
 
 # Load environment variables
 load_dotenv()
@@ -33,14 +52,338 @@ CASE_TYPES = [
 ]
 
 
+# Statuses returned by the scraper when the portal response could not be used
+FAILED_STATUSES = ['data extraction failed', 'response not json or unexpected format']
+
+
+def _is_truthy(value):
+    """Interpret a request flag such as refresh=1 or refresh=true"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 # Database imports
 from database import (
-    log_query, save_case_details, save_orders_judgments, get_query_history, get_case_statistics
+    log_query, save_case_details, save_orders_judgments, get_query_history, iter_query_history, get_case_statistics,
+    get_fresh_case_result, save_search_job, get_search_job, save_search_batch,
+    get_recent_order_documents, update_document_file_size, insert_query_log_batch, get_query_breakdown,
+    apply_case_changes, add_watched_case, remove_watched_case, list_watched_cases, claim_due_watches,
+    finish_watch_check, get_change_events, get_case_fingerprint, mark_case_unchanged
+)
+
+
+# Per-host circuit breakers: after BREAKER_FAILURE_THRESHOLD consecutive failures,
+# timeouts or block pages a portal is failed fast until a trial search succeeds
+breakers = None
+if _is_truthy(os.getenv('BREAKER_ENABLED', 'true')):
+    breakers = HostBreakers(
+        failure_threshold=int(os.getenv('BREAKER_FAILURE_THRESHOLD', 5)),
+        reset_timeout=float(os.getenv('BREAKER_RESET_SECONDS', 30)),
+        max_reset_timeout=float(os.getenv('BREAKER_MAX_RESET_SECONDS', 600))
+    )
+
+# While a portal's circuit is open, searches fall back to stored copies up to this old
+BREAKER_SERVE_STALE = _is_truthy(os.getenv('BREAKER_SERVE_STALE', 'true'))
+STALE_MAX_AGE = int(os.getenv('STALE_MAX_AGE', 30 * 24 * 3600))
+
+# Per-host politeness budget shared by every scraper in this process
+# (and across workers when RATE_LIMIT_STORE points at a local SQLite file)
+rate_limiter = HostRateLimiter(
+    rate=float(os.getenv('RATE_LIMIT_RPS', 0.5)),
+    burst=int(os.getenv('RATE_LIMIT_BURST', 2)),
+    min_rate=float(os.getenv('RATE_LIMIT_MIN_RPS', 0.05)),
+    host_rates=json.loads(os.getenv('RATE_LIMIT_HOST_RPS', '{}')),
+    store_path=os.getenv('RATE_LIMIT_STORE') or None,
+    breakers=breakers
 )
 
 
-# Initialize the Delhi High Court scraper
-scraper = ECourtsScraper()
+def _build_scraper(engine, base_url=None):
+    """Create a court scraper for an engine name: sync (JSON), async (JSON over httpx) or html"""
+    if engine == 'async':
+        from async_scraper import SyncAsyncScraper
+        return SyncAsyncScraper(
+            max_connections=int(os.getenv('ASYNC_SCRAPER_MAX_CONNECTIONS', 20)),
+            max_concurrency=int(os.getenv('ASYNC_SCRAPER_MAX_CONCURRENCY', 10)),
+            rate_limiter=rate_limiter,
+            base_url=base_url
+        )
+    scraper_class = DelhiHighCourtScraper if engine == 'html' else ECourtsScraper
+    court_scraper = scraper_class(
+        rate_limiter=rate_limiter,
+        pool_size=int(os.getenv('SESSION_POOL_SIZE', 4)),
+        token_ttl=int(os.getenv('SESSION_TOKEN_TTL', 600)),
+        base_url=base_url
+    )
+    if int(os.getenv('SESSION_REFRESH_INTERVAL', 30)) > 0:
+        court_scraper.session_pool.start_refresher(int(os.getenv('SESSION_REFRESH_INTERVAL', 30)))
+    return court_scraper
+
+
+# Court backends: the Delhi High Court by default, plus any courts configured in
+# COURTS as JSON keyed by court code, e.g.
+# {"dhc_html": {"name": "Delhi High Court (case status page)", "engine": "html", "base_url": "...", "max_concurrency": 2, "rate": 0.2}}
+DEFAULT_COURT = os.getenv('DEFAULT_COURT', 'delhi_hc')
+COURT_CONFIG = {DEFAULT_COURT: {'name': 'Delhi High Court', 'engine': os.getenv('SCRAPER_ENGINE', 'sync')}}
+COURT_CONFIG.update(json.loads(os.getenv('COURTS', '{}')))
+courts = CourtRegistry()
+for court_code, court_config in COURT_CONFIG.items():
+    court_base_url = (court_config.get('base_url') or portal_url()).rstrip('/')
+    court_host = HostRateLimiter.host_for(court_base_url)
+    if court_config.get('rate'):
+        rate_limiter.host_rates[court_host] = float(court_config['rate'])
+    # Cases outside the default court are stored under "<court code>:" ids
+    court_namespace = '' if court_code == DEFAULT_COURT else court_code
+    courts.register(CourtBackend(
+        court_code,
+        court_config.get('name', court_code),
+        _build_scraper(court_config.get('engine', 'sync'), court_base_url),
+        CaseCache(
+            ttl=int(os.getenv('CASE_CACHE_TTL', 900)),
+            max_entries=int(os.getenv('CASE_CACHE_MAX_ENTRIES', 1024)),
+            db_loader=lambda case_id, max_age, code=court_code: _load_stored_case(
+                courts.get(code), case_id, max_age
+            ),
+            namespace=court_namespace
+        ),
+        court_host,
+        namespace=court_namespace,
+        max_concurrency=int(court_config.get('max_concurrency', os.getenv('COURT_MAX_CONCURRENCY', 8))),
+        acquire_timeout=float(court_config.get('acquire_timeout', os.getenv('COURT_ACQUIRE_TIMEOUT', 5))),
+        breaker=breakers.get(court_host) if breakers else None
+    ), default=court_code == DEFAULT_COURT)
+
+# Re-fetches send the stored ETag/Last-Modified and skip parsing when the content hash matches
+CONDITIONAL_FETCH = _is_truthy(os.getenv('CONDITIONAL_FETCH', 'true'))
+
+# Database statistics come from maintained counters; cache them briefly as well
+stats_cache = TTLCache(max_entries=32, ttl=int(os.getenv('STATS_CACHE_TTL', 10)))
+
+# Opt-in cProfile capture of slow searches, read back through the admin endpoints
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+profiler = SearchProfiler(
+    sample_rate=float(os.getenv('PROFILE_SAMPLE_RATE', 0)),
+    threshold=float(os.getenv('PROFILE_THRESHOLD_SECONDS', 2.0)),
+    keep=int(os.getenv('PROFILE_KEEP', 20))
+)
+
+# Coalesce concurrent searches for the same case (optionally across workers)
+search_flight = SingleFlight(lock_dir=os.getenv('SINGLEFLIGHT_LOCK_DIR') or None)
+
+
+class _DatabaseJobStore:
+    """Persist job state so any gunicorn worker can answer a poll"""
+
+    def save(self, job):
+        with app.app_context():
+            save_search_job(job)
+
+    def load(self, job_id):
+        return get_search_job(job_id)
+
+
+# Worker pool for asynchronous searches (POST /api/search?async=1)
+search_jobs = JobManager(
+    max_workers=int(os.getenv('SEARCH_JOB_WORKERS', 4)),
+    max_pending=int(os.getenv('SEARCH_JOB_MAX_PENDING', 100)),
+    result_ttl=int(os.getenv('SEARCH_JOB_RESULT_TTL', 3600)),
+    store=_DatabaseJobStore()
+)
+
+# Bulk lookups: per-request concurrency cap and a process-wide politeness rate
+BULK_MAX_CASES = int(os.getenv('BULK_MAX_CASES', 1000))
+BULK_MAX_CONCURRENCY = int(os.getenv('BULK_MAX_CONCURRENCY', 4))
+BULK_BATCH_SIZE = int(os.getenv('BULK_BATCH_SIZE', 50))
+bulk_gate = PolitenessGate(float(os.getenv('BULK_RATE_PER_SECOND', 1.0)))
+
+# Downloaded orders/judgments are cached on disk and streamed to clients
+DOWNLOAD_ALLOWED_HOSTS = [host.strip().lower() for host in os.getenv('DOWNLOAD_ALLOWED_HOSTS', ','.join(backend.host for backend in courts)).split(',') if host.strip()]
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+document_cache = DocumentCache(
+    os.getenv('DOCUMENT_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'document_cache')),
+    max_bytes=int(os.getenv('DOCUMENT_CACHE_MAX_MB', 1024)) * 1024 * 1024,
+    max_file_bytes=int(os.getenv('DOCUMENT_MAX_FILE_MB', 50)) * 1024 * 1024
+)
+
+
+def _with_app_context(fn):
+    """Wrap a database helper so background threads can call it"""
+    def wrapper(*args):
+        with app.app_context():
+            return fn(*args)
+    return wrapper
+
+
+# Optional background prefetch of the latest order PDFs after a search
+prefetcher = None
+if _is_truthy(os.getenv('PREFETCH_ENABLED', 'false')):
+    prefetcher = PdfPrefetcher(
+        document_cache,
+        lambda url, max_bytes: _document_court(url).open_pdf(url, max_bytes=max_bytes),
+        _with_app_context(get_recent_order_documents),
+        _with_app_context(update_document_file_size),
+        latest=int(os.getenv('PREFETCH_LATEST_N', 3)),
+        max_workers=int(os.getenv('PREFETCH_WORKERS', 2)),
+        busy=lambda: any(rate_limiter.queue_depth(host) for host in DOWNLOAD_ALLOWED_HOSTS),
+        # Only what /api/download would serve, fetched through the court that hosts it
+        allow_url=lambda url: _is_allowed_document_url(url) and _document_court(url) is not None
+    )
+
+
+# Query log rows are buffered and written in batches off the request path
+query_log = None
+if _is_truthy(os.getenv('QUERY_LOG_ASYNC', 'true')):
+    query_log = QueryLogWriter(
+        _with_app_context(insert_query_log_batch),
+        max_queue=int(os.getenv('QUERY_LOG_MAX_QUEUE', 10000)),
+        batch_size=int(os.getenv('QUERY_LOG_BATCH_SIZE', 200)),
+        flush_interval=float(os.getenv('QUERY_LOG_FLUSH_INTERVAL', 1.0)),
+        policy=os.getenv('QUERY_LOG_POLICY', 'drop')
+    )
+    atexit.register(query_log.close)
+
+
+def _client_ip():
+    """First X-Forwarded-For address (or the peer address), if it is a valid IP for the INET column"""
+    forwarded = request.environ.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
+    for candidate in (forwarded, request.remote_addr):
+        try:
+            return str(ipaddress.ip_address(candidate))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _log_query(**query):
+    """Queue a query log row, or write it synchronously when buffering is off"""
+    with STAGE_SECONDS.time(stage='log_query'):
+        if query_log is not None:
+            query_log.submit(**query)
+        else:
+            log_query(**query)
+
+
+def _watch_fetch(case_type, case_number, filing_year, court=None):
+    """Scrape a watched case, treating unusable portal responses as failures"""
+    result = _scrape(courts.get(court), case_type, case_number, filing_year)
+    if _is_failed_result(result):
+        raise ValueError(result['case_details'].get('status') or 'Data extraction failed')
+    return result
+
+
+def _watch_changed(watched, result, events):
+    """Keep the case cache in step with changes the watcher found"""
+    courts.get(watched.get('court')).cache.put(watched['case_type'], watched['case_number'], watched['filing_year'], {
+        'case_details': result['case_details'],
+        'orders_judgments': result['orders_judgments'],
+        'last_updated': datetime.utcnow().isoformat()
+    })
+
+
+# Optional background refresher that re-checks watched cases and records changes
+watcher = None
+if _is_truthy(os.getenv('WATCHER_ENABLED', 'false')):
+    watcher = CaseWatcher(
+        _with_app_context(_watch_fetch),
+        _with_app_context(claim_due_watches),
+        _with_app_context(apply_case_changes),
+        _with_app_context(finish_watch_check),
+        on_changes=_watch_changed,
+        tick=float(os.getenv('WATCHER_TICK_SECONDS', 60)),
+        batch=int(os.getenv('WATCHER_BATCH', 20)),
+        lease=int(os.getenv('WATCHER_LEASE_SECONDS', 600)),
+        retry_delay=int(os.getenv('WATCHER_RETRY_SECONDS', 900))
+    )
+    watcher.start()
+
+
+def _revalidate_case(court_code, case_type, case_number, filing_year):
+    """Re-scrape a stale stored case, updating the database and the court's cache"""
+    result = _fetch_case(courts.get(court_code), case_type, case_number, filing_year)
+    return {'case_id': result['case_details'].get('case_id'), 'content': result.get('content', 'changed')}
+
+
+# Stale-while-revalidate searches: stored cases are served at once and re-scraped in the background
+# once older than their status's freshness window (disposed cases hardly ever change)
+SWR_DEFAULT = _is_truthy(os.getenv('SWR_DEFAULT', 'false'))
+revalidator = Revalidator(
+    search_jobs,
+    _with_app_context(_revalidate_case),
+    fresh_seconds=int(os.getenv('SWR_FRESH_SECONDS', 3600)),
+    status_fresh=json.loads(os.getenv('SWR_STATUS_FRESH_SECONDS', '{"disposed": 2592000, "dismissed": 2592000}'))
+)
+
+
+def _is_failed_result(result):
+    """Check whether a scraper result carries a failed-extraction status"""
+    return (result['case_details'].get('status') or '').lower() in FAILED_STATUSES
+
+
+def _load_stored_case(court, case_id, max_age):
+    """Serve fresh, successfully parsed cases stored in the database, shaped like a scrape"""
+    result = get_fresh_case_result(case_id, max_age)
+    if result is None or _is_failed_result(result):
+        return None
+    return court.stored_result(result)
+
+
+def _scrape(court, case_type, case_number, filing_year):
+    """Scrape a case, reusing the stored copy when the portal content is unchanged"""
+    case_id = court.case_id(case_type, case_number, filing_year)
+    fingerprint = get_case_fingerprint(case_id) if CONDITIONAL_FETCH else None
+    result = court.search_case(case_type, case_number, filing_year, fingerprint=fingerprint)
+    if result.get('content') == 'unchanged':
+        stored = mark_case_unchanged(case_id, result['fingerprint'])
+        if stored is not None:
+            CONTENT_CHECKS.inc(result='unchanged')
+            result.update(court.stored_result(stored))
+            return result
+        # The stored case disappeared after its fingerprint was read
+        result = court.search_case(case_type, case_number, filing_year)
+    if fingerprint:
+        CONTENT_CHECKS.inc(result='changed')
+    if _is_failed_result(result):
+        # Clear the stored hash so an identical later response is parsed again
+        result['fingerprint'] = {'content_hash': None, 'etag': None, 'last_modified': None}
+    return result
+
+
+def _fetch_and_store(court, case_type, case_number, filing_year, store=True):
+    """Scrape a case once, persist it and refresh the court's cache"""
+    result = _scrape(court, case_type, case_number, filing_year)
+    if store and result.get('content') != 'unchanged':
+        db_started = time.perf_counter()
+        # Save case details and orders to DB (if case_details is present)
+        case_detail_id = save_case_details(
+            result['case_details'], result.get('fingerprint')
+        ) if result.get('case_details') else None
+        if case_detail_id and result.get('orders_judgments'):
+            if save_orders_judgments(case_detail_id, result['orders_judgments']) and prefetcher:
+                prefetcher.schedule(result['case_details']['case_id'])
+        STAGE_SECONDS.observe(time.perf_counter() - db_started, stage='db_save')
+    # Fresh scrapes and stored copies carry the same last_updated stamp
+    result.setdefault('last_updated', datetime.utcnow().isoformat())
+    if not _is_failed_result(result):
+        court.cache.put(case_type, case_number, filing_year, {
+            'case_details': result['case_details'],
+            'orders_judgments': result['orders_judgments'],
+            'last_updated': result['last_updated']
+        })
+    return result
+
+
+def _fetch_case(court, case_type, case_number, filing_year, store=True):
+    """Fetch a case, sharing one upstream search between concurrent callers.
+
+    With store=False the caller is responsible for persisting the result.
+    """
+    case_id = court.case_id(case_type, case_number, filing_year)
+    return search_flight.do(
+        (court.code,) + make_case_key(case_type, case_number, filing_year),
+        lambda: _fetch_and_store(court, case_type, case_number, filing_year, store),
+        recheck=lambda waited: _load_stored_case(court, case_id, waited + 1)
+    )
 
 @app.route('/')
 def index():
@@ -48,6 +391,14 @@ def index():
     current_year = datetime.now().year
     return render_template('index.html', case_types=CASE_TYPES, current_year=current_year)
 
+@app.route('/api/courts')
+def get_courts():
+    """List the courts searches can be routed to"""
+    return jsonify({
+        'success': True,
+        'courts': courts.list()
+    })
+
 @app.route('/api/case-types')
 def get_case_types():
     """Get available case types"""
@@ -63,75 +414,202 @@ def get_case_types():
             'error': 'Failed to fetch case types'
         }), 500
 
+def _validate_search_params(data):
+    """Validate search fields, returning (case_type, case_number, filing_year) or an error message"""
+    case_type = str(data.get('case_type') or '').strip()
+    case_number = str(data.get('case_number') or '').strip()
+    filing_year = data.get('filing_year')
+    # Validation
+    if not all([case_type, case_number, filing_year]):
+        return None, 'All fields (case type, case number, filing year) are required'
+    try:
+        filing_year = int(filing_year)
+        if filing_year < 1950 or filing_year > datetime.now().year:
+            raise ValueError("Invalid year")
+    except ValueError:
+        return None, 'Please enter a valid filing year'
+    return (case_type, case_number, filing_year), None
+
+
+def _resolve_court(code):
+    """Court backend for a requested court code, or an error message"""
+    try:
+        return courts.get(code), None
+    except UnknownCourt as e:
+        return None, str(e)
+
+
+def _run_search(court, case_type, case_number, filing_year, refresh=False, client_ip=None, force_profile=False,
+                swr=False):
+    """Resolve a search through the cache or the scraper and log the query.
+
+    With swr and no refresh, a stored copy of the case is returned instead
+    of scraping and revalidated in the background when it is stale. Returns
+    the response payload; scraper errors are logged and re-raised.
+    """
+    started = time.perf_counter()
+    source = 'error'
+    with SEARCHES_IN_FLIGHT.track_inprogress(), \
+            profiler.profile(court.case_id(case_type, case_number, filing_year), forced=force_profile):
+        try:
+            payload = _resolve_search(court, case_type, case_number, filing_year, refresh, client_ip, swr)
+            source = 'stale' if payload['stale'] else 'cache' if payload['cached'] else 'scraper'
+            return payload
+        finally:
+            SEARCH_SECONDS.observe(time.perf_counter() - started, source=source)
+
+
+def _load_stale_case(court, case_type, case_number, filing_year):
+    """Last stored copy of a case, for when the court portal is unavailable"""
+    if not BREAKER_SERVE_STALE:
+        return None
+    return _load_stored_case(court, court.case_id(case_type, case_number, filing_year), STALE_MAX_AGE)
+
+
+def _resolve_search(court, case_type, case_number, filing_year, refresh, client_ip, swr=False):
+    try:
+        cached = False
+        stale = False
+        revalidating = False
+        result = None
+        if refresh:
+            court.cache.record_bypass()
+            CACHE_REQUESTS.inc(result='bypass')
+        else:
+            result = court.cache.get(case_type, case_number, filing_year)
+            cached = result is not None
+            CACHE_REQUESTS.inc(result='hit' if cached else 'miss')
+        if result is None and swr and not refresh:
+            result = _load_stored_case(court, court.case_id(case_type, case_number, filing_year), STALE_MAX_AGE)
+            if result is not None:
+                cached = True
+                stale = revalidator.is_stale(result['case_details'], case_age(result))
+                if stale:
+                    revalidating = revalidator.schedule(
+                        (court.code,) + make_case_key(case_type, case_number, filing_year),
+                        court.code, case_type, case_number, filing_year,
+                        params={'court': court.code, 'case_type': case_type, 'case_number': case_number,
+                                'filing_year': filing_year, 'revalidate': True}
+                    )
+        if result is None:
+            # Fetch real data through the court's scraper
+            try:
+                result = _fetch_case(court, case_type, case_number, filing_year)
+            except CircuitOpen:
+                # Serve the last stored copy, flagged as stale, while the portal is down
+                result = _load_stale_case(court, case_type, case_number, filing_year)
+                if result is None:
+                    raise
+                stale = True
+    except Exception as search_error:
+        error_message = str(search_error)
+        app.logger.error(f"Search error: {error_message}")
+        # Log query as failed
+        _log_query(
+            case_type=case_type,
+            case_number=case_number,
+            filing_year=filing_year,
+            success=False,
+            error_message=error_message,
+            raw_response=None,
+            parsed_data=None,
+            ip_address=client_ip
+        )
+        raise
+    case_id = result['case_details'].get('case_id')
+    failed = _is_failed_result(result)
+    # Log query as successful if status is not error
+    _log_query(
+        case_type=case_type,
+        case_number=case_number,
+        filing_year=filing_year,
+        success=not failed,
+        error_message=result['case_details'].get('status') if failed else None,
+        raw_response=result.get('raw_html'),
+        parsed_data=result['case_details'],
+        ip_address=client_ip
+    )
+    app.logger.info(f"Search successful: {case_id} (cached={cached}, stale={stale})")
+    return {
+        'cached': cached,
+        'stale': stale,
+        'age_seconds': case_age(result),
+        'revalidating': revalidating,
+        'content': None if stale else 'unchanged' if cached else result.get('content', 'changed'),
+        'data': {
+            'case_details': result['case_details'],
+            'orders_judgments': result['orders_judgments']
+        }
+    }
+
+
+def _run_search_job(court, case_type, case_number, filing_year, refresh, client_ip):
+    """Run a queued search on a worker thread"""
+    with app.app_context():
+        return _run_search(court, case_type, case_number, filing_year, refresh, client_ip)
+
 @app.route('/api/search', methods=['POST'])
 def search_case():
     """Search for a case - Real implementation using database"""
     try:
-        data = request.get_json()
-        case_type = data.get('case_type', '').strip()
-        case_number = data.get('case_number', '').strip()
-        filing_year = data.get('filing_year')
-        # Validation
-        if not all([case_type, case_number, filing_year]):
+        data = request.get_json() or {}
+        params, error = _validate_search_params(data)
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'All fields (case type, case number, filing year) are required'
+                'error': error
             }), 400
-        try:
-            filing_year = int(filing_year)
-            if filing_year < 1950 or filing_year > datetime.now().year:
-                raise ValueError("Invalid year")
-        except ValueError:
+        case_type, case_number, filing_year = params
+        court, error = _resolve_court(data.get('court', request.args.get('court')))
+        if error:
             return jsonify({
                 'success': False,
-                'error': 'Please enter a valid filing year'
+                'error': error
             }), 400
-        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-        try:
-            # Fetch real data using the new Delhi High Court scraper
-            result = scraper.search_case(case_type, case_number, filing_year)
-            # Save case details and orders to DB (if case_details is present)
-            case_id = result['case_details'].get('case_id')
-            case_detail_id = save_case_details(result['case_details']) if result.get('case_details') else None
-            if case_detail_id and result.get('orders_judgments'):
-                save_orders_judgments(case_detail_id, result['orders_judgments'])
-            # Log query as successful if status is not error
-            log_query(
-                case_type=case_type,
-                case_number=case_number,
-                filing_year=filing_year,
-                success=True if result['case_details'].get('status', '').lower() not in ['data extraction failed', 'response not json or unexpected format'] else False,
-                error_message=None if result['case_details'].get('status', '').lower() not in ['data extraction failed', 'response not json or unexpected format'] else result['case_details'].get('status'),
-                raw_response=result.get('raw_html'),
-                parsed_data=result['case_details'],
-                ip_address=client_ip
-            )
-            app.logger.info(f"Search successful: {case_id}")
+        client_ip = _client_ip()
+        refresh = _is_truthy(data.get('refresh', request.args.get('refresh', False)))
+        if _is_truthy(data.get('async', request.args.get('async', False))):
+            try:
+                job_id = search_jobs.submit(
+                    _run_search_job, court, case_type, case_number, filing_year, refresh, client_ip,
+                    params={'court': court.code, 'case_type': case_type, 'case_number': case_number,
+                            'filing_year': filing_year}
+                )
+            except JobQueueFull as queue_error:
+                return jsonify({
+                    'success': False,
+                    'error': str(queue_error)
+                }), 503
             return jsonify({
                 'success': True,
-                'data': {
-                    'case_details': result['case_details'],
-                    'orders_judgments': result['orders_judgments']
-                }
-            })
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f"/api/jobs/{job_id}"
+            }), 202
+        try:
+            # Admins can ask for this search to be profiled with an X-Profile header
+            force_profile = _is_truthy(request.headers.get('X-Profile', False)) and _is_admin()
+            # swr: answer from the stored copy right away and refresh it in the background
+            swr = _is_truthy(data.get('swr', request.args.get('swr', SWR_DEFAULT)))
+            payload = _run_search(court, case_type, case_number, filing_year, refresh, client_ip, force_profile, swr)
+        except CourtBusy as busy_error:
+            return jsonify({
+                'success': False,
+                'error': str(busy_error)
+            }), 503
+        except CircuitOpen as open_error:
+            retry_after = max(1, round(open_error.retry_after))
+            return jsonify({
+                'success': False,
+                'error': str(open_error),
+                'retry_after': retry_after
+            }), 503, {'Retry-After': str(retry_after)}
         except Exception as search_error:
-            error_message = str(search_error)
-            app.logger.error(f"Search error: {error_message}")
-            # Log query as failed
-            log_query(
-                case_type=case_type,
-                case_number=case_number,
-                filing_year=filing_year,
-                success=False,
-                error_message=error_message,
-                raw_response=None,
-                parsed_data=None,
-                ip_address=client_ip
-            )
             return jsonify({
                 'success': False,
-                'error': error_message
+                'error': str(search_error)
             }), 404
+        return jsonify(dict(success=True, **payload))
     except Exception as e:
         app.logger.error(f"Unexpected error in search_case: {str(e)}")
         return jsonify({
@@ -139,39 +617,324 @@ def search_case():
             'error': 'An unexpected error occurred. Please try again later.'
         }), 500
 
+def _bulk_lookup(case, refresh, client_ip, default_court=None):
+    """Resolve one bulk case on a pool thread without writing to the database"""
+    with app.app_context():
+        if not isinstance(case, dict):
+            return {'input': case, 'success': False, 'cached': False, 'result': None,
+                    'error': 'Each case must be an object with case_type, case_number and filing_year'}
+        params, error = _validate_search_params(case)
+        court = None
+        if not error:
+            court, error = _resolve_court(case.get('court') or default_court)
+        outcome = {'input': case, 'success': False, 'cached': False, 'result': None, 'error': error}
+        if error:
+            return outcome
+        case_type, case_number, filing_year = params
+        outcome['query'] = {
+            'case_type': case_type,
+            'case_number': case_number,
+            'filing_year': filing_year,
+            'ip_address': client_ip
+        }
+        try:
+            result = None if refresh else court.cache.get(case_type, case_number, filing_year)
+            outcome['cached'] = result is not None
+            if result is None:
+                bulk_gate.wait()
+                result = _fetch_case(court, case_type, case_number, filing_year, store=False)
+        except Exception as search_error:
+            outcome['error'] = str(search_error)
+            outcome['query'].update(success=False, error_message=outcome['error'])
+            return outcome
+        failed = _is_failed_result(result)
+        outcome.update(success=not failed, result=result)
+        outcome['query'].update(
+            success=not failed,
+            error_message=result['case_details'].get('status') if failed else None,
+            raw_response=result.get('raw_html'),
+            parsed_data=result['case_details']
+        )
+        return outcome
+
+
+def _persist_bulk_outcomes(outcomes):
+    """Write a batch of bulk results and their query log rows in one transaction"""
+    results = [outcome['result'] for outcome in outcomes if outcome['result'] and not outcome['cached']]
+    saved = save_search_batch(results, [outcome['query'] for outcome in outcomes if outcome.get('query')])
+    if saved and prefetcher:
+        for result in results:
+            if result.get('orders_judgments'):
+                prefetcher.schedule(result['case_details']['case_id'])
+
+@app.route('/api/search/bulk', methods=['POST'])
+def bulk_search():
+    """Look up many cases at once, streaming NDJSON results as they complete"""
+    try:
+        if 'file' in request.files:
+            cases = parse_cases_csv(request.files['file'].read().decode('utf-8-sig'))
+            options = request.form
+        else:
+            data = request.get_json() or {}
+            if not isinstance(data, dict):
+                raise ValueError('expected a JSON object with a cases list')
+            cases = data.get('cases') or []
+            options = data
+        if not isinstance(cases, list) or not cases:
+            return jsonify({
+                'success': False,
+                'error': 'Provide a non-empty list of cases or a CSV file'
+            }), 400
+        if len(cases) > BULK_MAX_CASES:
+            return jsonify({
+                'success': False,
+                'error': f'At most {BULK_MAX_CASES} cases can be looked up per request'
+            }), 400
+        concurrency = int(options.get('concurrency') or BULK_MAX_CONCURRENCY)
+        refresh = _is_truthy(options.get('refresh', False))
+        default_court = courts.get(options.get('court')).code
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid bulk request: {str(e)}'
+        }), 400
+    client_ip = _client_ip()
+    runner = BulkSearchRunner(
+        lambda case: _bulk_lookup(case, refresh, client_ip, default_court),
+        _persist_bulk_outcomes,
+        max_concurrency=BULK_MAX_CONCURRENCY,
+        batch_size=BULK_BATCH_SIZE
+    )
+
+    def generate():
+        succeeded = 0
+        for index, outcome in runner.run(cases, concurrency):
+            succeeded += 1 if outcome['success'] else 0
+            line = {
+                'index': index,
+                'input': outcome['input'],
+                'success': outcome['success'],
+                'cached': outcome['cached']
+            }
+            if outcome['result']:
+                line['content'] = 'unchanged' if outcome['cached'] else outcome['result'].get('content', 'changed')
+                line['data'] = {
+                    'case_details': outcome['result']['case_details'],
+                    'orders_judgments': outcome['result']['orders_judgments']
+                }
+            if outcome['error']:
+                line['error'] = outcome['error']
+            yield json.dumps(line, default=str) + '\n'
+        yield json.dumps({'summary': {'total': len(cases), 'succeeded': succeeded, 'failed': len(cases) - succeeded}}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Get the status and result of an asynchronous search job"""
+    job = search_jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found or expired'
+        }), 404
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+@app.route('/api/watchlist', methods=['GET'])
+def get_watchlist():
+    """List watched cases with their refresh schedule"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': list_watched_cases()
+        })
+    except Exception as e:
+        app.logger.error(f"Error fetching watchlist: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to fetch watchlist'
+        }), 500
+
+@app.route('/api/watchlist', methods=['POST'])
+def watch_case():
+    """Add a case to the watchlist so it is refreshed in the background"""
+    try:
+        data = request.get_json() or {}
+        params, error = _validate_search_params(data)
+        court = None
+        if not error:
+            court, error = _resolve_court(data.get('court'))
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        return jsonify({
+            'success': True,
+            'data': add_watched_case(court.case_id(*params), *params, court=court.code)
+        }), 201
+    except Exception as e:
+        app.logger.error(f"Error watching case: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to watch case'
+        }), 500
+
+@app.route('/api/watchlist/<path:case_id>', methods=['DELETE'])
+def unwatch_case(case_id):
+    """Stop watching a case; its recorded change events are kept"""
+    try:
+        if not remove_watched_case(case_id):
+            return jsonify({
+                'success': False,
+                'error': 'Case is not being watched'
+            }), 404
+        return jsonify({'success': True})
+    except Exception as e:
+        app.logger.error(f"Error unwatching case: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to unwatch case'
+        }), 500
+
+@app.route('/api/watchlist/events')
+def get_watchlist_events():
+    """Change events detected for watched cases, newest first"""
+    try:
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        return jsonify({
+            'success': True,
+            'data': get_change_events(request.args.get('case_id') or None, limit)
+        })
+    except Exception as e:
+        app.logger.error(f"Error fetching change events: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to fetch change events'
+        }), 500
+
+def _normalize_document_url(pdf_url):
+    """Undo the slash collapsing some proxies apply to URLs embedded in paths"""
+    pdf_url = unquote(pdf_url)
+    for scheme in ('https:/', 'http:/'):
+        if pdf_url.startswith(scheme) and not pdf_url.startswith(scheme + '/'):
+            return scheme + '/' + pdf_url[len(scheme):]
+    return pdf_url
+
+
+def _document_court(pdf_url):
+    """Court backend whose portal serves a document, or None"""
+    return courts.for_host((urlparse(pdf_url).hostname or '').lower())
+
+
+def _court_for_url(pdf_url):
+    """Court backend whose portal serves a document, falling back to the default court"""
+    return _document_court(pdf_url) or courts.default
+
+
+def _is_allowed_document_url(pdf_url):
+    """Only proxy documents hosted by the configured court portals"""
+    parsed = urlparse(pdf_url)
+    host = (parsed.hostname or '').lower()
+    return parsed.scheme in ('http', 'https') and any(
+        host == allowed or host.endswith('.' + allowed) for allowed in DOWNLOAD_ALLOWED_HOSTS
+    )
+
 @app.route('/api/download/<path:pdf_url>')
 def download_pdf(pdf_url):
-    """Download PDF document - Demo implementation"""
+    """Download PDF document through the on-disk document cache"""
+    pdf_url = _normalize_document_url(request.args.get('url') or pdf_url)
+    if not _is_allowed_document_url(pdf_url):
+        return jsonify({
+            'success': False,
+            'error': 'Document URL is not on an allowed court host'
+        }), 400
+    filename = os.path.basename(urlparse(pdf_url).path) or 'court_document.pdf'
     try:
-        # In real implementation, this would download from the actual URL
-        # For demo, we'll create a simple PDF-like response
-        demo_content = b"Demo PDF content - This would be the actual PDF file"
-        
-        pdf_file = io.BytesIO(demo_content)
-        
-        return send_file(
-            pdf_file,
-            as_attachment=True,
-            download_name="demo_court_document.pdf",
-            mimetype="application/pdf"
-        )
-        
+        cached = document_cache.lookup(pdf_url)
+        if cached:
+            # send_file handles If-None-Match and Range requests for cached blobs
+            return send_file(
+                cached['path'],
+                mimetype=cached.get('content_type') or 'application/pdf',
+                as_attachment=True,
+                download_name=filename,
+                conditional=True,
+                etag=cached['etag']
+            )
+        upstream = _court_for_url(pdf_url).open_pdf(pdf_url, max_bytes=document_cache.max_file_bytes)
+    except DocumentTooLarge as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
     except Exception as e:
         app.logger.error(f"Error downloading PDF: {str(e)}")
         return jsonify({
             'success': False,
             'error': 'Failed to download PDF document'
-        }), 500
+        }), 502
+
+    content_type = upstream.headers.get('Content-Type', 'application/pdf').split(';')[0]
+
+    def generate():
+        try:
+            yield from document_cache.store_stream(
+                pdf_url, upstream.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE), content_type
+            )
+        except DocumentTooLarge as e:
+            app.logger.warning(f"Aborted oversized download {pdf_url}: {str(e)}")
+        finally:
+            upstream.close()
+
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+    if upstream.headers.get('Content-Length'):
+        headers['Content-Length'] = upstream.headers['Content-Length']
+    return Response(generate(), mimetype=content_type, headers=headers)
+
+def _parse_history_filters(args):
+    """Read history filters from query args, returning (filters, error)"""
+    filters = {'case_type': args.get('case_type') or None, 'success': None}
+    if args.get('success') not in (None, ''):
+        filters['success'] = _is_truthy(args['success'])
+    for name in ('since', 'until'):
+        value = args.get(name)
+        if not value:
+            continue
+        try:
+            filters[name] = datetime.fromisoformat(value)
+        except ValueError:
+            return None, f'{name} must be an ISO date or datetime'
+        # A bare date for "until" covers that whole day
+        if name == 'until' and len(value) == 10:
+            filters[name] += timedelta(days=1)
+    return filters, None
 
 @app.route('/api/history')
 def get_history():
-    """Get search history from database"""
+    """Get search history from database, one keyset page at a time"""
     try:
+        filters, error = _parse_history_filters(request.args)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
         limit = request.args.get('limit', 20, type=int)
-        history = get_query_history(limit)
+        try:
+            page = get_query_history(limit, request.args.get('cursor'), filters)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid cursor'
+            }), 400
         return jsonify({
             'success': True,
-            'data': history
+            'data': page['items'],
+            'next_cursor': page['next_cursor']
         })
     except Exception as e:
         app.logger.error(f"Error fetching history: {str(e)}")
@@ -180,11 +943,64 @@ def get_history():
             'error': 'Failed to fetch search history'
         }), 500
 
+@app.route('/api/history/export')
+def export_history():
+    """Stream the full filtered history as NDJSON, newest first"""
+    filters, error = _parse_history_filters(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+
+    def generate():
+        for item in iter_query_history(filters):
+            yield json.dumps(item) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=query_history.ndjson'})
+
 @app.route('/api/stats')
 def get_stats():
     """Get application statistics from database"""
     try:
-        stats = get_case_statistics()
+        breakdown = request.args.get('breakdown')
+        if breakdown and breakdown not in ('hour', 'day'):
+            return jsonify({
+                'success': False,
+                'error': 'breakdown must be "hour" or "day"'
+            }), 400
+        days = min(max(request.args.get('days', 7, type=int), 1), 90)
+        stats_key = (breakdown, days if breakdown else None)
+        db_stats = stats_cache.get(stats_key)
+        if db_stats is None:
+            db_stats = get_case_statistics()
+            # A failed read comes back empty; retry it on the next request instead of caching it
+            cacheable = bool(db_stats)
+            if breakdown:
+                db_stats['breakdown'] = get_query_breakdown(breakdown, days)
+                cacheable = cacheable and bool(db_stats['breakdown'])
+            if cacheable:
+                stats_cache.set(stats_key, db_stats)
+        stats = dict(db_stats)
+        stats['cache'] = courts.default.cache.stats()
+        stats['courts'] = courts.stats()
+        if breakers:
+            stats['breakers'] = breakers.stats()
+        stats['singleflight'] = search_flight.stats()
+        stats['jobs'] = search_jobs.stats()
+        stats['revalidation'] = revalidator.stats()
+        stats['rate_limiter'] = rate_limiter.stats()
+        stats['documents'] = document_cache.stats()
+        if query_log is not None:
+            stats['query_log'] = query_log.stats()
+        stats['profiler'] = profiler.stats()
+        if prefetcher:
+            stats['prefetch'] = prefetcher.stats()
+        if watcher:
+            stats['watcher'] = watcher.stats()
+        if hasattr(courts.default.scraper, 'session_pool'):
+            stats['session_pool'] = courts.default.scraper.session_pool.stats()
         return jsonify({
             'success': True,
             'data': stats
@@ -196,13 +1012,78 @@ def get_stats():
             'error': 'Failed to fetch statistics'
         }), 500
 
+def _is_admin():
+    """Check the request's X-Admin-Token (or bearer token) against ADMIN_TOKEN"""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token') or request.headers.get('Authorization', '').replace('Bearer ', '', 1)
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def _admin_denied():
+    return jsonify({
+        'success': False,
+        'error': 'Admin token required'
+    }), 403
+
+@app.route('/api/admin/profiles')
+def list_profiles():
+    """List the kept search profiles, newest first"""
+    if not _is_admin():
+        return _admin_denied()
+    return jsonify({
+        'success': True,
+        'data': profiler.list(),
+        'stats': profiler.stats()
+    })
+
+@app.route('/api/admin/profiles/<int:profile_id>')
+def get_profile(profile_id):
+    """Render a kept profile as pstats text (?sort=cumulative|tottime|calls, ?limit=N)"""
+    if not _is_admin():
+        return _admin_denied()
+    sort = request.args.get('sort', 'cumulative')
+    if sort not in ('cumulative', 'tottime', 'calls', 'ncalls', 'time'):
+        return jsonify({
+            'success': False,
+            'error': 'Unsupported sort key'
+        }), 400
+    report = profiler.render(profile_id, sort, request.args.get('limit', 40, type=int))
+    if report is None:
+        return jsonify({
+            'success': False,
+            'error': 'Profile not found'
+        }), 404
+    return Response(report, mimetype='text/plain')
+
+@app.route('/api/admin/profiles/<int:profile_id>.prof')
+def download_profile(profile_id):
+    """Download a kept profile in cProfile's binary format"""
+    if not _is_admin():
+        return _admin_denied()
+    raw = profiler.get_raw(profile_id)
+    if raw is None:
+        return jsonify({
+            'success': False,
+            'error': 'Profile not found'
+        }), 404
+    return Response(raw, mimetype='application/octet-stream',
+                    headers={'Content-Disposition': f'attachment; filename=search_{profile_id}.prof'})
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
+    breaker_stats = breakers.stats() if breakers else {}
+    degraded = any(breaker['state'] != 'closed' for breaker in breaker_stats.values())
     return jsonify({
-        'status': 'healthy',
+        'status': 'degraded' if degraded else 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'breakers': breaker_stats
     })
 
 @app.errorhandler(404)
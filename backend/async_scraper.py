@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import threading
+import time
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed when SCRAPER_ENGINE=async
+    httpx = None
+
+from breaker import CircuitOpen
+from metrics import SCRAPER_RETRIES, STAGE_SECONDS, UPSTREAM_RESPONSES
+from ratelimit import THROTTLE_STATUS_CODES
+from scraper import ECourtsScraper, conditional_headers
+
+
+class AsyncECourtsScraper(ECourtsScraper):
+    """Event-loop based variant of ECourtsScraper.
+
+    search_case has the same arguments and result shape as the blocking
+    scraper but is a coroutine. All lookups share one httpx.AsyncClient,
+    so connections and portal cookies are pooled, and the host rate limiter
+    is awaited with asyncio.sleep instead of pinning a thread.
+    """
+
+    def __init__(self, max_connections=20, max_concurrency=10, rate_limiter=None, base_url=None):
+        if httpx is None:
+            raise ImportError("httpx is required for the async scraper engine (pip install httpx)")
+        super().__init__(rate_limiter=rate_limiter, base_url=base_url)
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self._client = None
+        self._semaphore = None
+        self._cookies_warm = False
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=15.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                follow_redirects=True
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def search_case(self, case_type, case_number, filing_year, max_retries=3, fingerprint=None):
+        """
+        Search for a case on the Delhi High Court endpoint without blocking the event loop.
+        """
+        client = self._get_client()
+        async with self._semaphore:
+            last_exception = None
+            for attempt in range(1, max_retries + 1):
+                try:
+                    # Rotate user-agent
+                    user_agent = self.random.choice(self.user_agents)
+                    headers = self._request_headers(user_agent)
+                    headers.update(conditional_headers(fingerprint))
+                    # Portal cookies live in the shared client, so warm them once
+                    if not self._cookies_warm:
+                        try:
+                            await self._paced(client, 'GET', self.home_url, headers={'User-Agent': user_agent}, timeout=15)
+                            self._cookies_warm = True
+                        except Exception as e:
+                            self.logger.warning(f"Could not fetch main page for cookies: {e}")
+                    data = self._search_payload(case_type, case_number, filing_year)
+                    resp = await self._paced(client, 'POST', self.base_url, json=data, headers=headers)
+                    # Unlike requests, httpx treats 304 Not Modified as an error status
+                    if resp.status_code != 304:
+                        resp.raise_for_status()
+                    # Reports the outcome to the rate limiter, whose store may block
+                    return await self.rate_limiter.call_async(
+                        self._handle_response, resp, case_type, case_number, filing_year, fingerprint
+                    )
+                except CircuitOpen:
+                    # The portal is known to be down; further attempts would fail the same way
+                    raise
+                except Exception as e:
+                    last_exception = e
+                    self.logger.error(f"Attempt {attempt} failed: {str(e)}")
+                    if attempt < max_retries:
+                        SCRAPER_RETRIES.inc(scraper=type(self).__name__)
+                    self._cookies_warm = False
+            # If all attempts fail
+            self.logger.error(f"Delhi High Court search error: {str(last_exception)}")
+            raise Exception("Network error: Unable to connect to Delhi High Court portal or parse data.")
+
+    async def _paced(self, client, method, url, **kwargs):
+        """Async counterpart of scraper.paced_request"""
+        host = self.rate_limiter.host_for(url)
+        await self.rate_limiter.acquire_async(host)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            UPSTREAM_RESPONSES.inc(host=host, method=method, status='error')
+            await self.rate_limiter.report_async(host, error=True)
+            raise
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage=f'upstream_{method.lower()}')
+        UPSTREAM_RESPONSES.inc(host=host, method=method, status=response.status_code)
+        if response.status_code in THROTTLE_STATUS_CODES or response.status_code >= 500:
+            retry_after = response.headers.get('Retry-After', '')
+            await self.rate_limiter.report_async(
+                host,
+                status_code=response.status_code,
+                retry_after=int(retry_after) if retry_after.isdigit() else None
+            )
+        return response
+
+    async def search_many(self, cases, max_retries=3):
+        """Look up many (case_type, case_number, filing_year) tuples concurrently.
+
+        Returns one entry per case in input order: the search result, or the
+        exception raised for that case.
+        """
+        return await asyncio.gather(
+            *(self.search_case(*case, max_retries=max_retries) for case in cases),
+            return_exceptions=True
+        )
+
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class SyncAsyncScraper:
+    """Blocking facade over AsyncECourtsScraper.
+
+    Runs one event loop on a daemon thread and submits coroutines to it, so
+    callers such as app.py keep the plain search_case(...) interface while
+    every in-flight lookup shares the loop instead of holding a thread.
+    """
+
+    def __init__(self, engine=None, **engine_kwargs):
+        self.logger = logging.getLogger(__name__)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-scraper', daemon=True)
+        self._thread.start()
+        self.engine = engine or AsyncECourtsScraper(**engine_kwargs)
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def search_case(self, case_type, case_number, filing_year, max_retries=3, fingerprint=None):
+        """Blocking equivalent of ECourtsScraper.search_case"""
+        return self._run(self.engine.search_case(case_type, case_number, filing_year, max_retries, fingerprint))
+
+    def search_many(self, cases, max_retries=3):
+        """Blocking equivalent of AsyncECourtsScraper.search_many"""
+        return self._run(self.engine.search_many(cases, max_retries))
+
+    def stored_result(self, case_details, orders_judgments):
+        return self.engine.stored_result(case_details, orders_judgments)
+
+    def open_pdf(self, pdf_url, max_bytes=None, timeout=30):
+        """Document downloads stream through the engine's blocking session pool"""
+        return self.engine.open_pdf(pdf_url, max_bytes, timeout)
+
+    def close(self):
+        """Close the HTTP client and stop the event loop"""
+        self._run(self.engine.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,186 @@
+"""Benchmark the scraper's hoisted keyword and date matchers against the old per-call ones.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_matchers [--rows 100 300 1000] [--repeat 5]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import (  # noqa: E402
+    BLOCK_INDICATORS, NO_RESULT_INDICATORS, DelhiHighCourtScraper, contains_any, make_soup, parse_date
+)
+from benchmarks.synthetic import build_cause_list  # noqa: E402
+
+
+class LegacyMatchers(DelhiHighCourtScraper):
+    """The per-call pattern lists and strptime loop, kept here as the benchmark baseline"""
+
+    def _is_no_results(self, soup, html_content):
+        no_result_indicators = [
+            "no records found",
+            "case not found",
+            "no matching records",
+            "invalid case number",
+            "case does not exist"
+        ]
+        content_lower = html_content.lower()
+        return any(indicator in content_lower for indicator in no_result_indicators)
+
+    def _extract_date_from_text(self, text):
+        if not text:
+            return None
+        date_patterns = [
+            r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b',
+            r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b',
+            r'\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})\b'
+        ]
+        for pattern in date_patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                return self._parse_date(match.group(0))
+        return None
+
+    def _parse_date(self, date_str):
+        if not date_str or date_str.strip() == "":
+            return None
+        date_str = date_str.strip()
+        date_formats = [
+            "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
+            "%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d",
+            "%d %b %Y", "%d %B %Y",
+            "%b %d, %Y", "%B %d, %Y"
+        ]
+        for fmt in date_formats:
+            try:
+                return datetime.strptime(date_str, fmt).date()
+            except ValueError:
+                continue
+        year_match = re.search(r'\b(20\d{2})\b', date_str)
+        if year_match:
+            try:
+                return date(int(year_match.group(1)), 1, 1)
+            except ValueError:
+                pass
+        return None
+
+
+def legacy_is_blocked(text):
+    text = text.lower()
+    return any(indicator in text for indicator in list(BLOCK_INDICATORS))
+
+
+# The single-regex alternative to per-keyword substring search
+BLOCK_ALTERNATION = re.compile('|'.join(re.escape(keyword) for keyword in BLOCK_INDICATORS), re.IGNORECASE)
+NO_RESULT_ALTERNATION = re.compile('|'.join(re.escape(keyword) for keyword in NO_RESULT_INDICATORS), re.IGNORECASE)
+
+
+def date_strings(rows):
+    """Date cells and order-date strings in the shapes the portals use"""
+    values = []
+    for index in range(rows):
+        day, month, year = index % 28 + 1, index // 28 % 12 + 1, 2021 + index // 336
+        values.append(f'{day:02d}/{month:02d}/{year}')
+        values.append(f'{year}-{month:02d}-{day:02d}')
+        values.append(f'{day} {["Jan", "March", "Sep", "December"][index % 4]} {year}')
+    return values
+
+
+def time_call(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def cold(fn):
+    """Run fn with an empty date cache, as for a process's first page"""
+    def run():
+        parse_date.cache_clear()
+        return fn()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    legacy = LegacyMatchers()
+    current = DelhiHighCourtScraper()
+
+    print('Keyword indicators over the page text (ms per check)')
+    print(f"{'rows':>6} {'legacy':>8} {'alternation':>12} {'hoisted':>8}")
+    for rows in args.rows:
+        html = build_cause_list(rows)
+        text = make_soup(html).get_text()
+
+        def run_legacy():
+            return legacy_is_blocked(text), legacy._is_no_results(None, html)
+
+        def run_alternation():
+            return bool(BLOCK_ALTERNATION.search(text)), bool(NO_RESULT_ALTERNATION.search(html))
+
+        def run_current():
+            return contains_any(text.lower(), BLOCK_INDICATORS), current._is_no_results(None, html)
+
+        if not run_legacy() == run_alternation() == run_current():
+            print(f"warning: indicator results differ for rows={rows}")
+        print(f"{rows:>6} {time_call(run_legacy, args.repeat) * 1000:>8.2f} "
+              f"{time_call(run_alternation, args.repeat) * 1000:>12.2f} {time_call(run_current, args.repeat) * 1000:>8.2f}")
+
+    print()
+    print('Date parsing (ms for 3 strings per row)')
+    print(f"{'rows':>6} {'strptime':>9} {'compiled':>9} {'cached':>8} {'speedup':>8}")
+    for rows in args.rows:
+        values = date_strings(rows)
+
+        def run_legacy():
+            return [legacy._parse_date(value) for value in values]
+
+        def run_current():
+            return [current._parse_date(value) for value in values]
+
+        if run_legacy() != cold(run_current)():
+            print(f"warning: parsed dates differ for rows={rows}")
+        legacy_time = time_call(run_legacy, args.repeat)
+        cold_time = time_call(cold(run_current), args.repeat)
+        run_current()
+        warm_time = time_call(run_current, args.repeat)
+        print(f"{rows:>6} {legacy_time * 1000:>9.2f} {cold_time * 1000:>9.2f} {warm_time * 1000:>8.2f} "
+              f"{legacy_time / cold_time:>7.1f}x")
+
+    print()
+    print('Full page parse (ms)')
+    print(f"{'rows':>6} {'legacy':>8} {'compiled':>9} {'cached':>8}")
+    for rows in args.rows:
+        html = build_cause_list(rows)
+        soup = make_soup(html)
+
+        def run_legacy():
+            return legacy._parse_case_details(html, 'W.P.(C)', '1234', 2021, soup=soup)
+
+        def run_current():
+            return current._parse_case_details(html, 'W.P.(C)', '1234', 2021, soup=soup)
+
+        if run_legacy() != cold(run_current)():
+            print(f"warning: parsed pages differ for rows={rows}")
+        legacy_time = time_call(run_legacy, args.repeat)
+        cold_time = time_call(cold(run_current), args.repeat)
+        run_current()
+        warm_time = time_call(run_current, args.repeat)
+        print(f"{rows:>6} {legacy_time * 1000:>8.1f} {cold_time * 1000:>9.1f} {warm_time * 1000:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Benchmark DelhiHighCourtScraper's single-pass parser against the old multi-pass path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_parsers [--rows 20 100 300] [--repeat 3]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime, date
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import DelhiHighCourtScraper, HTML_PARSER, make_soup  # noqa: E402
+from benchmarks.synthetic import build_page  # noqa: E402
+
+
+class LegacyParser(DelhiHighCourtScraper):
+    """The pre-single-pass extraction path, kept here as the benchmark baseline"""
+
+    def _parse_case_details(self, html_content, case_type, case_number, filing_year, soup=None):
+        soup = BeautifulSoup(html_content, 'html.parser')
+        case_data = {
+            'case_id': f"{case_type}/{case_number}/{filing_year}",
+            'case_type': case_type,
+            'case_number': case_number,
+            'filing_year': filing_year,
+            'court_name': 'Delhi High Court'
+        }
+        case_data.update(self._extract_parties(soup))
+        case_data.update(self._extract_dates(soup))
+        case_data.update(self._extract_status_info(soup))
+        case_data.update(self._extract_judge_info(soup))
+        orders = self._extract_orders_judgments(soup)
+        for k in ['filing_date', 'next_hearing_date']:
+            if k in case_data and isinstance(case_data[k], (datetime, date)):
+                case_data[k] = case_data[k].isoformat()
+        for order in orders:
+            if 'order_date' in order and isinstance(order['order_date'], (datetime, date)):
+                order['order_date'] = order['order_date'].isoformat()
+        return {'case_details': case_data, 'orders_judgments': orders, 'raw_html': html_content[:5000]}
+
+    def _extract_orders_judgments(self, soup, order_rows=None):
+        orders = super()._extract_orders_judgments(soup, order_rows=[])
+        return orders or self._legacy_orders_from_tables(soup)
+
+    def _extract_parties(self, soup):
+        """Extract petitioner and respondent information"""
+        parties_data = {}
+        
+        # Strategy 1: Look for standard table structure
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    label = cells[0].get_text(strip=True).lower()
+                    value = cells[1].get_text(strip=True)
+                    
+                    if 'petitioner' in label or 'appellant' in label:
+                        parties_data['petitioner'] = value
+                    elif 'respondent' in label:
+                        parties_data['respondent'] = value
+        
+        # Strategy 2: Look for specific patterns in text
+        text_content = soup.get_text()
+        
+        # Pattern for "Petitioner vs Respondent"
+        vs_pattern = r'([^v]+)\s+v[s]?\.\s+([^v]+)'
+        vs_match = re.search(vs_pattern, text_content, re.IGNORECASE)
+        if vs_match and not parties_data.get('petitioner'):
+            parties_data['petitioner'] = vs_match.group(1).strip()
+            parties_data['respondent'] = vs_match.group(2).strip()
+        
+        return parties_data
+
+    def _extract_dates(self, soup):
+        """Extract filing date and next hearing date"""
+        dates_data = {}
+        
+        # Look for date patterns in tables
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    label = cells[0].get_text(strip=True).lower()
+                    value = cells[1].get_text(strip=True)
+                    
+                    if 'filing' in label or 'registration' in label:
+                        dates_data['filing_date'] = self._parse_date(value)
+                    elif 'next' in label and 'hearing' in label:
+                        dates_data['next_hearing_date'] = self._parse_date(value)
+                    elif 'hearing' in label and not dates_data.get('next_hearing_date'):
+                        dates_data['next_hearing_date'] = self._parse_date(value)
+        
+        return dates_data
+
+    def _extract_status_info(self, soup):
+        """Extract case status and stage information"""
+        status_data = {}
+        
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    label = cells[0].get_text(strip=True).lower()
+                    value = cells[1].get_text(strip=True)
+                    
+                    if 'status' in label:
+                        status_data['status'] = value
+                    elif 'stage' in label:
+                        status_data['stage'] = value
+        
+        return status_data
+
+    def _extract_judge_info(self, soup):
+        """Extract judge information"""
+        judge_data = {}
+        
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    label = cells[0].get_text(strip=True).lower()
+                    value = cells[1].get_text(strip=True)
+                    
+                    if 'judge' in label or 'coram' in label:
+                        judge_data['judge_name'] = value
+        
+        return judge_data
+
+    def _legacy_orders_from_tables(self, soup):
+        """Extract order information from table structures"""
+        orders = []
+        
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 3:  # Assuming date, type, description columns
+                    row_text = row.get_text(strip=True).lower()
+                    if any(keyword in row_text for keyword in ['order', 'judgment', 'disposed', 'hearing']):
+                        order_data = {
+                            'order_date': self._parse_date(cells[0].get_text(strip=True)),
+                            'order_type': 'Order',
+                            'description': ' '.join(cell.get_text(strip=True) for cell in cells[1:]),
+                            'pdf_url': None
+                        }
+                        orders.append(order_data)
+        
+        return orders
+
+
+def time_call(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[20, 100, 300])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    legacy = LegacyParser()
+    current = DelhiHighCourtScraper()
+    print(f"HTML parser in use: {HTML_PARSER}")
+    print(f"{'rows':>6} {'pdf':>4} {'legacy ms':>10} {'single-pass ms':>15} {'speedup':>8}")
+    for rows in args.rows:
+        for with_pdf_links in (False, True):
+            html = build_page(rows, with_pdf_links)
+
+            # search_case builds a soup for the block check and the old parser built another
+            def run_legacy():
+                BeautifulSoup(html, 'html.parser')
+                return legacy._parse_case_details(html, 'W.P.(C)', '1234', 2023)
+
+            def run_current():
+                soup = make_soup(html)
+                return current._parse_case_details(html, 'W.P.(C)', '1234', 2023, soup=soup)
+
+            if run_legacy()['case_details'] != run_current()['case_details']:
+                print(f"warning: case details differ for rows={rows} pdf={with_pdf_links}")
+            legacy_time = time_call(run_legacy, args.repeat)
+            current_time = time_call(run_current, args.repeat)
+            print(f"{rows:>6} {str(with_pdf_links):>4} {legacy_time * 1000:>10.1f} "
+                  f"{current_time * 1000:>15.1f} {legacy_time / current_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Parser benchmark suite over the fixture corpus and large synthetic pages.
+
+For every parser path it checks the output against fixtures/manifest.json,
+then reports median/p95 parse latency, throughput (pages/sec) and peak
+traced memory. Save a run as a baseline and compare later runs against it
+to catch regressions before deploying:
+
+    python -m benchmarks.bench_suite --save baseline.json
+    python -m benchmarks.bench_suite --baseline baseline.json --max-regression 0.25
+
+The comparison exits with status 1 when any case is slower or uses more
+memory than the baseline by more than --max-regression.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import DelhiHighCourtScraper, ECourtsScraper, HTML_PARSER, make_soup  # noqa: E402
+from benchmarks.synthetic import build_cause_list, build_ecourts_json  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class ParserPaths:
+    """The parse step of each scraper, as search_case runs it after the HTTP call"""
+
+    def __init__(self):
+        self.delhi = DelhiHighCourtScraper()
+        self.ecourts = ECourtsScraper()
+
+    def run(self, parser, body, case):
+        if parser == 'delhi':
+            soup = make_soup(body)
+            try:
+                return self.delhi._parse_case_details(body, *case, soup=soup)
+            except Exception as e:
+                return {'error': str(e)}
+        return self.ecourts._build_result(body, *case)
+
+
+def load_cases(huge_rows):
+    """Corpus fixtures plus synthetic huge pages, as (name, parser, body, case, spec)"""
+    with open(os.path.join(FIXTURE_DIR, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    cases = []
+    for spec in manifest['fixtures']:
+        with open(os.path.join(FIXTURE_DIR, spec['file']), encoding='utf-8') as f:
+            body = f.read()
+        cases.append((spec['file'], spec['parser'], body, tuple(spec['case']), spec))
+    cases.append((f'synthetic_delhi_{huge_rows}', 'delhi', build_cause_list(huge_rows),
+                  ('W.P.(C)', '1234', 2021), None))
+    cases.append((f'synthetic_ecourts_{huge_rows}', 'ecourts', build_ecourts_json(huge_rows),
+                  ('W.P.(C)', '1234', 2021), None))
+    return cases
+
+
+def check_output(result, spec):
+    """Return a list of mismatches between a parse result and its manifest entry"""
+    if spec is None:
+        return []
+    if 'expect_error' in spec:
+        if spec['expect_error'] not in result.get('error', ''):
+            return [f"expected error containing {spec['expect_error']!r}"]
+        return []
+    if 'error' in result:
+        return [f"unexpected error {result['error']!r}"]
+    problems = [
+        f"{key}: {result['case_details'].get(key)!r} != {value!r}"
+        for key, value in spec.get('expect', {}).items()
+        if result['case_details'].get(key) != value
+    ]
+    if 'orders' in spec and len(result['orders_judgments']) != spec['orders']:
+        problems.append(f"orders: {len(result['orders_judgments'])} != {spec['orders']}")
+    return problems
+
+
+def measure(fn, repeat):
+    fn()  # warm up caches and lazy imports
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    median = statistics.median(timings)
+    return {
+        'median_ms': median * 1000,
+        'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        'pages_per_sec': 1 / median if median else float('inf'),
+        'peak_kb': peak / 1024
+    }
+
+
+def compare(results, baseline, max_regression):
+    """Return regression messages for results that exceed the baseline"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric in ('median_ms', 'peak_kb'):
+            if result[metric] > before[metric] * (1 + max_regression):
+                regressions.append(f"{name}: {metric} {before[metric]:.1f} -> {result[metric]:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--huge-rows', type=int, default=2000)
+    parser.add_argument('--only', help='only run cases whose name contains this text')
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--baseline', help='compare against a JSON file written by --save')
+    parser.add_argument('--max-regression', type=float, default=0.25)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    paths = ParserPaths()
+    results = {}
+    failures = []
+    print(f"HTML parser in use: {HTML_PARSER}")
+    print(f"{'case':<32} {'parser':>7} {'KB':>8} {'median ms':>10} {'p95 ms':>8} {'pages/s':>9} {'peak KB':>9}")
+    for name, parser_name, body, case, spec in load_cases(args.huge_rows):
+        if args.only and args.only not in name:
+            continue
+        problems = check_output(paths.run(parser_name, body, case), spec)
+        failures.extend(f"{name}: {problem}" for problem in problems)
+        result = measure(lambda: paths.run(parser_name, body, case), args.repeat)
+        results[name] = result
+        print(f"{name:<32} {parser_name:>7} {len(body) / 1024:>8.1f} {result['median_ms']:>10.2f} "
+              f"{result['p95_ms']:>8.2f} {result['pages_per_sec']:>9.1f} {result['peak_kb']:>9.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures.extend(compare(results, json.load(f), args.max_regression))
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
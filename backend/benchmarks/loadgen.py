@@ -0,0 +1,139 @@
+"""Open-loop load generator for /api/search.
+
+Sends searches at a fixed target rate (requests are scheduled on the clock,
+not after the previous one finishes, so a slow server builds a backlog
+instead of hiding it) and reports latency percentiles, error rates and,
+when the app is pointed at benchmarks/mock_portal.py, upstream requests per
+search:
+
+    python -m benchmarks.mock_portal --port 8081 &
+    PORTAL_BASE_URL=http://127.0.0.1:8081 gunicorn -w 4 app:app &
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --rps 20 --duration 60 \\
+        --mock-url http://127.0.0.1:8081 --distinct 200
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CASE_TYPES = ['W.P.(C)', 'CRL.A.', 'CS(COMM)', 'LPA', 'FAO', 'BAIL APPLN.']
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def build_cases(distinct, seed):
+    """A fixed pool of cases; a small pool exercises the cache, a large one the scraper"""
+    rng = random.Random(seed)
+    return [(rng.choice(CASE_TYPES), str(rng.randint(1, 99999)), rng.randint(2000, 2024)) for _ in range(distinct)]
+
+
+def upstream_count(mock_url):
+    if not mock_url:
+        return None
+    return requests.get(f'{mock_url}/__stats', timeout=5).json().get('total', 0)
+
+
+class LoadRun:
+    """Fire searches at the target rate and collect per-request outcomes"""
+
+    def __init__(self, url, rps, duration, cases, refresh=False, timeout=60, workers=200, seed=0):
+        self.url = url.rstrip('/') + '/api/search'
+        self.rps = rps
+        self.duration = duration
+        self.cases = cases
+        self.refresh = refresh
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.outcomes = Counter()
+        self.late = 0
+
+    def _session(self):
+        if not hasattr(self.local, 'session'):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def _search(self, case):
+        case_type, case_number, filing_year = case
+        started = time.perf_counter()
+        try:
+            response = self._session().post(self.url, json={
+                'case_type': case_type, 'case_number': case_number,
+                'filing_year': filing_year, 'refresh': self.refresh
+            }, timeout=self.timeout)
+            outcome = str(response.status_code)
+            if response.status_code == 200 and response.json().get('cached'):
+                outcome = '200 cached'
+        except requests.RequestException as e:
+            outcome = type(e).__name__
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.latencies.append(elapsed)
+            self.outcomes[outcome] += 1
+
+    def run(self):
+        total = int(self.rps * self.duration)
+        started = time.perf_counter()
+        futures = []
+        for index in range(total):
+            due = started + index / self.rps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.05:
+                self.late += 1
+            futures.append(self.executor.submit(self._search, self.rng.choice(self.cases)))
+        for future in futures:
+            future.result()
+        self.executor.shutdown()
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive /api/search at a target request rate')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='base URL of the Flask app')
+    parser.add_argument('--rps', type=float, default=10.0)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of load')
+    parser.add_argument('--distinct', type=int, default=100, help='number of distinct cases searched')
+    parser.add_argument('--refresh', action='store_true', help='bypass the case cache on every search')
+    parser.add_argument('--mock-url', help='mock portal base URL, to report upstream amplification')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    upstream_before = upstream_count(args.mock_url)
+    load = LoadRun(args.url, args.rps, args.duration, build_cases(args.distinct, args.seed),
+                   refresh=args.refresh, timeout=args.timeout, seed=args.seed)
+    elapsed = load.run()
+    upstream_after = upstream_count(args.mock_url)
+
+    latencies = sorted(load.latencies)
+    searches = len(latencies)
+    errors = sum(count for outcome, count in load.outcomes.items() if not outcome.startswith('200'))
+    print(f"searches: {searches} in {elapsed:.1f}s ({searches / elapsed:.1f}/s, target {args.rps}/s, "
+          f"{load.late} sent late)")
+    print(f"latency ms: p50 {percentile(latencies, 0.50) * 1000:.0f}  p95 {percentile(latencies, 0.95) * 1000:.0f}  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.0f}  max {latencies[-1] * 1000 if latencies else 0:.0f}  "
+          f"mean {statistics.mean(latencies) * 1000 if latencies else 0:.0f}")
+    print(f"error rate: {errors / searches if searches else 0:.2%}")
+    for outcome, count in sorted(load.outcomes.items()):
+        print(f"  {outcome:<20} {count}")
+    if upstream_before is not None:
+        upstream = upstream_after - upstream_before
+        print(f"upstream requests: {upstream} ({upstream / searches if searches else 0:.2f} per search)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""Local stand-in for the Delhi High Court portal, for end-to-end load tests.
+
+Serves the endpoints the scrapers use:
+
+    GET  /                           home page (sets a session cookie)
+    GET  /case_status.asp            search form with ASP.NET hidden fields
+    POST /case_status.asp            case status page (needs the form's __VIEWSTATE)
+    POST /app/get-case-type-status   case status JSON
+    GET  /<path>.pdf                 a small fake PDF
+
+Responses are deterministic per case. Latency, captcha/block pages, 429s,
+not-found cases and an overall request budget are configurable, and
+/__stats reports how many upstream requests each endpoint received (used by
+loadgen.py to compute amplification). Point the app at it with:
+
+    python -m benchmarks.mock_portal --port 8081 --latency lognormal:120:0.5 --block-rate 0.02
+    PORTAL_BASE_URL=http://127.0.0.1:8081 python app.py
+"""
+import argparse
+import hashlib
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Flask, Response, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import build_cause_list  # noqa: E402
+
+BLOCK_PAGE = ('<html><head><title>Security Check</title></head><body>'
+              '<h1>Access Denied</h1><p>Unusual traffic from your network. Please complete the captcha '
+              'to verify you are human.</p></body></html>')
+NO_RESULTS_PAGE = ('<html><body><form id="form1"><span id="lblMessage">No Records Found for the given '
+                   'Case Type / Number / Year.</span></form></body></html>')
+VIEWSTATE_PATTERN = re.compile(r'name="__VIEWSTATE" value="([^"]+)"')
+FAKE_PDF = b'%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n' + b'0' * 4096
+
+
+def parse_latency(spec):
+    """Latency sampler from 'fixed:MS', 'uniform:MIN:MAX' or 'lognormal:MEDIAN_MS:SIGMA' (seconds)"""
+    kind, *params = spec.split(':')
+    values = [float(param) for param in params]
+    if kind == 'fixed':
+        return lambda rng: values[0] / 1000
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == 'lognormal':
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class MockPortal:
+    """Flask app plus the failure/latency knobs and request counters"""
+
+    def __init__(self, latency='fixed:50', block_rate=0.0, throttle_rate=0.0, not_found_rate=0.0,
+                 max_rps=0.0, orders=40, seed=0):
+        self.sample_latency = parse_latency(latency)
+        self.block_rate = block_rate
+        self.throttle_rate = throttle_rate
+        self.not_found_rate = not_found_rate
+        self.max_rps = max_rps
+        self.orders = orders
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.tokens = max_rps
+        self.last_refill = time.monotonic()
+        self.viewstates = set()
+        self.app = self._build_app()
+
+    def _case_seed(self, *case):
+        return int(hashlib.sha256('/'.join(str(part) for part in case).encode('utf-8')).hexdigest()[:8], 16)
+
+    def _issue_viewstate(self, viewstate):
+        with self.lock:
+            if len(self.viewstates) > 100000:
+                self.viewstates.clear()
+            self.viewstates.add(viewstate)
+        return viewstate
+
+    def _over_budget(self):
+        if not self.max_rps:
+            return False
+        now = time.monotonic()
+        self.tokens = min(self.max_rps, self.tokens + (now - self.last_refill) * self.max_rps)
+        self.last_refill = now
+        if self.tokens < 1:
+            return True
+        self.tokens -= 1
+        return False
+
+    def _gate(self, endpoint):
+        """Count the request, sleep for a sampled latency and maybe fail it"""
+        with self.lock:
+            self.counts[endpoint] += 1
+            self.counts['total'] += 1
+            delay = self.sample_latency(self.rng)
+            roll = self.rng.random()
+            throttled = self._over_budget() or roll < self.throttle_rate
+            blocked = not throttled and roll < self.throttle_rate + self.block_rate
+        time.sleep(delay)
+        if throttled:
+            with self.lock:
+                self.counts['throttled'] += 1
+            return Response('Too Many Requests', status=429, headers={'Retry-After': '1'})
+        if blocked:
+            with self.lock:
+                self.counts['blocked'] += 1
+            return Response(BLOCK_PAGE, mimetype='text/html')
+        return None
+
+    def _build_app(self):
+        app = Flask(__name__)
+
+        @app.route('/')
+        def home():
+            failure = self._gate('home')
+            if failure:
+                return failure
+            response = Response('<html><body><h1>Delhi High Court</h1></body></html>', mimetype='text/html')
+            response.set_cookie('ASP.NET_SessionId', hashlib.md5(os.urandom(8)).hexdigest())
+            return response
+
+        @app.route('/case_status.asp', methods=['GET', 'POST'])
+        def case_status():
+            failure = self._gate(f'case_status_{request.method.lower()}')
+            if failure:
+                return failure
+            if request.method == 'GET':
+                viewstate = self._issue_viewstate(hashlib.sha1(os.urandom(16)).hexdigest())
+                return Response(
+                    '<html><body><form method="post" action="./case_status.aspx" id="form1">'
+                    f'<input type="hidden" name="__VIEWSTATE" value="{viewstate}">'
+                    '<input type="hidden" name="__VIEWSTATEGENERATOR" value="CA0B0334">'
+                    '<select name="case_type"><option>W.P.(C)</option></select>'
+                    '<input name="case_no"><input name="case_year"><input type="submit" name="submit">'
+                    '</form></body></html>',
+                    mimetype='text/html'
+                )
+            if request.form.get('__VIEWSTATE') not in self.viewstates:
+                return Response('<html><body>Invalid postback or callback argument.</body></html>', status=500)
+            case = (request.form.get('case_type'), request.form.get('case_no'), request.form.get('case_year'))
+            seed = self._case_seed(*case)
+            if seed % 1000 < self.not_found_rate * 1000:
+                return Response(NO_RESULTS_PAGE, mimetype='text/html')
+            page = build_cause_list(seed % self.orders + 1, seed)
+            # The result page's own hidden fields are valid for the next postback
+            self._issue_viewstate(VIEWSTATE_PATTERN.search(page).group(1))
+            return Response(page, mimetype='text/html')
+
+        @app.route('/app/get-case-type-status', methods=['POST'])
+        def case_type_status():
+            failure = self._gate('case_type_status')
+            if failure:
+                return failure
+            payload = request.get_json(silent=True) or {}
+            seed = self._case_seed(payload.get('case_type'), payload.get('case_no'), payload.get('case_year'))
+            if seed % 1000 < self.not_found_rate * 1000:
+                return jsonify({'status': 'Case not found'})
+            rng = random.Random(seed)
+            return jsonify({
+                'status': rng.choice(['Pending', 'Disposed', 'Reserved']),
+                'petitioner': f'PETITIONER {seed % 9973}',
+                'respondent': 'STATE (GOVT. OF NCT OF DELHI)',
+                'judge': 'HON\'BLE MR. JUSTICE A. KUMAR',
+                'filing_date': f'20{10 + seed % 14}-0{1 + seed % 9}-1{seed % 10}',
+                'next_hearing_date': '2025-02-03'
+            })
+
+        @app.route('/<path:document>.pdf')
+        def document(document):
+            failure = self._gate('pdf')
+            if failure:
+                return failure
+            return Response(FAKE_PDF, mimetype='application/pdf')
+
+        @app.route('/__stats')
+        def stats():
+            with self.lock:
+                return jsonify(dict(self.counts))
+
+        @app.route('/__reset', methods=['POST'])
+        def reset():
+            with self.lock:
+                self.counts.clear()
+            return jsonify({'reset': True})
+
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local mock of the Delhi High Court portal')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', default='fixed:50',
+                        help="fixed:MS, uniform:MIN_MS:MAX_MS or lognormal:MEDIAN_MS:SIGMA")
+    parser.add_argument('--block-rate', type=float, default=0.0, help='fraction of requests answered with a captcha page')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--not-found-rate', type=float, default=0.0, help='fraction of cases that do not exist')
+    parser.add_argument('--max-rps', type=float, default=0.0, help='answer 429 above this request rate (0 = unlimited)')
+    parser.add_argument('--orders', type=int, default=40, help='maximum orders per case page')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    portal = MockPortal(args.latency, args.block_rate, args.throttle_rate, args.not_found_rate,
+                        args.max_rps, args.orders, args.seed)
+    portal.app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Synthetic portal responses for parser benchmarks.
+
+build_page makes the minimal label/value + orders layout; build_cause_list
+makes a realistic, arbitrarily large Delhi High Court case status page
+(ASP.NET hidden fields, navigation chrome, mixed orders and judgments with
+PDF links); build_ecourts_json makes the JSON case status body.
+
+Write a large page to disk with:
+
+    python -m benchmarks.synthetic --rows 5000 --out /tmp/delhi_5000.html
+"""
+import argparse
+import json
+import random
+
+ORDER_KINDS = ['Order', 'Judgment', 'Order', 'Order', 'Interim Order', 'Notice']
+PURPOSES = ['Hearing adjourned', 'Arguments heard', 'Notice issued', 'Reply filed',
+            'Rejoinder filed', 'Listed for final disposal', 'Disposed of']
+
+
+def build_page(rows, with_pdf_links=False):
+    """Synthetic case status page with label/value rows and an orders table"""
+    details = [
+        ('Petitioner', 'ACME Industries Ltd.'),
+        ('Respondent', 'Union of India'),
+        ('Date of Filing', '05/01/2023'),
+        ('Next Hearing Date', '14/11/2024'),
+        ('Status', 'Pending'),
+        ('Stage', 'Arguments'),
+        ('Coram', 'Hon\'ble Mr. Justice A. Kumar'),
+    ]
+    parts = ['<html><body><table>']
+    for label, value in details:
+        parts.append(f'<tr><td>{label}</td><td>{value}</td></tr>')
+    parts.append('</table><table>')
+    for index in range(rows):
+        day = index % 28 + 1
+        if with_pdf_links:
+            parts.append(
+                f'<tr><td>{day:02d}/03/2024</td><td>Order</td>'
+                f'<td><a href="/orders/{index}.pdf">Order dated {day:02d}-03-2024</a></td></tr>'
+            )
+        else:
+            parts.append(f'<tr><td>{day:02d}/03/2024</td><td>Order</td><td>Hearing adjourned ({index})</td></tr>')
+    parts.append('</table></body></html>')
+    return ''.join(parts)
+
+
+def build_cause_list(rows, seed=0):
+    """Realistic case status page with rows orders/judgments, deterministic for a seed"""
+    rng = random.Random(seed)
+    viewstate = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/') for _ in range(2048))
+    parts = [
+        '<!DOCTYPE html><html><head><title>Case Status - Delhi High Court</title>',
+        '<link rel="stylesheet" href="/css/site.css"><script src="/js/jquery.min.js"></script></head>',
+        '<body><div id="header"><ul class="nav">',
+        ''.join(f'<li><a href="/section/{index}">Section {index}</a></li>' for index in range(25)),
+        '</ul></div><form method="post" action="./case_status.aspx" id="form1">',
+        f'<input type="hidden" name="__VIEWSTATE" value="{viewstate}">',
+        '<input type="hidden" name="__VIEWSTATEGENERATOR" value="CA0B0334">',
+        f'<input type="hidden" name="__EVENTVALIDATION" value="{viewstate[:512]}">',
+        '<div class="case-details"><table class="details">',
+    ]
+    details = [
+        ('Petitioner/Appellant', 'M/S BHARAT CONSTRUCTION AND ENGINEERING COMPANY PRIVATE LIMITED'),
+        ('Respondent', 'DELHI DEVELOPMENT AUTHORITY & ORS.'),
+        ('Date of Filing', '12/07/2021'),
+        ('Registration Date', '15/07/2021'),
+        ('Next Hearing Date', '21/01/2025'),
+        ('Status', 'Pending'),
+        ('Stage', 'Final Arguments'),
+        ('Coram', 'HON\'BLE MR. JUSTICE PRATHIBA M. SINGH'),
+    ]
+    for label, value in details:
+        parts.append(f'<tr><th>{label}</th><td>{value}</td></tr>')
+    parts.append('</table></div><div class="orders"><table class="orders-table">')
+    parts.append('<tr><th>S.No.</th><th>Order Date</th><th>Type</th><th>Details</th></tr>')
+    for index in range(rows):
+        year = 2021 + index // 336
+        month = index // 28 % 12 + 1
+        day = index % 28 + 1
+        kind = rng.choice(ORDER_KINDS)
+        purpose = rng.choice(PURPOSES)
+        if rng.random() < 0.8:
+            link = (f'<a href="/app/showlogo/{rng.getrandbits(48):x}/{year}.pdf" target="_blank">'
+                    f'{kind} dated {day:02d}.{month:02d}.{year}</a>')
+        else:
+            link = f'{purpose} ({kind.lower()} not uploaded)'
+        parts.append(f'<tr><td>{index + 1}</td><td>{day:02d}/{month:02d}/{year}</td><td>{kind}</td><td>{link}</td></tr>')
+    parts.append('</table></div></form><div id="footer"><p>Content owned by Delhi High Court</p></div></body></html>')
+    return ''.join(parts)
+
+
+def build_ecourts_json(orders=0, seed=0):
+    """Case status JSON body in the shape ECourtsScraper._parse_case_details reads"""
+    rng = random.Random(seed)
+    body = {
+        'status': 'Pending',
+        'petitioner': 'RAJESH KUMAR',
+        'respondent': 'STATE (GOVT. OF NCT OF DELHI)',
+        'judge': 'HON\'BLE MS. JUSTICE SWARANA KANTA SHARMA',
+        'filing_date': '2022-03-14',
+        'next_hearing_date': '2025-02-03',
+        'stage': 'Admission',
+        'orders': [
+            {'order_date': f'2023-{index % 12 + 1:02d}-{index % 28 + 1:02d}', 'type': rng.choice(ORDER_KINDS),
+             'purpose': rng.choice(PURPOSES), 'pdf': f'/app/showlogo/{rng.getrandbits(48):x}.pdf'}
+            for index in range(orders)
+        ]
+    }
+    return json.dumps(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic portal response to a file')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['html', 'json'], default='html')
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+    body = build_cause_list(args.rows, args.seed) if args.format == 'html' else build_ecourts_json(args.rows, args.seed)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        f.write(body)
+    print(f"Wrote {len(body)} bytes to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
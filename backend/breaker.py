@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+
+from metrics import CIRCUIT_REJECTIONS, CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Gauge values for court_circuit_state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    """Raised instead of contacting a host whose circuit is open"""
+
+    def __init__(self, host, retry_after):
+        super().__init__(f"Court portal {host} is unavailable, retrying in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream host.
+
+    Closed: requests pass and failure_threshold failures in a row open the
+    circuit. Open: searches and requests fail fast with CircuitOpen for
+    reset_timeout seconds, doubling up to max_reset_timeout each time a
+    trial fails. Half-open: one trial search at a time is let through (its
+    session warm-up and postback both go out); the first reported success
+    closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=600.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_started = None
+        self.last_failure = None
+        self.opens = 0
+        self.rejected = 0
+        CIRCUIT_STATE.set(STATE_VALUES[CLOSED], host=host)
+
+    def _retry_after(self, now):
+        return max(0.0, self.opened_at + self.reset_timeout - now)
+
+    def _reject(self, retry_after):
+        self.rejected += 1
+        CIRCUIT_REJECTIONS.inc(host=self.host)
+        raise CircuitOpen(self.host, retry_after)
+
+    def check(self):
+        """Admit a search: fail fast while open, then allow one trial search at a time"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CLOSED:
+                return
+            self._leave_open(now)
+            # A trial that never reported back (e.g. a 404) stops blocking after reset_timeout
+            if self.trial_started is not None and now - self.trial_started < self.reset_timeout:
+                self._reject(self.reset_timeout - (now - self.trial_started))
+            self.trial_started = now
+
+    def before_request(self):
+        """Admit a single upstream request; only an open circuit rejects it"""
+        with self._lock:
+            if self.state == OPEN:
+                self._leave_open(time.monotonic())
+
+    def _leave_open(self, now):
+        if self.state == OPEN:
+            retry_after = self._retry_after(now)
+            if retry_after > 0:
+                self._reject(retry_after)
+            self._transition(HALF_OPEN)
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.trial_started = None
+            if self.state != CLOSED:
+                self.reset_timeout = self.base_reset_timeout
+                self._transition(CLOSED)
+
+    def record_failure(self, reason):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_failure = reason
+            self.trial_started = None
+            if self.state == HALF_OPEN:
+                self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+                self._open()
+            elif self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self.opens += 1
+        self._transition(OPEN)
+        self.logger.warning(
+            f"[Breaker] Circuit for {self.host} opened after {self.consecutive_failures} failure(s) "
+            f"({self.last_failure}); failing fast for {self.reset_timeout:.0f}s"
+        )
+
+    def _transition(self, state):
+        self.state = state
+        CIRCUIT_STATE.set(STATE_VALUES[state], host=self.host)
+        CIRCUIT_TRANSITIONS.inc(host=self.host, state=state)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'last_failure': self.last_failure,
+                'retry_after_seconds': round(self._retry_after(time.monotonic()), 1) if self.state == OPEN else 0.0,
+                'opens': self.opens,
+                'rejected': self.rejected
+            }
+
+
+class HostBreakers:
+    """Circuit breakers keyed by upstream host, created on first use.
+
+    The rate limiter consults them before every upstream request and feeds
+    them the same outcomes it adapts its rate to: connection failures,
+    timeouts, block pages and 5xx responses count as failures, validated
+    responses as successes, and 429 throttling is left to the limiter.
+    State is per process.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=600.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout, self.max_reset_timeout
+                )
+            return breaker
+
+    def before_request(self, host):
+        self.get(host).before_request()
+
+    def record(self, host, status_code=None, blocked=False, error=False):
+        """Count a response outcome reported to the rate limiter"""
+        if blocked:
+            self.get(host).record_failure('blocked')
+        elif error:
+            self.get(host).record_failure('error')
+        elif status_code is not None and status_code >= 500:
+            self.get(host).record_failure(f'http {status_code}')
+        elif status_code is None:
+            self.get(host).record_success()
+
+    def stats(self):
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.host: breaker.stats() for breaker in breakers}
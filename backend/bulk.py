@@ -0,0 +1,101 @@
+import csv
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CSV_FIELDS = ['case_type', 'case_number', 'filing_year']
+
+
+def parse_cases_csv(text):
+    """Parse uploaded CSV rows of case_type, case_number, filing_year.
+
+    A header row naming the columns is optional; without one the first
+    three columns are used in that order. With a header, an optional court
+    column picks the court per row.
+    """
+    rows = list(csv.reader(io.StringIO(text)))
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    fields = list(CSV_FIELDS)
+    if all(field in header for field in CSV_FIELDS):
+        if 'court' in header:
+            fields.append('court')
+        positions = [header.index(field) for field in fields]
+        rows = rows[1:]
+    else:
+        positions = [0, 1, 2]
+    cases = []
+    for row in rows:
+        if not any(cell.strip() for cell in row):
+            continue
+        cases.append({
+            field: row[position].strip() if position < len(row) else ''
+            for field, position in zip(fields, positions)
+        })
+    return cases
+
+
+class PolitenessGate:
+    """Process-wide minimum spacing between upstream lookups"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next upstream lookup is allowed"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BulkSearchRunner:
+    """Fan a list of case lookups out over a bounded thread pool.
+
+    lookup(case) returns the per-case outcome and runs on pool threads;
+    persist(outcomes) is called on the caller's thread with batches of
+    completed outcomes so they can be written in one transaction.
+    """
+
+    def __init__(self, lookup, persist, max_concurrency=8, batch_size=50):
+        self.lookup = lookup
+        self.persist = persist
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, cases, concurrency=None):
+        """Yield (index, outcome) pairs in completion order"""
+        workers = max(1, min(concurrency or self.max_concurrency, self.max_concurrency, len(cases) or 1))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-search')
+        pending_batch = []
+        try:
+            futures = {executor.submit(self.lookup, case): index for index, case in enumerate(cases)}
+            for future in as_completed(futures):
+                outcome = future.result()
+                pending_batch.append(outcome)
+                if len(pending_batch) >= self.batch_size:
+                    self._flush(pending_batch)
+                    pending_batch = []
+                yield futures[future], outcome
+            self._flush(pending_batch)
+        finally:
+            # Stop queued lookups if the client disconnects mid-stream
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _flush(self, outcomes):
+        if not outcomes:
+            return
+        try:
+            self.persist(outcomes)
+        except Exception as e:
+            self.logger.error(f"Error persisting bulk search batch: {str(e)}")
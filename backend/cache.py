@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_case_key(case_type, case_number, filing_year):
+    """Build the normalized cache key for a case lookup"""
+    return (
+        str(case_type).strip().upper(),
+        str(case_number).strip(),
+        int(filing_year)
+    )
+
+
+def make_case_id(case_type, case_number, filing_year, namespace=''):
+    """Build the stored case id, prefixed with the court namespace outside the default court"""
+    case_id = f"{case_type}/{case_number}/{filing_year}"
+    return f"{namespace}:{case_id}" if namespace else case_id
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry TTL and LRU eviction"""
+
+    def __init__(self, max_entries=1024, ttl=900):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store value under key, evicting least recently used entries if full"""
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove key from the cache if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CaseCache:
+    """Read-through cache for case search results.
+
+    Lookups are served from memory first and then from the stored
+    case_details/orders_judgments rows, as long as they are younger than
+    the configured TTL. Keys and stored case ids are scoped to namespace,
+    so each court gets its own cache.
+    """
+
+    def __init__(self, ttl=900, max_entries=1024, db_loader=None, namespace=''):
+        self.ttl = ttl
+        self.namespace = namespace
+        self.memory = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.db_loader = db_loader
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def get(self, case_type, case_number, filing_year):
+        """Return a cached search result, or None on a miss"""
+        key = self._key(case_type, case_number, filing_year)
+        result = self.memory.get(key)
+        if result is not None:
+            self._count('memory_hits')
+            return result
+        if self.db_loader:
+            result = self.db_loader(make_case_id(case_type, case_number, filing_year, self.namespace), self.ttl)
+            if result is not None:
+                self.memory.set(key, result)
+                self._count('db_hits')
+                return result
+        self._count('misses')
+        return None
+
+    def put(self, case_type, case_number, filing_year, result):
+        """Store a freshly scraped search result"""
+        self.memory.set(self._key(case_type, case_number, filing_year), result)
+
+    def invalidate(self, case_type, case_number, filing_year):
+        """Forget any cached result for the case"""
+        self.memory.delete(self._key(case_type, case_number, filing_year))
+
+    def _key(self, case_type, case_number, filing_year):
+        return (self.namespace,) + make_case_key(case_type, case_number, filing_year)
+
+    def record_bypass(self):
+        """Count a lookup that explicitly skipped the cache"""
+        self._count('bypasses')
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return hit/miss counters for the stats endpoint"""
+        hits = self.memory_hits + self.db_hits
+        lookups = hits + self.misses
+        return {
+            'hits': hits,
+            'memory_hits': self.memory_hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self.memory),
+            'max_entries': self.memory.max_entries,
+            'evictions': self.memory.evictions,
+            'ttl_seconds': self.ttl
+        }
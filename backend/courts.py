@@ -0,0 +1,162 @@
+import logging
+import threading
+
+from cache import make_case_id
+from metrics import COURT_REJECTIONS, COURT_SEARCHES_IN_FLIGHT
+
+
+class UnknownCourt(ValueError):
+    """Raised for a court code that is not registered"""
+
+
+class CourtBusy(Exception):
+    """Raised when a court's concurrency budget stays exhausted"""
+
+
+class CourtBackend:
+    """One court portal behind the common scraper interface.
+
+    Every backend owns its scraper (and with it a session pool and
+    connections), a case cache whose ids live in the court's namespace,
+    and a bulkhead: at most max_concurrency searches run against the court
+    at once and callers wait at most acquire_timeout for a slot, so a slow
+    or blocked court cannot tie up the threads serving the others. The
+    upstream rate budget is the rate limiter's bucket for the court's host.
+    breaker, the circuit breaker of that host, is checked before a slot is
+    taken, so searches against a portal that is down fail fast.
+    """
+
+    def __init__(self, code, name, scraper, cache, host, namespace='', max_concurrency=8,
+                 acquire_timeout=5.0, breaker=None):
+        self.code = code
+        self.name = name
+        self.scraper = scraper
+        self.cache = cache
+        self.host = host
+        self.namespace = namespace
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout = acquire_timeout
+        self.breaker = breaker
+        self.logger = logging.getLogger(__name__)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.searches = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def case_id(self, case_type, case_number, filing_year):
+        """Stored case id of a case at this court"""
+        return make_case_id(case_type, case_number, filing_year, self.namespace)
+
+    def search_case(self, case_type, case_number, filing_year, **kwargs):
+        """Run one scraper search inside the court's concurrency budget"""
+        if self.breaker is not None:
+            self.breaker.check()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._count('rejected')
+            COURT_REJECTIONS.inc(court=self.code)
+            raise CourtBusy(f"{self.name} is handling too many searches, please try again shortly")
+        self._count('in_flight')
+        try:
+            with COURT_SEARCHES_IN_FLIGHT.track_inprogress(court=self.code):
+                result = self.scraper.search_case(case_type, case_number, filing_year, **kwargs)
+        except Exception:
+            self._count('failures')
+            raise
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.in_flight -= 1
+                self.searches += 1
+        details = result.get('case_details')
+        if details:
+            details['case_id'] = self.case_id(case_type, case_number, filing_year)
+            details['court_name'] = self.name
+        return result
+
+    def stored_result(self, stored):
+        """Reshape a stored case (get_fresh_case_result) like a fresh search result.
+
+        Database-only columns are dropped and absent fields follow the
+        scraper's conventions, so a case reads the same from every cache
+        tier; the row's last_updated moves to the top level.
+        """
+        result = self.scraper.stored_result(stored['case_details'], stored['orders_judgments'])
+        result['last_updated'] = stored['case_details'].get('last_updated')
+        return result
+
+    def open_pdf(self, pdf_url, max_bytes=None, timeout=30):
+        """Open a streaming download through the court's scraper"""
+        return self.scraper.open_pdf(pdf_url, max_bytes=max_bytes, timeout=timeout)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return bulkhead, cache and session counters for the stats endpoint"""
+        with self._lock:
+            stats = {
+                'name': self.name,
+                'host': self.host,
+                'max_concurrency': self.max_concurrency,
+                'in_flight': self.in_flight,
+                'searches': self.searches,
+                'failures': self.failures,
+                'rejected': self.rejected
+            }
+        stats['cache'] = self.cache.stats()
+        if hasattr(self.scraper, 'session_pool'):
+            stats['session_pool'] = self.scraper.session_pool.stats()
+        if self.breaker is not None:
+            stats['breaker'] = self.breaker.stats()
+        return stats
+
+
+class CourtRegistry:
+    """Court backends by code, with one default for requests that name no court"""
+
+    def __init__(self):
+        self._courts = {}
+        self.default_code = None
+
+    def register(self, backend, default=False):
+        # Stored cases are unique per court name, so names must not be shared
+        if any(other.name == backend.name and other.code != backend.code for other in self._courts.values()):
+            raise ValueError(f"Court name {backend.name!r} is already registered")
+        self._courts[backend.code] = backend
+        if default or self.default_code is None:
+            self.default_code = backend.code
+        return backend
+
+    def get(self, code=None):
+        """Backend for a court code, or the default court when code is empty"""
+        backend = self._courts.get(code or self.default_code)
+        if backend is None:
+            raise UnknownCourt(f"Unknown court: {code}")
+        return backend
+
+    @property
+    def default(self):
+        return self._courts[self.default_code]
+
+    def for_host(self, host):
+        """Backend serving a portal host (or one of its subdomains), or None"""
+        for backend in self._courts.values():
+            if host == backend.host or host.endswith('.' + backend.host):
+                return backend
+        return None
+
+    def __iter__(self):
+        return iter(list(self._courts.values()))
+
+    def list(self):
+        """Court codes and names for clients"""
+        return [
+            {'code': backend.code, 'name': backend.name, 'default': backend.code == self.default_code}
+            for backend in self._courts.values()
+        ]
+
+    def stats(self):
+        return {backend.code: backend.stats() for backend in self._courts.values()}
@@ -1,7 +1,16 @@
+import base64
+import binascii
+import csv
+import io
 import os
 from flask import current_app
-from models import db, CaseQuery, CaseDetail, OrderJudgment
-from datetime import datetime
+from sqlalchemy import bindparam, delete, event, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import (
+    db, CaseQuery, CaseDetail, OrderJudgment, SearchJob, StatCounter, QueryRollup, WatchedCase, CaseChangeEvent
+)
+from datetime import datetime, date, timedelta
 import json
 
 def init_database():
@@ -10,21 +19,47 @@ def init_database():
         db.create_all()
         current_app.logger.info("Database tables created successfully")
 
+def _coerce_date(value):
+    """Convert ISO date strings from the scraper into date objects"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+def _model_fields(model, data, date_fields=()):
+    """Keep only keys that map to model columns, normalizing date columns"""
+    columns = model.__table__.columns.keys()
+    fields = {key: value for key, value in data.items() if key in columns and key != 'id'}
+    for key in date_fields:
+        if key in fields:
+            fields[key] = _coerce_date(fields[key])
+    return fields
+
+def _build_query(case_type, case_number, filing_year, success=False,
+                 error_message=None, raw_response=None, parsed_data=None, ip_address=None):
+    return CaseQuery(
+        case_type=case_type,
+        case_number=case_number,
+        filing_year=filing_year,
+        success=success,
+        error_message=error_message,
+        raw_response=raw_response,
+        parsed_data=parsed_data,
+        ip_address=ip_address
+    )
+
 def log_query(case_type, case_number, filing_year, success=False, 
               error_message=None, raw_response=None, parsed_data=None, ip_address=None):
     """Log a case query to the database"""
     try:
-        query = CaseQuery(
-            case_type=case_type,
-            case_number=case_number,
-            filing_year=filing_year,
-            success=success,
-            error_message=error_message,
-            raw_response=raw_response,
-            parsed_data=parsed_data,
-            ip_address=ip_address
-        )
+        query = _build_query(case_type, case_number, filing_year, success,
+                             error_message, raw_response, parsed_data, ip_address)
         db.session.add(query)
+        _record_queries([{'case_type': case_type, 'success': success}])
         db.session.commit()
         return query.id
     except Exception as e:
@@ -32,26 +67,191 @@ def log_query(case_type, case_number, filing_year, success=False,
         current_app.logger.error(f"Error logging query: {str(e)}")
         return None
 
-def save_case_details(case_data):
-    """Save case details to database"""
+QUERY_LOG_COLUMNS = ('case_type', 'case_number', 'filing_year', 'query_timestamp', 'success',
+                     'error_message', 'raw_response', 'parsed_data', 'ip_address')
+
+def _copy_query_rows(rows):
+    """Stream rows into case_queries with PostgreSQL COPY"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        values = []
+        for column in QUERY_LOG_COLUMNS:
+            value = row.get(column)
+            if value is None:
+                value = '\\N'
+            elif column == 'parsed_data':
+                value = json.dumps(value)
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            values.append(value)
+        writer.writerow(values)
+    buffer.seek(0)
+    cursor = db.session.connection().connection.cursor()
     try:
-        # Check if case already exists
-        existing_case = CaseDetail.query.filter_by(case_id=case_data['case_id']).first()
-        
-        if existing_case:
-            # Update existing record
-            for key, value in case_data.items():
-                if hasattr(existing_case, key):
-                    setattr(existing_case, key, value)
-            existing_case.last_updated = datetime.utcnow()
-            case_detail = existing_case
+        cursor.copy_expert(
+            f"COPY case_queries ({', '.join(QUERY_LOG_COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def insert_query_log_batch(rows):
+    """Insert many log_query rows in one transaction (COPY on PostgreSQL, executemany elsewhere)"""
+    rows = [{column: row.get(column) for column in QUERY_LOG_COLUMNS} for row in rows]
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            _copy_query_rows(rows)
         else:
-            # Create new record
-            case_detail = CaseDetail(**case_data)
-            db.session.add(case_detail)
-        
+            db.session.execute(insert(CaseQuery), rows)
+        _record_queries(rows)
         db.session.commit()
-        return case_detail.id
+        return len(rows)
+    except Exception:
+        db.session.rollback()
+        raise
+
+UPSERT_CHUNK_SIZE = 500
+ORDER_FIELDS = ('order_date', 'order_type', 'description', 'pdf_url', 'file_size')
+
+def _dialect_insert(model):
+    """Return an insert() supporting ON CONFLICT for the bound dialect, or None"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return pg_insert(model)
+    if dialect == 'sqlite':
+        return sqlite_insert(model)
+    return None
+
+def _chunks(items, size=UPSERT_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _stage_case_details(case_data):
+    """Add or update a case in the current session without committing"""
+    case_data = _model_fields(CaseDetail, case_data, ('filing_date', 'next_hearing_date'))
+    # Check if case already exists
+    existing_case = CaseDetail.query.filter_by(case_id=case_data['case_id']).first()
+    
+    if existing_case:
+        # Update existing record
+        for key, value in case_data.items():
+            setattr(existing_case, key, value)
+        existing_case.last_updated = datetime.utcnow()
+        case_detail = existing_case
+    else:
+        # Create new record
+        case_detail = CaseDetail(**case_data)
+        db.session.add(case_detail)
+    db.session.flush()
+    return case_detail
+
+def _upsert_case_details(cases_data):
+    """Insert or update many cases with INSERT ... ON CONFLICT (case_id) DO UPDATE.
+
+    Returns {case_id: case_details.id}. Rows are grouped by their column set
+    so a case only overwrites the columns the scraper actually returned.
+    Dialects without ON CONFLICT fall back to per-row ORM staging.
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for case_data in cases_data:
+        row = _model_fields(CaseDetail, case_data, ('filing_date', 'next_hearing_date'))
+        row['last_updated'] = now
+        rows[row['case_id']] = row
+    if not rows:
+        return {}
+    if db.engine.dialect.name != 'postgresql':
+        # No way to tell inserts from updates in the upsert result; writers are serialized here anyway
+        existing = db.session.execute(select(CaseDetail.case_id).where(CaseDetail.case_id.in_(list(rows)))).scalars().all()
+        _bump_counters(unique_cases=len(rows) - len(existing))
+    if _dialect_insert(CaseDetail) is None:
+        return {case_id: _stage_case_details(row).id for case_id, row in rows.items()}
+    returning = [CaseDetail.case_id, CaseDetail.id]
+    if db.engine.dialect.name == 'postgresql':
+        # xmax is 0 only for rows this statement inserted rather than updated
+        returning.append(literal_column('xmax = 0'))
+    groups = {}
+    for row in rows.values():
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    case_ids = {}
+    inserted = 0
+    for columns, group in groups.items():
+        for chunk in _chunks(group):
+            stmt = _dialect_insert(CaseDetail).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['case_id'],
+                set_={column: stmt.excluded[column] for column in columns if column != 'case_id'}
+            ).returning(*returning)
+            for case_id, case_detail_id, *was_inserted in db.session.execute(stmt):
+                case_ids[case_id] = case_detail_id
+                inserted += bool(was_inserted and was_inserted[0])
+    if db.engine.dialect.name == 'postgresql':
+        _bump_counters(unique_cases=inserted)
+    return case_ids
+
+def _order_key(order):
+    # Orders have no natural key upstream; the PDF link identifies most of them
+    if order.get('pdf_url'):
+        return ('pdf', order['pdf_url'])
+    return ('row', order.get('order_date'), order.get('order_type'), order.get('description'))
+
+def _upsert_orders_judgments(orders_by_case):
+    """Diff incoming orders against stored rows and write only the changes.
+
+    orders_by_case maps case_details.id to the scraped orders list. New
+    orders are inserted, changed ones updated in place (keeping a known
+    file_size when the scraper does not report one) and orders no longer
+    listed are deleted, each as one set-based statement for the batch.
+    """
+    if not orders_by_case:
+        return {'inserted': 0, 'updated': 0, 'deleted': 0, 'added': [], 'removed': []}
+    existing = {}
+    stored_rows = db.session.execute(
+        select(OrderJudgment.id, OrderJudgment.case_detail_id, *[getattr(OrderJudgment, field) for field in ORDER_FIELDS])
+        .where(OrderJudgment.case_detail_id.in_(list(orders_by_case)))
+    ).mappings()
+    for stored in stored_rows:
+        existing.setdefault((stored['case_detail_id'], _order_key(stored)), []).append(dict(stored))
+    inserts, updates = [], []
+    for case_detail_id, orders_data in orders_by_case.items():
+        for order_data in orders_data:
+            order = _model_fields(OrderJudgment, order_data, ('order_date',))
+            matches = existing.get((case_detail_id, _order_key(order)))
+            if not matches:
+                order['case_detail_id'] = case_detail_id
+                inserts.append(order)
+                continue
+            stored = matches.pop(0)
+            if order.get('file_size') is None:
+                order.pop('file_size', None)
+            changes = {field: value for field, value in order.items() if stored.get(field) != value}
+            if changes:
+                changes['id'] = stored['id']
+                updates.append(changes)
+    stale = [stored for matches in existing.values() for stored in matches]
+    stale_ids = [stored['id'] for stored in stale]
+    if stale_ids:
+        db.session.execute(delete(OrderJudgment).where(OrderJudgment.id.in_(stale_ids)))
+    for chunk in _chunks(inserts):
+        db.session.execute(insert(OrderJudgment), chunk)
+    if updates:
+        db.session.execute(update(OrderJudgment), updates)
+    _bump_counters(total_orders=len(inserts) - len(stale_ids))
+    return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(stale_ids),
+            'added': inserts, 'removed': stale}
+
+FINGERPRINT_FIELDS = ('content_hash', 'etag', 'last_modified')
+
+def _with_fingerprint(case_data, fingerprint):
+    return dict(case_data, **fingerprint) if fingerprint else case_data
+
+def save_case_details(case_data, fingerprint=None):
+    """Save case details to database"""
+    try:
+        case_detail_id = _upsert_case_details([_with_fingerprint(case_data, fingerprint)]).get(case_data['case_id'])
+        db.session.commit()
+        return case_detail_id
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error saving case details: {str(e)}")
@@ -60,15 +260,7 @@ def save_case_details(case_data):
 def save_orders_judgments(case_detail_id, orders_data):
     """Save orders and judgments to database"""
     try:
-        # Delete existing orders for this case
-        OrderJudgment.query.filter_by(case_detail_id=case_detail_id).delete()
-        
-        # Add new orders
-        for order_data in orders_data:
-            order_data['case_detail_id'] = case_detail_id
-            order = OrderJudgment(**order_data)
-            db.session.add(order)
-        
+        _upsert_orders_judgments({case_detail_id: orders_data})
         db.session.commit()
         return True
     except Exception as e:
@@ -76,25 +268,472 @@ def save_orders_judgments(case_detail_id, orders_data):
         current_app.logger.error(f"Error saving orders/judgments: {str(e)}")
         return False
 
-def get_query_history(limit=100):
-    """Get recent query history"""
+def save_search_batch(results, queries):
+    """Save scraped cases and query log entries in a single transaction.
+
+    results is a list of scraper results; queries is a list of log_query
+    keyword dicts.
+    """
     try:
-        queries = CaseQuery.query.order_by(CaseQuery.query_timestamp.desc()).limit(limit).all()
-        return [query.to_frontend_dict() for query in queries]
+        # Unchanged results were already matched against the stored case
+        results = [result for result in results if result.get('case_details') and result.get('content') != 'unchanged']
+        case_ids = _upsert_case_details([
+            _with_fingerprint(result['case_details'], result.get('fingerprint')) for result in results
+        ])
+        _upsert_orders_judgments({
+            case_ids[result['case_details']['case_id']]: result['orders_judgments']
+            for result in results if result.get('orders_judgments')
+        })
+        if queries:
+            now = datetime.utcnow()
+            rows = [
+                {column: query.get(column, now if column == 'query_timestamp' else None) for column in QUERY_LOG_COLUMNS}
+                for query in queries
+            ]
+            db.session.execute(insert(CaseQuery), rows)
+            _record_queries(rows)
+        db.session.commit()
+        return True
     except Exception as e:
-        current_app.logger.error(f"Error fetching query history: {str(e)}")
+        db.session.rollback()
+        current_app.logger.error(f"Error saving search batch: {str(e)}")
+        return False
+
+def get_fresh_case_result(case_id, max_age_seconds):
+    """Load a stored case and its orders if it was updated within max_age_seconds"""
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        case_detail = CaseDetail.query.filter(
+            CaseDetail.case_id == case_id,
+            CaseDetail.last_updated >= cutoff
+        ).first()
+        if not case_detail:
+            return None
+        return {
+            'case_details': case_detail.to_dict(),
+            'orders_judgments': [order.to_dict() for order in case_detail.orders_judgments]
+        }
+    except Exception as e:
+        current_app.logger.error(f"Error loading cached case details: {str(e)}")
+        return None
+
+def get_case_fingerprint(case_id):
+    """Content hash and HTTP validators stored for a case, or None"""
+    try:
+        row = db.session.execute(
+            select(*[getattr(CaseDetail, field) for field in FINGERPRINT_FIELDS]).where(CaseDetail.case_id == case_id)
+        ).first()
+        if row is None or not row.content_hash:
+            return None
+        return dict(zip(FINGERPRINT_FIELDS, row))
+    except Exception as e:
+        current_app.logger.error(f"Error loading case fingerprint: {str(e)}")
+        return None
+
+def mark_case_unchanged(case_id, fingerprint):
+    """Record an unchanged re-fetch and return the stored case and its orders"""
+    try:
+        case_detail = CaseDetail.query.filter_by(case_id=case_id).first()
+        if not case_detail:
+            return None
+        case_detail.last_updated = datetime.utcnow()
+        case_detail.etag = fingerprint.get('etag')
+        case_detail.last_modified = fingerprint.get('last_modified')
+        db.session.commit()
+        return {
+            'case_details': case_detail.to_dict(),
+            'orders_judgments': [order.to_dict() for order in case_detail.orders_judgments]
+        }
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error marking case unchanged: {str(e)}")
+        return None
+
+def get_recent_order_documents(case_id, limit=3):
+    """Get the most recent orders with PDFs for a case, newest first"""
+    try:
+        orders = OrderJudgment.query.join(CaseDetail).filter(
+            CaseDetail.case_id == case_id,
+            OrderJudgment.pdf_url.isnot(None)
+        ).order_by(
+            OrderJudgment.order_date.is_(None), OrderJudgment.order_date.desc(), OrderJudgment.id.desc()
+        ).limit(limit).all()
+        return [{'id': order.id, 'pdf_url': order.pdf_url} for order in orders]
+    except Exception as e:
+        current_app.logger.error(f"Error fetching order documents: {str(e)}")
         return []
 
+def update_document_file_size(pdf_url, file_size):
+    """Record the downloaded size on every order row pointing at pdf_url"""
+    try:
+        OrderJudgment.query.filter_by(pdf_url=pdf_url).update({'file_size': file_size})
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error updating document file size: {str(e)}")
+        return False
+
+HISTORY_MAX_LIMIT = 100
+
+def encode_history_cursor(query_timestamp, query_id):
+    """Opaque keyset cursor for the (query_timestamp, id) position of a history row"""
+    raw = json.dumps([query_timestamp.isoformat(), query_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_history_cursor(cursor):
+    """Inverse of encode_history_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, query_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(query_id)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _history_query(filters, after=None):
+    """Filtered history query in (query_timestamp, id) DESC order, starting after a keyset position"""
+    filters = filters or {}
+    query = CaseQuery.query.filter(CaseQuery.query_timestamp.isnot(None))
+    if filters.get('case_type'):
+        query = query.filter(CaseQuery.case_type == filters['case_type'])
+    if filters.get('success') is not None:
+        query = query.filter(CaseQuery.success.is_(filters['success']))
+    if filters.get('since'):
+        query = query.filter(CaseQuery.query_timestamp >= filters['since'])
+    if filters.get('until'):
+        query = query.filter(CaseQuery.query_timestamp < filters['until'])
+    if after:
+        query = query.filter(tuple_(CaseQuery.query_timestamp, CaseQuery.id) < tuple_(*after))
+    return query.order_by(CaseQuery.query_timestamp.desc(), CaseQuery.id.desc())
+
+def get_query_history(limit=20, cursor=None, filters=None):
+    """Get one page of query history, newest first.
+
+    filters may contain case_type, success, since and until (until is
+    exclusive). Returns {'items': [...], 'next_cursor': str or None};
+    a malformed cursor raises ValueError.
+    """
+    limit = max(1, min(limit, HISTORY_MAX_LIMIT))
+    after = decode_history_cursor(cursor) if cursor else None
+    try:
+        queries = _history_query(filters, after).limit(limit + 1).all()
+        next_cursor = None
+        if len(queries) > limit:
+            queries = queries[:limit]
+            next_cursor = encode_history_cursor(queries[-1].query_timestamp, queries[-1].id)
+        return {'items': [query.to_frontend_dict() for query in queries], 'next_cursor': next_cursor}
+    except Exception as e:
+        current_app.logger.error(f"Error fetching query history: {str(e)}")
+        return {'items': [], 'next_cursor': None}
+
+def iter_query_history(filters=None, batch_size=500):
+    """Yield every matching history row, newest first, one keyset page at a time"""
+    after = None
+    while True:
+        queries = _history_query(filters, after).limit(batch_size).all()
+        for query in queries:
+            yield query.to_frontend_dict()
+        if len(queries) < batch_size:
+            return
+        after = (queries[-1].query_timestamp, queries[-1].id)
+        # Release the page's ORM objects before loading the next one
+        db.session.expunge_all()
+
+STAT_COUNTERS = ('total_queries', 'successful_queries', 'unique_cases', 'total_orders')
+
+def _hour_bucket(timestamp):
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+def _bump_counters(**deltas):
+    """Add deltas to the maintained stat_counters rows when the current transaction commits"""
+    pending = db.session.info.setdefault('stat_deltas', {})
+    for name, delta in deltas.items():
+        if delta:
+            pending[name] = pending.get(name, 0) + delta
+
+@event.listens_for(db.session, 'before_commit')
+def _flush_counters(session):
+    # Applied last so the hot stat_counters rows stay locked only for the commit itself;
+    # sorted so concurrent writers lock them in the same order
+    pending = session.info.pop('stat_deltas', None)
+    if not pending:
+        return
+    counters = StatCounter.__table__
+    # Counters only exist once rebuild_statistics() has seeded them from the base tables
+    session.connection().execute(
+        update(counters).where(counters.c.name == bindparam('counter'))
+        .values(value=counters.c.value + bindparam('delta')),
+        [{'counter': name, 'delta': pending[name]} for name in sorted(pending)]
+    )
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_counters(session, previous_transaction):
+    session.info.pop('stat_deltas', None)
+
+def _record_queries(queries):
+    """Update query counters and hourly rollups for newly logged queries"""
+    now = datetime.utcnow()
+    successful = 0
+    rollups = {}
+    for query in queries:
+        key = (_hour_bucket(query.get('query_timestamp') or now), query['case_type'])
+        bucket = rollups.setdefault(key, [0, 0])
+        bucket[0] += 1
+        if query.get('success'):
+            bucket[1] += 1
+            successful += 1
+    _bump_counters(total_queries=len(queries), successful_queries=successful)
+    stmt = _dialect_insert(QueryRollup)
+    if stmt is None or not rollups:
+        return
+    stmt = stmt.values([
+        {'bucket': bucket, 'case_type': case_type, 'total': total, 'successful': ok}
+        for (bucket, case_type), (total, ok) in rollups.items()
+    ])
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['bucket', 'case_type'],
+        set_={
+            'total': QueryRollup.total + stmt.excluded.total,
+            'successful': QueryRollup.successful + stmt.excluded.successful
+        }
+    ))
+
+def _seed_statement(model, keys, values):
+    """INSERT that overwrites rows a concurrent rebuild already seeded"""
+    stmt = _dialect_insert(model)
+    if stmt is None:
+        return insert(model)
+    return stmt.on_conflict_do_update(index_elements=keys, set_={column: stmt.excluded[column] for column in values})
+
+def rebuild_statistics():
+    """Recompute stat_counters and query_rollups from the base tables.
+
+    Runs automatically the first time statistics are read on a database
+    without counters; call it again after bulk imports or manual deletes.
+    """
+    try:
+        if db.engine.dialect.name == 'postgresql':
+            hour = func.date_trunc('hour', CaseQuery.query_timestamp)
+        else:
+            hour = func.strftime('%Y-%m-%d %H:00:00', CaseQuery.query_timestamp)
+        rollups = db.session.execute(
+            select(hour, CaseQuery.case_type, func.count(), func.count().filter(CaseQuery.success.is_(True)))
+            .where(CaseQuery.query_timestamp.isnot(None))
+            .group_by(hour, CaseQuery.case_type)
+        ).all()
+        counters = {
+            'total_queries': db.session.scalar(select(func.count()).select_from(CaseQuery)),
+            'successful_queries': db.session.scalar(select(func.count()).select_from(CaseQuery).where(CaseQuery.success.is_(True))),
+            'unique_cases': db.session.scalar(select(func.count()).select_from(CaseDetail)),
+            'total_orders': db.session.scalar(select(func.count()).select_from(OrderJudgment))
+        }
+        # The base-table counts already include this transaction's writes
+        db.session.info.pop('stat_deltas', None)
+        db.session.execute(delete(QueryRollup))
+        for chunk in _chunks(rollups):
+            db.session.execute(_seed_statement(QueryRollup, ['bucket', 'case_type'], ['total', 'successful']), [
+                {'bucket': bucket if isinstance(bucket, datetime) else datetime.fromisoformat(bucket),
+                 'case_type': case_type, 'total': total, 'successful': successful}
+                for bucket, case_type, total, successful in chunk
+            ])
+        db.session.execute(_seed_statement(StatCounter, ['name'], ['value']),
+                           [{'name': name, 'value': value} for name, value in counters.items()])
+        db.session.commit()
+        return counters
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error rebuilding statistics: {str(e)}")
+        return {}
+
 def get_case_statistics():
     """Get database statistics"""
     try:
-        stats = {
-            'total_queries': CaseQuery.query.count(),
-            'successful_queries': CaseQuery.query.filter_by(success=True).count(),
-            'unique_cases': CaseDetail.query.count(),
-            'total_orders': OrderJudgment.query.count()
-        }
-        return stats
+        stats = {counter.name: counter.value for counter in StatCounter.query.all()}
+        if any(name not in stats for name in STAT_COUNTERS):
+            stats = rebuild_statistics()
+            if not stats:
+                return {}
+        return {name: stats.get(name, 0) for name in STAT_COUNTERS}
     except Exception as e:
         current_app.logger.error(f"Error fetching statistics: {str(e)}")
-        return {}
\ No newline at end of file
+        return {}
+
+def _success_rate(total, successful):
+    return round(successful / total, 4) if total else None
+
+def get_query_breakdown(granularity='day', days=7):
+    """Per-hour or per-day query totals and per-case-type success rates from the rollups"""
+    try:
+        since = _hour_bucket(datetime.utcnow()) - timedelta(days=days)
+        rollups = QueryRollup.query.filter(QueryRollup.bucket >= since).all()
+        buckets = {}
+        case_types = {}
+        for rollup in rollups:
+            bucket = rollup.bucket if granularity == 'hour' else rollup.bucket.replace(hour=0)
+            for totals in (buckets.setdefault(bucket, [0, 0]), case_types.setdefault(rollup.case_type, [0, 0])):
+                totals[0] += rollup.total
+                totals[1] += rollup.successful
+        return {
+            'granularity': granularity,
+            'since': since.isoformat(),
+            'buckets': [
+                {'bucket': bucket.isoformat(), 'total': total, 'successful': successful,
+                 'success_rate': _success_rate(total, successful)}
+                for bucket, (total, successful) in sorted(buckets.items())
+            ],
+            'case_types': [
+                {'case_type': case_type, 'total': total, 'successful': successful,
+                 'success_rate': _success_rate(total, successful)}
+                for case_type, (total, successful) in sorted(case_types.items(), key=lambda item: -item[1][0])
+            ]
+        }
+    except Exception as e:
+        current_app.logger.error(f"Error fetching query breakdown: {str(e)}")
+        return {}
+
+def save_search_job(job):
+    """Insert or update the persisted state of an asynchronous search job"""
+    try:
+        search_job = db.session.get(SearchJob, job['id']) or SearchJob(id=job['id'])
+        search_job.status = job['status']
+        search_job.params = job.get('params')
+        search_job.result = job.get('result')
+        search_job.error = job.get('error')
+        for key in ('created_at', 'started_at', 'finished_at'):
+            if job.get(key):
+                setattr(search_job, key, datetime.fromisoformat(job[key]))
+        db.session.add(search_job)
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error saving search job: {str(e)}")
+        return False
+
+def get_search_job(job_id):
+    """Load a persisted asynchronous search job"""
+    try:
+        search_job = db.session.get(SearchJob, job_id)
+        return search_job.to_dict() if search_job else None
+    except Exception as e:
+        current_app.logger.error(f"Error fetching search job: {str(e)}")
+        return None
+
+TRACKED_CASE_FIELDS = ('status', 'next_hearing_date', 'stage', 'judge_name', 'petitioner', 'respondent', 'filing_date')
+
+def _comparable(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    return None if value in (None, '', '-') else str(value)
+
+def _order_label(order):
+    order_date = order.get('order_date')
+    parts = [_comparable(order_date), order.get('order_type'), order.get('description') or order.get('pdf_url')]
+    return ' | '.join(str(part) for part in parts if part)
+
+def apply_case_changes(result):
+    """Diff a fresh scrape against the stored case and write only what changed.
+
+    Changed tracked fields are updated in place and orders go through the
+    order diff; each difference is recorded as a CaseChangeEvent. A case
+    seen for the first time is stored as the baseline without events.
+    Returns the list of event dicts.
+    """
+    try:
+        incoming = _model_fields(CaseDetail, result['case_details'], ('filing_date', 'next_hearing_date'))
+        case_id = incoming['case_id']
+        stored = CaseDetail.query.filter_by(case_id=case_id).first()
+        fingerprint = result.get('fingerprint')
+        if stored is None:
+            case_ids = _upsert_case_details([_with_fingerprint(result['case_details'], fingerprint)])
+            _upsert_orders_judgments({case_ids[case_id]: result.get('orders_judgments') or []})
+            db.session.commit()
+            return []
+        now = datetime.utcnow()
+        events = []
+        changes = {}
+        for field in TRACKED_CASE_FIELDS:
+            if field not in incoming:
+                continue
+            old_value, new_value = _comparable(getattr(stored, field)), _comparable(incoming[field])
+            if old_value != new_value:
+                changes[field] = incoming[field]
+                events.append({'event_type': 'field_changed', 'field': field,
+                               'old_value': old_value, 'new_value': new_value})
+        if changes or fingerprint:
+            changes.update(fingerprint or {}, last_updated=now)
+            db.session.execute(update(CaseDetail).where(CaseDetail.id == stored.id).values(**changes))
+        order_changes = _upsert_orders_judgments({stored.id: result.get('orders_judgments') or []})
+        events.extend({'event_type': 'order_added', 'field': 'orders_judgments', 'old_value': None,
+                       'new_value': _order_label(order)} for order in order_changes['added'])
+        events.extend({'event_type': 'order_removed', 'field': 'orders_judgments', 'old_value': _order_label(order),
+                       'new_value': None} for order in order_changes['removed'])
+        for event in events:
+            event.update(case_id=case_id, detected_at=now)
+        if events:
+            db.session.execute(insert(CaseChangeEvent), events)
+        db.session.commit()
+        return [dict(event, detected_at=now.isoformat()) for event in events]
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error applying case changes: {str(e)}")
+        raise
+
+def add_watched_case(case_id, case_type, case_number, filing_year, court=None):
+    """Start watching a case; returns the watch, or the existing one"""
+    watched = WatchedCase.query.filter_by(case_id=case_id).first()
+    if watched is None:
+        watched = WatchedCase(case_id=case_id, court=court, case_type=case_type, case_number=case_number,
+                              filing_year=filing_year, next_check_at=datetime.utcnow())
+        db.session.add(watched)
+        db.session.commit()
+    return watched.to_dict()
+
+def remove_watched_case(case_id):
+    """Stop watching a case; returns False if it was not watched"""
+    deleted = WatchedCase.query.filter_by(case_id=case_id).delete()
+    db.session.commit()
+    return bool(deleted)
+
+def list_watched_cases():
+    """All watched cases, soonest next check first"""
+    return [watched.to_dict() for watched in WatchedCase.query.order_by(WatchedCase.next_check_at).all()]
+
+def claim_due_watches(limit, lease_seconds):
+    """Claim up to limit watches that are due, leasing them so other workers skip them"""
+    try:
+        now = datetime.utcnow()
+        due = WatchedCase.query.filter(WatchedCase.next_check_at <= now).order_by(
+            WatchedCase.next_check_at
+        ).limit(limit).with_for_update(skip_locked=True).all()
+        for watched in due:
+            watched.next_check_at = now + timedelta(seconds=lease_seconds)
+        claimed = [watched.to_dict() for watched in due]
+        db.session.commit()
+        return claimed
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error claiming due watches: {str(e)}")
+        return []
+
+def finish_watch_check(case_id, next_check_at, error=None):
+    """Record the outcome of a watch check and when to check again"""
+    try:
+        WatchedCase.query.filter_by(case_id=case_id).update({
+            'last_checked_at': datetime.utcnow(),
+            'next_check_at': next_check_at,
+            'check_count': WatchedCase.check_count + 1,
+            'last_error': error
+        })
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error updating watch {case_id}: {str(e)}")
+
+def get_change_events(case_id=None, limit=100):
+    """Recent change events, newest first, optionally for one case"""
+    query = CaseChangeEvent.query
+    if case_id:
+        query = query.filter_by(case_id=case_id)
+    events = query.order_by(CaseChangeEvent.detected_at.desc(), CaseChangeEvent.id.desc()).limit(limit).all()
+    return [event.to_dict() for event in events]
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+
+class DocumentTooLarge(Exception):
+    """Raised when a document exceeds the configured size limit"""
+
+
+def iter_bounded(chunks, max_bytes):
+    """Pass chunks through, raising DocumentTooLarge once max_bytes is exceeded"""
+    total = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        total += len(chunk)
+        if max_bytes and total > max_bytes:
+            raise DocumentTooLarge(f"Document exceeds the {max_bytes} byte limit")
+        yield chunk
+
+
+class DocumentCache:
+    """Content-addressed on-disk cache for downloaded court documents.
+
+    Blobs are stored once per SHA-256 of their content under blobs/, and a
+    small JSON index entry per source URL points at the blob. When the
+    total blob size passes max_bytes the least recently used blobs (by
+    modification time, refreshed on every hit) are removed.
+    """
+
+    def __init__(self, root, max_bytes=1024 * 1024 * 1024, max_file_bytes=50 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.rejected = 0
+        os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'index'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'tmp'), exist_ok=True)
+
+    def _index_path(self, url):
+        return os.path.join(self.root, 'index', hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, 'blobs', digest[:2], digest + '.pdf')
+
+    def lookup(self, url):
+        """Return {'path', 'etag', 'size', 'content_type'} for a cached URL, or None"""
+        try:
+            with open(self._index_path(url), encoding='utf-8') as f:
+                entry = json.load(f)
+            path = self._blob_path(entry['etag'])
+            # Mark the blob as recently used for LRU eviction
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            self._count('misses')
+            return None
+        self._count('hits')
+        entry['path'] = path
+        return entry
+
+    def store_stream(self, url, chunks, content_type='application/pdf'):
+        """Yield chunks to the caller while teeing them into the cache.
+
+        The blob is only committed once the stream has been consumed
+        completely; oversized or interrupted downloads leave nothing behind.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, 'tmp'))
+        committed = False
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                for chunk in iter_bounded(chunks, self.max_file_bytes):
+                    digest.update(chunk)
+                    tmp_file.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+            self._commit(url, tmp_path, digest.hexdigest(), size, content_type)
+            committed = True
+        except DocumentTooLarge:
+            self._count('rejected')
+            raise
+        finally:
+            if not committed and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def fetch(self, url, chunks, content_type='application/pdf'):
+        """Store a whole stream without forwarding it; returns the index entry"""
+        for _ in self.store_stream(url, chunks, content_type):
+            pass
+        return self.lookup(url)
+
+    def _commit(self, url, tmp_path, etag, size, content_type):
+        blob_path = self._blob_path(etag)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            os.remove(tmp_path)
+            os.utime(blob_path)
+        else:
+            os.replace(tmp_path, blob_path)
+        index_path = self._index_path(url)
+        with open(index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'etag': etag, 'size': size, 'content_type': content_type,
+                       'stored_at': time.time()}, f)
+        os.replace(index_path + '.tmp', index_path)
+        self._count('stored')
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used blobs until the cache fits in max_bytes"""
+        with self._lock:
+            blobs = []
+            total = 0
+            for dirpath, _, filenames in os.walk(os.path.join(self.root, 'blobs')):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    blobs.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(blobs):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evicted += 1
+                # Index entries pointing at the removed blob become misses on lookup
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return cache counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stored': self.stored,
+                'evicted': self.evicted,
+                'rejected_too_large': self.rejected,
+                'max_bytes': self.max_bytes,
+                'max_file_bytes': self.max_file_bytes
+            }
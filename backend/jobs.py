@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class JobQueueFull(Exception):
+    """Raised when the job pool already has too many pending jobs"""
+
+
+class JobManager:
+    """Bounded worker pool for long-running searches.
+
+    Jobs are tracked in memory and, when a store callback is given, every
+    status change is also handed to it so other workers can answer polls.
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, result_ttl=3600, store=None):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.store = store
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='search-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def submit(self, fn, *args, params=None):
+        """Queue fn(*args) and return the new job id"""
+        self._purge_expired()
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFull('Too many searches are queued. Please try again shortly.')
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'params': params or {},
+                'created_at': datetime.utcnow().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                '_expires': None
+            }
+            self.submitted += 1
+        self._save(job_id)
+        self._executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def get(self, job_id):
+        """Return a copy of the job record, or None if unknown or expired"""
+        self._purge_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._public(job)
+        if self.store:
+            return self.store.load(job_id)
+        return None
+
+    def _run(self, job_id, fn, args):
+        self._update(job_id, status='running', started_at=datetime.utcnow().isoformat())
+        try:
+            result = fn(*args)
+            self._update(job_id, status='succeeded', result=result)
+            with self._lock:
+                self.succeeded += 1
+        except Exception as e:
+            self.logger.error(f"Search job {job_id} failed: {str(e)}")
+            self._update(job_id, status='failed', error=str(e))
+            with self._lock:
+                self.failed += 1
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if fields.get('status') in ('succeeded', 'failed'):
+                job['finished_at'] = datetime.utcnow().isoformat()
+                job['_expires'] = time.monotonic() + self.result_ttl
+        self._save(job_id)
+
+    def _save(self, job_id):
+        if not self.store:
+            return
+        with self._lock:
+            job = self._jobs.get(job_id)
+            job = self._public(job) if job else None
+        if job:
+            try:
+                self.store.save(job)
+            except Exception as e:
+                self.logger.error(f"Error persisting search job {job_id}: {str(e)}")
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job['_expires'] and job['_expires'] <= now]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _public(self, job):
+        return {key: value for key, value in job.items() if not key.startswith('_')}
+
+    def stats(self):
+        """Return pool counters for the stats endpoint"""
+        with self._lock:
+            statuses = [job['status'] for job in self._jobs.values()]
+            return {
+                'workers': self.max_workers,
+                'queued': statuses.count('queued'),
+                'running': statuses.count('running'),
+                'submitted': self.submitted,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,163 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Searches take anywhere from milliseconds (cache) to tens of seconds (throttled upstream)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labels=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}' for key, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+    kind = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution with _bucket, _sum and _count series"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labels, registry)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['counts'][index] += 1
+                    break
+            state['sum'] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state['counts']), state['sum']) for key, state in self._values.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+# Metrics shared by the scrapers, rate limiter, session pool and app
+SEARCH_SECONDS = Histogram('court_search_seconds', 'End-to-end /api/search resolution time', labels=('source',))
+STAGE_SECONDS = Histogram('court_search_stage_seconds', 'Time spent in each stage of a search', labels=('stage',))
+SEARCHES_IN_FLIGHT = Gauge('court_searches_in_flight', 'Searches currently being resolved by this worker')
+CACHE_REQUESTS = Counter('court_case_cache_requests_total', 'Case cache lookups by result', labels=('result',))
+SCRAPER_RETRIES = Counter('court_scraper_retries_total', 'Failed scrape attempts that were retried', labels=('scraper',))
+BLOCK_PAGES = Counter('court_block_pages_total', 'Block or captcha pages detected', labels=('host',))
+UPSTREAM_RESPONSES = Counter('court_upstream_responses_total', 'Upstream responses by status code',
+                             labels=('host', 'method', 'status'))
+CONTENT_CHECKS = Counter('court_content_checks_total', 'Re-fetches of stored cases by whether the portal content changed',
+                         labels=('result',))
+COURT_SEARCHES_IN_FLIGHT = Gauge('court_backend_searches_in_flight', 'Upstream searches running per court backend',
+                                 labels=('court',))
+COURT_REJECTIONS = Counter('court_backend_rejections_total', 'Searches rejected because a court was at its concurrency limit',
+                           labels=('court',))
+CIRCUIT_STATE = Gauge('court_circuit_state', 'Circuit breaker state per host (0 closed, 1 half-open, 2 open)', labels=('host',))
+CIRCUIT_TRANSITIONS = Counter('court_circuit_transitions_total', 'Circuit breaker state changes', labels=('host', 'state'))
+CIRCUIT_REJECTIONS = Counter('court_circuit_rejections_total', 'Requests failed fast by an open circuit', labels=('host',))
@@ -6,6 +6,12 @@ db = SQLAlchemy()
 
 class CaseQuery(db.Model):
     __tablename__ = 'case_queries'
+    __table_args__ = (
+        # Keyset pagination of /api/history on (query_timestamp, id), optionally filtered
+        db.Index('idx_case_queries_timestamp', db.text('query_timestamp DESC'), db.text('id DESC')),
+        db.Index('idx_case_queries_type_timestamp', 'case_type', db.text('query_timestamp DESC'), db.text('id DESC')),
+        db.Index('idx_case_queries_success_timestamp', 'success', db.text('query_timestamp DESC'), db.text('id DESC')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     case_type = db.Column(db.String(100), nullable=False)
@@ -62,6 +68,10 @@ class CaseDetail(db.Model):
     court_name = db.Column(db.String(200))
     judge_name = db.Column(db.String(200))
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
+    # Fingerprint of the last portal response, used to skip re-parsing unchanged content
+    content_hash = db.Column(db.String(64))
+    etag = db.Column(db.String(200))
+    last_modified = db.Column(db.String(100))
     
     def to_dict(self):
         return {
@@ -102,4 +112,100 @@ class OrderJudgment(db.Model):
             'description': self.description,
             'pdf_url': self.pdf_url,
             'file_size': self.file_size
-        }
\ No newline at end of file
+        }
+
+class SearchJob(db.Model):
+    __tablename__ = 'search_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(20), nullable=False)
+    params = db.Column(db.JSON)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'result': self.result,
+            'error': self.error
+        }
+
+class StatCounter(db.Model):
+    __tablename__ = 'stat_counters'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+class QueryRollup(db.Model):
+    __tablename__ = 'query_rollups'
+
+    bucket = db.Column(db.DateTime, primary_key=True)  # Start of the UTC hour
+    case_type = db.Column(db.String(100), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    successful = db.Column(db.Integer, nullable=False, default=0)
+
+class CaseQueryRaw(db.Model):
+    __tablename__ = 'case_query_raw'
+
+    query_id = db.Column(db.Integer, primary_key=True)
+    query_timestamp = db.Column(db.DateTime, nullable=False, index=True)
+    raw_response_gz = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed UTF-8
+
+class WatchedCase(db.Model):
+    __tablename__ = 'watched_cases'
+
+    id = db.Column(db.Integer, primary_key=True)
+    case_id = db.Column(db.String(200), unique=True, nullable=False)
+    court = db.Column(db.String(50))  # court code; the default court when empty
+    case_type = db.Column(db.String(100), nullable=False)
+    case_number = db.Column(db.String(100), nullable=False)
+    filing_year = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_checked_at = db.Column(db.DateTime)
+    next_check_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    check_count = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            'case_id': self.case_id,
+            'court': self.court,
+            'case_type': self.case_type,
+            'case_number': self.case_number,
+            'filing_year': self.filing_year,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_checked_at': self.last_checked_at.isoformat() if self.last_checked_at else None,
+            'next_check_at': self.next_check_at.isoformat() if self.next_check_at else None,
+            'check_count': self.check_count,
+            'last_error': self.last_error
+        }
+
+class CaseChangeEvent(db.Model):
+    __tablename__ = 'case_change_events'
+
+    id = db.Column(db.Integer, primary_key=True)
+    case_id = db.Column(db.String(200), nullable=False, index=True)
+    detected_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    event_type = db.Column(db.String(30), nullable=False)  # field_changed/order_added/order_removed
+    field = db.Column(db.String(50))
+    old_value = db.Column(db.Text)
+    new_value = db.Column(db.Text)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'case_id': self.case_id,
+            'detected_at': self.detected_at.isoformat() if self.detected_at else None,
+            'event_type': self.event_type,
+            'field': self.field,
+            'old_value': self.old_value,
+            'new_value': self.new_value
+        }
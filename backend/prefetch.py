@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def format_file_size(size):
+    """Human readable size for the orders_judgments.file_size column"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024.0
+
+
+class PdfPrefetcher:
+    """Background prefetch of the latest order/judgment PDFs for a case.
+
+    schedule(case_id) queues a task on a small thread pool; the task loads
+    the case's most recent orders with PDFs through load_orders, downloads
+    any that are not cached yet into the document cache via open_document,
+    and records each file's size through save_file_size. Prefetching is
+    low priority: it waits while interactive requests are queued on the
+    upstream host (busy() returns True) and drops work when its own queue
+    is full. With allow_url set, orders whose pdf_url it rejects are
+    skipped instead of fetched.
+    """
+
+    def __init__(self, document_cache, open_document, load_orders, save_file_size,
+                 latest=3, max_workers=2, max_pending=50, busy=None, max_busy_wait=60, allow_url=None):
+        self.document_cache = document_cache
+        self.open_document = open_document
+        self.load_orders = load_orders
+        self.save_file_size = save_file_size
+        self.latest = latest
+        self.max_pending = max_pending
+        self.busy = busy
+        self.max_busy_wait = max_busy_wait
+        self.allow_url = allow_url
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-prefetch')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.scheduled = 0
+        self.dropped = 0
+        self.fetched = 0
+        self.already_cached = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def schedule(self, case_id):
+        """Queue a prefetch for case_id; returns False if it was dropped"""
+        with self._lock:
+            if case_id in self._pending:
+                return True
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending.add(case_id)
+            self.scheduled += 1
+        self._executor.submit(self._prefetch_case, case_id)
+        return True
+
+    def _prefetch_case(self, case_id):
+        try:
+            for order in self.load_orders(case_id, self.latest):
+                if self.allow_url and not self.allow_url(order['pdf_url']):
+                    self._count('skipped')
+                    continue
+                self._prefetch_document(order['pdf_url'])
+        except Exception as e:
+            self.logger.error(f"Error prefetching documents for {case_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(case_id)
+
+    def _prefetch_document(self, pdf_url):
+        entry = self.document_cache.lookup(pdf_url)
+        if entry:
+            self._count('already_cached')
+        else:
+            self._wait_until_idle()
+            try:
+                response = self.open_document(pdf_url, self.document_cache.max_file_bytes)
+                with response:
+                    content_type = response.headers.get('Content-Type', 'application/pdf').split(';')[0]
+                    entry = self.document_cache.fetch(pdf_url, response.iter_content(chunk_size=64 * 1024), content_type)
+                self._count('fetched')
+            except Exception as e:
+                self._count('failed')
+                self.logger.warning(f"Could not prefetch {pdf_url}: {str(e)}")
+                return
+        if entry:
+            self.save_file_size(pdf_url, format_file_size(entry['size']))
+
+    def _wait_until_idle(self):
+        waited = 0.0
+        while self.busy and self.busy() and waited < self.max_busy_wait:
+            time.sleep(1.0)
+            waited += 1.0
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return prefetch counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'pending_cases': len(self._pending),
+                'scheduled': self.scheduled,
+                'dropped': self.dropped,
+                'fetched': self.fetched,
+                'already_cached': self.already_cached,
+                'skipped': self.skipped,
+                'failed': self.failed
+            }
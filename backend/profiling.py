@@ -0,0 +1,124 @@
+import cProfile
+import io
+import itertools
+import logging
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class _StoredStats:
+    """Minimal stand-in accepted by pstats.Stats for re-rendering a stored profile"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class SearchProfiler:
+    """Opt-in cProfile capture for slow searches.
+
+    A search is profiled when it is forced (per-request header) or picked
+    by sample_rate. Profiles whose wall time reaches threshold seconds, and
+    every forced one, are kept in a ring of the last keep profiles. Only one
+    search is profiled at a time per process; when profiling is off the
+    cost is a random() call.
+    """
+
+    def __init__(self, sample_rate=0.0, threshold=2.0, keep=20):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.logger = logging.getLogger(__name__)
+        self._profiles = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self._ids = itertools.count(1)
+        self.profiled = 0
+        self.kept = 0
+        self.skipped_busy = 0
+
+    @contextmanager
+    def profile(self, label, forced=False):
+        """Profile the enclosed block if it is forced or sampled"""
+        if not (forced or (self.sample_rate and random.random() < self.sample_rate)):
+            yield
+            return
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self.skipped_busy += 1
+            yield
+            return
+        profiler = cProfile.Profile()
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        finally:
+            self._active.release()
+            self._store(profiler, label, forced, started_at, time.perf_counter() - started)
+
+    def _store(self, profiler, label, forced, started_at, duration):
+        with self._lock:
+            self.profiled += 1
+        if duration < self.threshold and not forced:
+            return
+        profiler.create_stats()
+        entry = {
+            'id': next(self._ids),
+            'label': label,
+            'forced': forced,
+            'started_at': started_at.isoformat(),
+            'duration_seconds': round(duration, 4),
+            'stats': marshal.dumps(profiler.stats)
+        }
+        with self._lock:
+            self._profiles.append(entry)
+            self.kept += 1
+        self.logger.info(f"Kept profile {entry['id']} for {label} ({duration:.2f}s)")
+
+    def list(self):
+        """Summaries of the kept profiles, newest first"""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [{key: value for key, value in entry.items() if key != 'stats'} for entry in reversed(profiles)]
+
+    def get_raw(self, profile_id):
+        """The profile in cProfile's .prof (marshal) format, for snakeviz and friends"""
+        with self._lock:
+            for entry in self._profiles:
+                if entry['id'] == profile_id:
+                    return entry['stats']
+        return None
+
+    def render(self, profile_id, sort='cumulative', limit=40):
+        """pstats text report of a kept profile, or None"""
+        raw = self.get_raw(profile_id)
+        if raw is None:
+            return None
+        output = io.StringIO()
+        stats = pstats.Stats(_StoredStats(marshal.loads(raw)), stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def stats(self):
+        """Return profiler counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'sample_rate': self.sample_rate,
+                'threshold_seconds': self.threshold,
+                'profiled': self.profiled,
+                'kept': self.kept,
+                'stored': len(self._profiles),
+                'skipped_busy': self.skipped_busy
+            }
@@ -0,0 +1,129 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+
+class QueryLogWriter:
+    """Buffered, batched writer for case_queries audit rows.
+
+    submit() only enqueues; a background thread drains the queue and hands
+    batches of up to batch_size rows to insert_batch, so request latency no
+    longer includes a commit. The queue is bounded: when it is full the
+    'drop' policy discards the new row immediately, while 'block' waits up
+    to block_timeout for room before dropping. Dropped rows are counted.
+    A batch that fails is retried row by row, so a bad row only loses
+    itself.
+    """
+
+    def __init__(self, insert_batch, max_queue=10000, batch_size=200, flush_interval=1.0,
+                 policy='drop', block_timeout=0.05):
+        self.insert_batch = insert_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.logger = logging.getLogger(__name__)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name='query-log-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, **row):
+        """Queue one log_query-style row; returns False if it was dropped"""
+        row.setdefault('query_timestamp', datetime.utcnow())
+        try:
+            if self.policy == 'block':
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            self.insert_batch(batch)
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+        except Exception as e:
+            self.logger.error(f"Error writing {len(batch)} query log rows: {str(e)}")
+            if len(batch) > 1:
+                self._write_rows(batch)
+            else:
+                self._count('failed')
+
+    def _write_rows(self, batch):
+        """Retry a failed batch row by row so one bad row only loses itself"""
+        written = 0
+        for row in batch:
+            try:
+                self.insert_batch([row])
+                written += 1
+            except Exception as e:
+                self.logger.error(f"Dropping query log row for {row.get('case_type')} "
+                                  f"{row.get('case_number')}/{row.get('filing_year')}: {str(e)}")
+        with self._lock:
+            self.written += written
+            self.failed += len(batch) - written
+            self.batches += 1
+
+    def close(self, timeout=10.0):
+        """Flush queued rows and stop the writer thread (call on shutdown)"""
+        self._stop.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.logger.warning(f"Query log writer did not drain within {timeout}s; "
+                                f"{self._queue.qsize()} rows lost")
+
+    def flush(self, timeout=10.0):
+        """Wait until every queued row has been handed to insert_batch"""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return writer counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'policy': self.policy,
+                'queue_depth': self._queue.qsize(),
+                'max_queue': self._queue.maxsize,
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'batches': self.batches,
+                'dropped': self.dropped,
+                'failed': self.failed
+            }
@@ -0,0 +1,251 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from metrics import BLOCK_PAGES, STAGE_SECONDS
+
+# Upstream signals that mean the portal wants us to slow down
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class _MemoryStateStore:
+    """Bucket state shared by the threads of one process"""
+
+    # Updates only take a short in-process lock, so they are safe on an event loop
+    blocking = False
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def update(self, host, fn):
+        with self._lock:
+            state = self._states.setdefault(host, {})
+            return fn(state)
+
+    def snapshot(self):
+        with self._lock:
+            return {host: dict(state) for host, state in self._states.items()}
+
+
+class _SqliteStateStore:
+    """Bucket state shared by every worker on the host through a local SQLite file"""
+
+    # Updates can wait up to the busy timeout for another worker's write lock
+    blocking = True
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS rate_limits (host TEXT PRIMARY KEY, state TEXT NOT NULL)'
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def update(self, host, fn):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT state FROM rate_limits WHERE host = ?', (host,)).fetchone()
+            state = json.loads(row[0]) if row else {}
+            result = fn(state)
+            connection.execute(
+                'INSERT OR REPLACE INTO rate_limits (host, state) VALUES (?, ?)',
+                (host, json.dumps(state))
+            )
+            connection.execute('COMMIT')
+            return result
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def snapshot(self):
+        rows = self._connection().execute('SELECT host, state FROM rate_limits').fetchall()
+        return {host: json.loads(state) for host, state in rows}
+
+
+class HostRateLimiter:
+    """Token-bucket rate limiter scoped per upstream host.
+
+    Each host gets rate requests per second with a burst of up to burst
+    requests. Throttling signals (429/503, block pages, connection
+    failures) halve the host's rate down to min_rate and pause it with an
+    exponential backoff; successful responses restore the rate gradually.
+    A negative token balance is the backlog of already reserved slots.
+    With store_path set, bucket state lives in a SQLite file so every
+    gunicorn worker on the machine shares the same budget. With breakers
+    (breaker.HostBreakers) set, requests to a host whose circuit is open
+    are refused before a slot is reserved, and every reported outcome also
+    feeds the host's breaker. The *_async methods move SQLite store updates
+    off the event loop, so a worker holding the file lock cannot stall the
+    async engine.
+    """
+
+    def __init__(self, rate=0.5, burst=2, min_rate=0.05, host_rates=None,
+                 backoff_base=5.0, backoff_max=300.0, store_path=None, breakers=None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.host_rates = host_rates or {}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.store = _SqliteStateStore(store_path) if store_path else _MemoryStateStore()
+        self.breakers = breakers
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._waiting = {}
+        self._counters = {}
+
+    @staticmethod
+    def host_for(url):
+        """Return the host a URL's requests are budgeted against"""
+        return urlparse(url).hostname or url
+
+    def base_rate(self, host):
+        return self.host_rates.get(host, self.rate)
+
+    def _refill(self, state, host, now):
+        base = self.base_rate(host)
+        state.setdefault('rate', base)
+        state.setdefault('tokens', float(self.burst))
+        state.setdefault('updated', now)
+        state.setdefault('throttles', 0)
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(float(self.burst), state['tokens'] + elapsed * state['rate'])
+        state['updated'] = now
+
+    def reserve(self, host):
+        """Claim the next request slot for host and return how long to wait for it"""
+        def take(state):
+            now = time.time()
+            self._refill(state, host, now)
+            state['tokens'] -= 1
+            return -state['tokens'] / state['rate'] if state['tokens'] < 0 else 0.0
+        return self.store.update(host, take)
+
+    def acquire(self, host):
+        """Block until a request to host is allowed; returns the seconds waited"""
+        if self.breakers is not None:
+            self.breakers.before_request(host)
+        wait = self.reserve(host)
+        self._record(host, wait)
+        if wait > 0:
+            self._track_waiting(host, 1)
+            try:
+                time.sleep(wait)
+            finally:
+                self._track_waiting(host, -1)
+        return wait
+
+    async def acquire_async(self, host):
+        """Event-loop friendly acquire for the async scraper engine"""
+        if self.breakers is not None:
+            self.breakers.before_request(host)
+        wait = await self.call_async(self.reserve, host)
+        self._record(host, wait)
+        if wait > 0:
+            self._track_waiting(host, 1)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._track_waiting(host, -1)
+        return wait
+
+    async def call_async(self, fn, *args):
+        """Run fn(*args) in the default executor when it may block on the state store"""
+        if not self.store.blocking:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def report_async(self, host, status_code=None, blocked=False, error=False, retry_after=None):
+        """Event-loop friendly report for the async scraper engine"""
+        return await self.call_async(self.report, host, status_code, blocked, error, retry_after)
+
+    def report(self, host, status_code=None, blocked=False, error=False, retry_after=None):
+        """Feed a response outcome back so the host's rate adapts"""
+        throttled = blocked or error or status_code in THROTTLE_STATUS_CODES
+        if self.breakers is not None:
+            self.breakers.record(host, status_code, blocked, error)
+        if status_code is not None and not throttled:
+            # Other server errors only matter to the circuit breakers
+            return 0.0
+
+        def adapt(state):
+            now = time.time()
+            self._refill(state, host, now)
+            base = self.base_rate(host)
+            if throttled:
+                state['throttles'] += 1
+                state['rate'] = max(self.min_rate, state['rate'] / 2)
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** (state['throttles'] - 1))
+                if retry_after:
+                    backoff = max(backoff, retry_after)
+                # Pause the host by putting its bucket into debt, so queued
+                # callers resume one by one at the reduced rate afterwards
+                state['tokens'] = min(state['tokens'], 0.0) - backoff * state['rate']
+                return backoff
+            state['throttles'] = 0
+            state['rate'] = min(base, state['rate'] + base * 0.1)
+            return 0.0
+
+        backoff = self.store.update(host, adapt)
+        if blocked:
+            BLOCK_PAGES.inc(host=host)
+        if throttled:
+            with self._lock:
+                counters = self._counters.setdefault(host, self._new_counters())
+                counters['throttle_events'] += 1
+            self.logger.warning(f"[RateLimit] Throttling signal from {host}; pausing {backoff:.1f}s")
+        return backoff
+
+    def queue_depth(self, host):
+        """Number of callers in this process currently waiting on host"""
+        with self._lock:
+            return self._waiting.get(host, 0)
+
+    def _new_counters(self):
+        return {'acquired': 0, 'delayed': 0, 'wait_seconds': 0.0, 'throttle_events': 0}
+
+    def _record(self, host, wait):
+        with self._lock:
+            counters = self._counters.setdefault(host, self._new_counters())
+            counters['acquired'] += 1
+            if wait > 0:
+                counters['delayed'] += 1
+                counters['wait_seconds'] += wait
+        STAGE_SECONDS.observe(wait, stage='rate_limit_wait')
+
+    def _track_waiting(self, host, delta):
+        with self._lock:
+            self._waiting[host] = self._waiting.get(host, 0) + delta
+
+    def stats(self):
+        """Return per-host rate, queue depth and wait counters"""
+        states = self.store.snapshot()
+        with self._lock:
+            hosts = set(states) | set(self._counters)
+            result = {}
+            for host in sorted(hosts):
+                state = states.get(host, {})
+                counters = self._counters.get(host, self._new_counters())
+                result[host] = {
+                    'base_rate': self.base_rate(host),
+                    'current_rate': round(state.get('rate', self.base_rate(host)), 4),
+                    'backlog_seconds': round(max(0.0, -state.get('tokens', 0.0) / state['rate']), 2) if state else 0.0,
+                    'queue_depth': self._waiting.get(host, 0),
+                    'acquired': counters['acquired'],
+                    'delayed': counters['delayed'],
+                    'wait_seconds': round(counters['wait_seconds'], 2),
+                    'throttle_events': counters['throttle_events']
+                }
+            return result
@@ -0,0 +1,207 @@
+"""Retention and compaction for the case_queries audit log.
+
+Run periodically (e.g. daily from cron):
+
+    python retention.py --retain-months 6 --archive-dir /var/backups/case_queries --compact-days 7
+
+On PostgreSQL case_queries is partitioned by month (database/init.sql):
+future partitions are created ahead of time and whole months older than
+the retention window are archived to gzipped CSV (optional) and dropped.
+Rows that fell into the default partition while a month was missing are
+moved into the month's partition when it is created, and those older
+than the window are archived and deleted from the default partition.
+Other databases fall back to batched DELETEs. Compaction moves raw_response
+text of older rows into the zlib-compressed case_query_raw table so the
+hot table only carries small rows.
+"""
+import argparse
+import gzip
+import logging
+import os
+import re
+import zlib
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, insert, select, text, update
+
+from models import db, CaseQuery, CaseQueryRaw
+
+PARTITION_PATTERN = re.compile(r'^case_queries_p(\d{4})(\d{2})$')
+DEFAULT_PARTITION = 'case_queries_default'
+
+logger = logging.getLogger(__name__)
+
+
+def _is_postgresql():
+    return db.engine.dialect.name == 'postgresql'
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_partitions(months_ahead=2):
+    """Create monthly case_queries partitions up to months_ahead in the future"""
+    if not _is_postgresql():
+        return []
+    this_month = date.today().replace(day=1)
+    created = [
+        db.session.execute(text('SELECT create_case_queries_partition(:month)'),
+                           {'month': _add_months(this_month, offset)}).scalar()
+        for offset in range(months_ahead + 1)
+    ]
+    db.session.commit()
+    return created
+
+
+def list_partitions():
+    """Return [(partition_name, month_start)] for the monthly case_queries partitions"""
+    names = db.session.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = 'case_queries'"
+    )).scalars()
+    partitions = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def archive_partition(name, archive_dir, before=None, archive_name=None):
+    """Copy a partition (only rows older than before, if given) to
+    <archive_dir>/<archive_name or name>.csv.gz and return the file path"""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f'{archive_name or name}.csv.gz')
+    source = f'"{name}"'
+    if before is not None:
+        source = f"""(SELECT * FROM "{name}" WHERE query_timestamp < '{before.isoformat()}')"""
+    cursor = db.session.connection().connection.cursor()
+    try:
+        with gzip.open(path, 'wt', encoding='utf-8') as archive:
+            cursor.copy_expert(f'COPY {source} TO STDOUT WITH (FORMAT csv, HEADER)', archive)
+    finally:
+        cursor.close()
+    return path
+
+
+def apply_retention(retain_months, archive_dir=None, batch_size=5000):
+    """Drop (optionally archiving first) query log data older than retain_months.
+
+    Counters and hourly rollups are left alone, so /api/stats keeps
+    reporting lifetime totals after old rows are gone.
+    """
+    cutoff = _add_months(date.today().replace(day=1), -retain_months)
+    removed = []
+    default_rows = 0
+    if _is_postgresql():
+        for name, month in list_partitions():
+            if _add_months(month, 1) > cutoff:
+                continue
+            if archive_dir:
+                archive_partition(name, archive_dir)
+            db.session.execute(text(f'ALTER TABLE case_queries DETACH PARTITION "{name}"'))
+            db.session.execute(text(f'DROP TABLE "{name}"'))
+            removed.append(name)
+        # Rows that landed in the default partition while their month was missing
+        if archive_dir:
+            archive_partition(DEFAULT_PARTITION, archive_dir, before=cutoff,
+                              archive_name=f'{DEFAULT_PARTITION}_before_{cutoff:%Y%m}')
+        default_rows = db.session.execute(
+            text(f'DELETE FROM {DEFAULT_PARTITION} WHERE query_timestamp < :cutoff'), {'cutoff': cutoff}
+        ).rowcount
+    else:
+        cutoff_time = datetime.combine(cutoff, datetime.min.time())
+        while True:
+            ids = db.session.execute(
+                select(CaseQuery.id).where(CaseQuery.query_timestamp < cutoff_time).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            db.session.execute(delete(CaseQuery).where(CaseQuery.id.in_(ids)))
+            db.session.commit()
+            removed.extend(ids)
+    db.session.execute(delete(CaseQueryRaw).where(
+        CaseQueryRaw.query_timestamp < datetime.combine(cutoff, datetime.min.time())
+    ))
+    db.session.commit()
+    return {'cutoff': cutoff.isoformat(), 'removed': len(removed), 'default_rows_removed': default_rows}
+
+
+def compact_raw_responses(older_than_days=7, batch_size=1000):
+    """Move raw_response of rows older than older_than_days into case_query_raw"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    compacted = 0
+    raw_bytes = 0
+    stored_bytes = 0
+    while True:
+        rows = db.session.execute(
+            select(CaseQuery.id, CaseQuery.query_timestamp, CaseQuery.raw_response)
+            .where(CaseQuery.query_timestamp < cutoff, CaseQuery.raw_response.isnot(None))
+            .order_by(CaseQuery.query_timestamp)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        blobs = []
+        for query_id, query_timestamp, raw_response in rows:
+            encoded = raw_response.encode('utf-8')
+            blob = zlib.compress(encoded, 6)
+            raw_bytes += len(encoded)
+            stored_bytes += len(blob)
+            blobs.append({'query_id': query_id, 'query_timestamp': query_timestamp, 'raw_response_gz': blob})
+        db.session.execute(insert(CaseQueryRaw), blobs)
+        db.session.execute(
+            update(CaseQuery).where(CaseQuery.id.in_([row[0] for row in rows])).values(raw_response=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        compacted += len(rows)
+    return {'compacted': compacted, 'raw_bytes': raw_bytes, 'stored_bytes': stored_bytes}
+
+
+def get_raw_response(query_id):
+    """Return a query's raw_response whether it is still inline or compacted"""
+    raw_response = db.session.execute(
+        select(CaseQuery.raw_response).where(CaseQuery.id == query_id)
+    ).scalar()
+    if raw_response is not None:
+        return raw_response
+    blob = db.session.get(CaseQueryRaw, query_id)
+    return zlib.decompress(blob.raw_response_gz).decode('utf-8') if blob else None
+
+
+def main():
+    from flask import Flask
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Partition maintenance, retention and compaction for case_queries')
+    parser.add_argument('--retain-months', type=int, default=int(os.getenv('QUERY_LOG_RETENTION_MONTHS', 6)))
+    parser.add_argument('--archive-dir', default=os.getenv('QUERY_LOG_ARCHIVE_DIR'))
+    parser.add_argument('--compact-days', type=int, default=int(os.getenv('RAW_RESPONSE_COMPACT_DAYS', 7)),
+                        help='move raw_response of rows older than this into case_query_raw (0 disables)')
+    parser.add_argument('--months-ahead', type=int, default=2)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'postgresql://localhost/court_data_db')
+    db.init_app(app)
+    with app.app_context():
+        try:
+            logger.info(f"Partitions ensured: {ensure_partitions(args.months_ahead)}")
+        except Exception as e:
+            # Retention and compaction do not depend on future partitions existing
+            db.session.rollback()
+            logger.error(f"Could not create case_queries partitions: {str(e)}")
+        logger.info(f"Retention: {apply_retention(args.retain_months, args.archive_dir)}")
+        if args.compact_days > 0:
+            logger.info(f"Compaction: {compact_raw_responses(args.compact_days)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import logging
+import threading
+from datetime import datetime, timezone
+
+from jobs import JobQueueFull
+
+
+def case_age(result, now=None):
+    """Seconds since a stored case result was last refreshed, or None if it carries no timestamp"""
+    last_updated = result.get('last_updated')
+    if not last_updated:
+        return None
+    try:
+        # PostgreSQL TIMESTAMPTZ columns give aware values, SQLite naive UTC ones
+        updated = _as_utc(datetime.fromisoformat(last_updated))
+        return max(0, round((_as_utc(now or datetime.now(timezone.utc)) - updated).total_seconds()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class Revalidator:
+    """Stale-while-revalidate policy for stored cases.
+
+    A stored case stays fresh for the seconds configured for the first
+    status keyword found in its status (status_fresh, e.g. {"disposed": ...})
+    or fresh_seconds otherwise. schedule() queues a re-scrape of a stale
+    case on the search job pool, at most one per case at a time; when the
+    pool is full the revalidation is dropped and the next request for the
+    case tries again.
+    """
+
+    def __init__(self, jobs, revalidate, fresh_seconds=3600, status_fresh=None):
+        self.jobs = jobs
+        self.revalidate = revalidate
+        self.fresh_seconds = fresh_seconds
+        self.status_fresh = {status.lower(): seconds for status, seconds in (status_fresh or {}).items()}
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self.scheduled = 0
+        self.dropped = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def fresh_for(self, case_details):
+        """Seconds a stored copy of the case is served without revalidating"""
+        status = (case_details.get('status') or '').lower()
+        for keyword, seconds in self.status_fresh.items():
+            if keyword in status:
+                return seconds
+        return self.fresh_seconds
+
+    def is_stale(self, case_details, age):
+        return age is not None and age > self.fresh_for(case_details)
+
+    def schedule(self, key, *args, params=None):
+        """Queue revalidate(*args) unless key is already pending; returns False if dropped"""
+        with self._lock:
+            if key in self._pending:
+                return True
+            self._pending.add(key)
+        try:
+            self.jobs.submit(self._run, key, args, params=params)
+        except JobQueueFull:
+            with self._lock:
+                self._pending.discard(key)
+                self.dropped += 1
+            self.logger.warning(f"Dropped revalidation of {key}: job queue is full")
+            return False
+        self._count('scheduled')
+        return True
+
+    def _run(self, key, args):
+        try:
+            result = self.revalidate(*args)
+            self._count('succeeded')
+            return result
+        except Exception:
+            self._count('failed')
+            raise
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Return revalidation counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'fresh_seconds': self.fresh_seconds,
+                'status_fresh_seconds': dict(self.status_fresh),
+                'pending': len(self._pending),
+                'scheduled': self.scheduled,
+                'dropped': self.dropped,
+                'succeeded': self.succeeded,
+                'failed': self.failed
+            }
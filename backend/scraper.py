@@ -1,18 +1,261 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+import hashlib
 from datetime import datetime, date
+from functools import lru_cache
 import time
 import logging
 from urllib.parse import urljoin, urlparse
 import json
+import os
+
+from breaker import CircuitOpen
+from ratelimit import HostRateLimiter, THROTTLE_STATUS_CODES
+from sessions import SessionPool
+from documents import DocumentTooLarge, iter_bounded
+from metrics import SCRAPER_RETRIES, STAGE_SECONDS, UPSTREAM_RESPONSES
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Overridable so load tests can point the scrapers at benchmarks/mock_portal.py
+DEFAULT_PORTAL_URL = 'https://delhihighcourt.nic.in'
+
+
+def portal_url():
+    """Base URL of the court portal, from PORTAL_BASE_URL when set"""
+    return os.getenv('PORTAL_BASE_URL', DEFAULT_PORTAL_URL).rstrip('/')
+
+
+# Keyword tables are matched with str.__contains__ on text lowercased once: for a
+# handful of literals CPython's substring search beats a combined regex alternation
+# (see benchmarks/bench_matchers.py)
+BLOCK_INDICATORS = (
+    'captcha', 'verify you are human', 'access denied', 'blocked', 'unusual traffic',
+    'please enable cookies', 'security check', 'robot', 'forbidden', 'not allowed'
+)
+NO_RESULT_INDICATORS = (
+    'no records found', 'case not found', 'no matching records', 'invalid case number', 'case does not exist'
+)
+ORDER_ROW_KEYWORDS = ('order', 'judgment', 'disposed', 'hearing')
+
+PDF_HREF_PATTERN = re.compile(r'\.pdf', re.IGNORECASE)
+PARTIES_PATTERN = re.compile(r'([^v]+)\s+v[s]?\.\s+([^v]+)', re.IGNORECASE)
+
+# Date patterns searched in free text, in priority order
+DATE_TEXT_PATTERNS = (
+    re.compile(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b'),  # DD/MM/YYYY or DD-MM-YYYY
+    re.compile(r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b'),  # YYYY/MM/DD or YYYY-MM-DD
+    re.compile(r'\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})\b', re.IGNORECASE)
+)
+# Whole-string shapes parsed without strptime; anything else takes the DATE_FORMATS loop
+DAY_FIRST_DATE = re.compile(r'([0-9]{1,2})([/.-])([0-9]{1,2})\2([0-9]{4})')
+YEAR_FIRST_DATE = re.compile(r'([0-9]{4})([/.-])([0-9]{1,2})\2([0-9]{1,2})')
+DAY_MONTH_NAME_DATE = re.compile(r'([0-9]{1,2})\s+([A-Za-z]+)\s+([0-9]{4})')
+MONTH_NAME_DAY_DATE = re.compile(r'([A-Za-z]+)\s+([0-9]{1,2}),\s+([0-9]{4})')
+YEAR_PATTERN = re.compile(r'\b(20\d{2})\b')
+DATE_FORMATS = (
+    "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
+    "%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d",
+    "%d %b %Y", "%d %B %Y",
+    "%b %d, %Y", "%B %d, %Y"
+)
+MONTHS = {
+    name.lower(): index
+    for index, names in enumerate(zip(
+        ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'),
+        ('January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September',
+         'October', 'November', 'December')
+    ), 1)
+    for name in names
+}
+
+
+def contains_any(text, keywords):
+    """Check lowercased text for any of the (lowercase) keywords"""
+    return any(keyword in text for keyword in keywords)
+
+
+# Stored case_details/orders_judgments columns that scrapers never return
+CASE_RESULT_KEYS = ('case_id', 'case_type', 'case_number', 'filing_year', 'court_name')
+ORDER_RESULT_KEYS = ('order_date', 'order_type', 'description', 'pdf_url')
+
+
+def stored_orders(orders_judgments):
+    """Stored order rows in the shape the scrapers return them"""
+    return [{key: order.get(key) for key in ORDER_RESULT_KEYS} for order in orders_judgments]
+
+
+def _fast_date(date_str):
+    """Build a date for the common numeric and month-name shapes, or None"""
+    match = DAY_FIRST_DATE.fullmatch(date_str)
+    if match:
+        return date(int(match.group(4)), int(match.group(3)), int(match.group(1)))
+    match = YEAR_FIRST_DATE.fullmatch(date_str)
+    if match:
+        return date(int(match.group(1)), int(match.group(3)), int(match.group(4)))
+    match = DAY_MONTH_NAME_DATE.fullmatch(date_str)
+    if match and match.group(2).lower() in MONTHS:
+        return date(int(match.group(3)), MONTHS[match.group(2).lower()], int(match.group(1)))
+    match = MONTH_NAME_DAY_DATE.fullmatch(date_str)
+    if match and match.group(1).lower() in MONTHS:
+        return date(int(match.group(3)), MONTHS[match.group(1).lower()], int(match.group(2)))
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str):
+    """Parse a portal date string into a date, falling back to January 1st of a 20xx year in it"""
+    if not date_str or date_str.strip() == "":
+        return None
+    date_str = date_str.strip()
+    try:
+        parsed = _fast_date(date_str)
+        if parsed is not None:
+            return parsed
+    except ValueError:
+        # Out-of-range day or month; strptime rejects these too
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    # If no format matches, try to extract year at least
+    year_match = YEAR_PATTERN.search(date_str)
+    if year_match:
+        try:
+            return date(int(year_match.group(1)), 1, 1)
+        except ValueError:
+            pass
+    return None
+
+
+def open_document(session, rate_limiter, url, max_bytes=None, timeout=30):
+    """Start a streaming download, rejecting documents declared larger than max_bytes"""
+    response = paced_request(session, rate_limiter, 'GET', url, timeout=timeout, stream=True)
+    response.raise_for_status()
+    declared = response.headers.get('Content-Length', '')
+    if max_bytes and declared.isdigit() and int(declared) > max_bytes:
+        response.close()
+        raise DocumentTooLarge(f"Document exceeds the {max_bytes} byte limit")
+    return response
+
+
+def make_soup(content):
+    """Build a BeautifulSoup tree with the fastest available parser"""
+    return BeautifulSoup(content, HTML_PARSER)
+
+
+def record_response(portal, case_type, case_number, filing_year, body, extension):
+    """Save a raw portal response under SCRAPER_RECORD_DIR, if set, for the fixture corpus"""
+    record_dir = os.getenv('SCRAPER_RECORD_DIR')
+    if not record_dir:
+        return None
+    os.makedirs(record_dir, exist_ok=True)
+    name = re.sub(r'[^A-Za-z0-9]+', '_', f"{portal}_{case_type}_{case_number}_{filing_year}").strip('_')
+    path = os.path.join(record_dir, f"{name}.{extension}")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(body)
+    return path
+
+
+# ASP.NET re-issues these hidden fields on every response, so they are left out of content hashes
+VOLATILE_FIELDS_PATTERN = re.compile(r'(name="__(?:VIEWSTATE|VIEWSTATEGENERATOR|EVENTVALIDATION)"[^>]*?value=")[^"]*')
+
+
+def content_hash(body):
+    """sha256 of a response body with volatile form fields and whitespace normalized"""
+    normalized = ' '.join(VOLATILE_FIELDS_PATTERN.sub(r'\1', body).split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def conditional_headers(fingerprint):
+    """If-None-Match/If-Modified-Since headers from a stored fingerprint"""
+    headers = {}
+    if fingerprint and fingerprint.get('etag'):
+        headers['If-None-Match'] = fingerprint['etag']
+    if fingerprint and fingerprint.get('last_modified'):
+        headers['If-Modified-Since'] = fingerprint['last_modified']
+    return headers
+
+
+def response_fingerprint(response, stored=None):
+    """Content hash and ETag/Last-Modified validators of a portal response.
+
+    A 304 carries no body, so it keeps the stored hash and any validators
+    the portal did not resend.
+    """
+    stored = stored or {}
+    if response.status_code == 304:
+        return {
+            'content_hash': stored.get('content_hash'),
+            'etag': response.headers.get('ETag') or stored.get('etag'),
+            'last_modified': response.headers.get('Last-Modified') or stored.get('last_modified')
+        }
+    return {
+        'content_hash': content_hash(response.text),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified')
+    }
+
+
+def unchanged_result(fingerprint, raw_html=None):
+    """search_case result for a response matching the stored case; the caller loads the stored copy"""
+    return {
+        'content': 'unchanged',
+        'fingerprint': fingerprint,
+        'case_details': None,
+        'orders_judgments': None,
+        'raw_html': raw_html,
+        'query_timestamp': datetime.now().isoformat()
+    }
+
+
+def is_blocked_text(text):
+    """Detect block/captcha wording in page text"""
+    return contains_any(text.lower(), BLOCK_INDICATORS)
+
+
+def paced_request(session, rate_limiter, method, url, **kwargs):
+    """Send a request once the host's rate limiter allows it.
+
+    Throttling responses (429/503) and connection failures are reported to
+    the limiter so the host's rate backs off, and other 5xx responses so
+    its circuit breaker sees them; successful outcomes are reported by the
+    caller once the body has been validated.
+    """
+    host = rate_limiter.host_for(url)
+    rate_limiter.acquire(host)
+    started = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+    except (requests.ConnectionError, requests.Timeout):
+        UPSTREAM_RESPONSES.inc(host=host, method=method, status='error')
+        rate_limiter.report(host, error=True)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage=f'upstream_{method.lower()}')
+    UPSTREAM_RESPONSES.inc(host=host, method=method, status=response.status_code)
+    if response.status_code in THROTTLE_STATUS_CODES or response.status_code >= 500:
+        retry_after = response.headers.get('Retry-After', '')
+        rate_limiter.report(
+            host,
+            status_code=response.status_code,
+            retry_after=int(retry_after) if retry_after.isdigit() else None
+        )
+    return response
+
 
 class DelhiHighCourtScraper:
-    def __init__(self):
+    def __init__(self, rate_limiter=None, pool_size=4, token_ttl=600, base_url=None):
         import random
-        self.base_url = "https://delhihighcourt.nic.in"
+        self.base_url = (base_url or portal_url()).rstrip('/')
         self.search_url = f"{self.base_url}/case_status.asp"
-        self.session = requests.Session()
         self.user_agents = [
             # List of common user agents
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -30,6 +273,10 @@ class DelhiHighCourtScraper:
         }
         self.logger = logging.getLogger(__name__)
         self.random = random
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.host = HostRateLimiter.host_for(self.base_url)
+        # Warm sessions carry cookies and the search form's viewstate between searches
+        self.session_pool = SessionPool(self._warm_session, self.user_agents, size=pool_size, token_ttl=token_ttl)
 
     def get_case_types(self):
         """Get available case types from the court website"""
@@ -40,34 +287,22 @@ class DelhiHighCourtScraper:
         ]
         return case_types
 
-    def search_case(self, case_type, case_number, filing_year, max_retries=3):
+    def search_case(self, case_type, case_number, filing_year, max_retries=3, fingerprint=None):
         """
         Search for a case on Delhi High Court website, with anti-bot evasion.
+
+        With the stored case's fingerprint, an unchanged page is returned as
+        unchanged_result without being parsed.
         """
-        import time
         self.logger.info(f"Starting search for {case_type}/{case_number}/{filing_year}")
         last_exception = None
         for attempt in range(1, max_retries + 1):
+            portal_session = None
             try:
-                # Rotate user-agent
-                user_agent = self.random.choice(self.user_agents)
-                headers = self.default_headers.copy()
-                headers['User-Agent'] = user_agent
-                self.session.headers.update(headers)
-                # Random delay to mimic human
-                delay = self.random.uniform(1.5, 4.0)
-                self.logger.info(f"[AntiBot] Sleeping for {delay:.2f}s before request (attempt {attempt})")
-                time.sleep(delay)
-                # Get the search page
-                search_page = self.session.get(self.search_url, timeout=30)
-                search_page.raise_for_status()
-                soup = BeautifulSoup(search_page.content, 'html.parser')
-                # Detect block/captcha page
-                if self._is_blocked_page(soup):
-                    self.logger.warning("Blocked or captcha page detected on GET. Retrying...")
-                    raise Exception("Blocked or captcha page detected.")
-                # Extract viewstate and other hidden fields if present
-                viewstate = self._extract_viewstate(soup)
+                # Reuse a warm session and the viewstate from its last search page
+                portal_session = self.session_pool.checkout()
+                if portal_session.warmed_at is None:
+                    raise Exception("Could not load the case status search page.")
                 # Prepare search parameters
                 search_params = {
                     'case_type': case_type,
@@ -75,26 +310,38 @@ class DelhiHighCourtScraper:
                     'case_year': str(filing_year),
                     'submit': 'Submit'
                 }
-                if viewstate:
-                    search_params.update(viewstate)
-                # Random delay before POST
-                delay = self.random.uniform(1.0, 3.0)
-                self.logger.info(f"[AntiBot] Sleeping for {delay:.2f}s before POST request (attempt {attempt})")
-                time.sleep(delay)
+                search_params.update(portal_session.tokens)
                 # Perform the search
-                response = self.session.post(
+                response = paced_request(
+                    portal_session.session,
+                    self.rate_limiter,
+                    'POST',
                     self.search_url,
                     data=search_params,
+                    headers=conditional_headers(fingerprint),
                     timeout=30,
                     allow_redirects=True
                 )
                 response.raise_for_status()
-                soup_post = BeautifulSoup(response.content, 'html.parser')
+                if response.status_code == 304:
+                    self.rate_limiter.report(self.host)
+                    return unchanged_result(response_fingerprint(response, fingerprint))
+                record_response('delhi', case_type, case_number, filing_year, response.text, 'html')
+                parse_started = time.perf_counter()
+                soup_post = make_soup(response.content)
                 if self._is_blocked_page(soup_post):
                     self.logger.warning("Blocked or captcha page detected on POST. Retrying...")
+                    self.rate_limiter.report(self.host, blocked=True)
                     raise Exception("Blocked or captcha page detected.")
+                self.rate_limiter.report(self.host)
+                # ASP.NET hands back a fresh viewstate with every postback
+                self.session_pool.update_tokens(portal_session, self._extract_viewstate(soup_post))
+                current = response_fingerprint(response)
+                if fingerprint and current['content_hash'] == fingerprint.get('content_hash'):
+                    return unchanged_result(current, response.text[:5000])
                 # Parse the response
-                result = self._parse_case_details(response.text, case_type, case_number, filing_year)
+                result = self._parse_case_details(response.text, case_type, case_number, filing_year, soup=soup_post)
+                STAGE_SECONDS.observe(time.perf_counter() - parse_started, stage='parse')
                 # Ensure all dates are stringified for JSON compatibility
                 if 'case_details' in result:
                     for k in ['filing_date', 'next_hearing_date']:
@@ -107,15 +354,18 @@ class DelhiHighCourtScraper:
                 self.logger.info(f"Search completed for {case_type}/{case_number}/{filing_year}")
                 # Add query timestamp for frontend history display
                 result['query_timestamp'] = datetime.now().isoformat()
+                result.update(content='changed', fingerprint=current)
                 return result
+            except CircuitOpen:
+                # The portal is known to be down; further attempts would fail the same way
+                raise
             except Exception as e:
                 last_exception = e
                 self.logger.error(f"Attempt {attempt} failed: {str(e)}")
-                # Exponential backoff
                 if attempt < max_retries:
-                    backoff = self.random.uniform(2, 5) * attempt
-                    self.logger.info(f"[AntiBot] Backing off for {backoff:.2f}s before retry...")
-                    time.sleep(backoff)
+                    SCRAPER_RETRIES.inc(scraper=type(self).__name__)
+                if portal_session is not None:
+                    self.session_pool.invalidate(portal_session)
         # If all attempts fail
         if isinstance(last_exception, requests.RequestException):
             self.logger.error(f"Network error during case search: {str(last_exception)}")
@@ -124,14 +374,23 @@ class DelhiHighCourtScraper:
             self.logger.error(f"Error searching case: {str(last_exception)}")
             raise Exception("Failed to fetch or parse case details. The court website may have changed, is unavailable, or anti-bot measures are blocking access.")
 
+    def _warm_session(self, portal_session):
+        """Load the search page to collect cookies and the form's hidden fields"""
+        portal_session.session.headers.update(self.default_headers)
+        search_page = paced_request(portal_session.session, self.rate_limiter, 'GET', self.search_url, timeout=30)
+        search_page.raise_for_status()
+        soup = make_soup(search_page.content)
+        # Detect block/captcha page
+        if self._is_blocked_page(soup):
+            self.logger.warning("Blocked or captcha page detected on GET.")
+            self.rate_limiter.report(self.host, blocked=True)
+            raise Exception("Blocked or captcha page detected.")
+        # Extract viewstate and other hidden fields if present
+        return self._extract_viewstate(soup)
+
     def _is_blocked_page(self, soup):
         """Detect if the page is a block/captcha page"""
-        block_indicators = [
-            'captcha', 'verify you are human', 'access denied', 'blocked', 'unusual traffic',
-            'please enable cookies', 'security check', 'robot', 'forbidden', 'not allowed'
-        ]
-        text = soup.get_text().lower()
-        return any(indicator in text for indicator in block_indicators)
+        return is_blocked_text(soup.get_text())
 
     def _extract_viewstate(self, soup):
         """Extract ASP.NET viewstate and other hidden fields"""
@@ -147,9 +406,10 @@ class DelhiHighCourtScraper:
         
         return viewstate_data
 
-    def _parse_case_details(self, html_content, case_type, case_number, filing_year):
-        """Parse case details from the HTML response"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def _parse_case_details(self, html_content, case_type, case_number, filing_year, soup=None):
+        """Parse case details from the HTML response, reusing soup if already built"""
+        if soup is None:
+            soup = make_soup(html_content)
         # Check for "No records found" or similar messages
         if self._is_no_results(soup, html_content):
             self.logger.warning("No results found for the given case details.")
@@ -162,13 +422,13 @@ class DelhiHighCourtScraper:
                 'filing_year': filing_year,
                 'court_name': 'Delhi High Court'
             }
-            # Extract case information using multiple strategies
-            case_data.update(self._extract_parties(soup))
-            case_data.update(self._extract_dates(soup))
-            case_data.update(self._extract_status_info(soup))
-            case_data.update(self._extract_judge_info(soup))
+            # Extract case information from label/value rows in one pass
+            fields, order_rows = self._extract_table_fields(soup)
+            if not fields.get('petitioner'):
+                fields.update(self._extract_parties_from_text(soup))
+            case_data.update(fields)
             # Extract orders and judgments
-            orders = self._extract_orders_judgments(soup)
+            orders = self._extract_orders_judgments(soup, order_rows)
             # Stringify any date objects for JSON compatibility
             for k in ['filing_date', 'next_hearing_date']:
                 if k in case_data and isinstance(case_data[k], (datetime, date)):
@@ -200,115 +460,66 @@ class DelhiHighCourtScraper:
 
     def _is_no_results(self, soup, html_content):
         """Check if the response indicates no results found"""
-        no_result_indicators = [
-            "no records found",
-            "case not found",
-            "no matching records",
-            "invalid case number",
-            "case does not exist"
-        ]
-        
-        content_lower = html_content.lower()
-        return any(indicator in content_lower for indicator in no_result_indicators)
-
-    def _extract_parties(self, soup):
-        """Extract petitioner and respondent information"""
-        parties_data = {}
-        
-        # Strategy 1: Look for standard table structure
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    label = cells[0].get_text(strip=True).lower()
-                    value = cells[1].get_text(strip=True)
-                    
-                    if 'petitioner' in label or 'appellant' in label:
-                        parties_data['petitioner'] = value
-                    elif 'respondent' in label:
-                        parties_data['respondent'] = value
-        
-        # Strategy 2: Look for specific patterns in text
-        text_content = soup.get_text()
-        
-        # Pattern for "Petitioner vs Respondent"
-        vs_pattern = r'([^v]+)\s+v[s]?\.\s+([^v]+)'
-        vs_match = re.search(vs_pattern, text_content, re.IGNORECASE)
-        if vs_match and not parties_data.get('petitioner'):
-            parties_data['petitioner'] = vs_match.group(1).strip()
-            parties_data['respondent'] = vs_match.group(2).strip()
-        
-        return parties_data
+        return contains_any(html_content.lower(), NO_RESULT_INDICATORS)
 
-    def _extract_dates(self, soup):
-        """Extract filing date and next hearing date"""
-        dates_data = {}
-        
-        # Look for date patterns in tables
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    label = cells[0].get_text(strip=True).lower()
-                    value = cells[1].get_text(strip=True)
-                    
-                    if 'filing' in label or 'registration' in label:
-                        dates_data['filing_date'] = self._parse_date(value)
-                    elif 'next' in label and 'hearing' in label:
-                        dates_data['next_hearing_date'] = self._parse_date(value)
-                    elif 'hearing' in label and not dates_data.get('next_hearing_date'):
-                        dates_data['next_hearing_date'] = self._parse_date(value)
-        
-        return dates_data
+    def _extract_table_fields(self, soup):
+        """Extract parties, dates, status, stage and judge from label/value rows.
 
-    def _extract_status_info(self, soup):
-        """Extract case status and stage information"""
-        status_data = {}
-        
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    label = cells[0].get_text(strip=True).lower()
-                    value = cells[1].get_text(strip=True)
-                    
-                    if 'status' in label:
-                        status_data['status'] = value
-                    elif 'stage' in label:
-                        status_data['stage'] = value
-        
-        return status_data
+        Walks every table row once and dispatches on the label keywords, so
+        the page is not re-traversed per field group. Rows with three or more
+        cells are kept for _extract_orders_from_tables.
+        """
+        fields = {}
+        order_rows = []
+        for row in soup.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 2:
+                continue
+            if len(cells) >= 3:
+                order_rows.append((row, cells))
+            label = cells[0].get_text(strip=True).lower()
+            value = cells[1].get_text(strip=True)
+            # Parties
+            if 'petitioner' in label or 'appellant' in label:
+                fields['petitioner'] = value
+            elif 'respondent' in label:
+                fields['respondent'] = value
+            # Dates
+            if 'filing' in label or 'registration' in label:
+                fields['filing_date'] = self._parse_date(value)
+            elif 'next' in label and 'hearing' in label:
+                fields['next_hearing_date'] = self._parse_date(value)
+            elif 'hearing' in label and not fields.get('next_hearing_date'):
+                fields['next_hearing_date'] = self._parse_date(value)
+            # Status and stage
+            if 'status' in label:
+                fields['status'] = value
+            elif 'stage' in label:
+                fields['stage'] = value
+            # Judge
+            if 'judge' in label or 'coram' in label:
+                fields['judge_name'] = value
+        return fields, order_rows
 
-    def _extract_judge_info(self, soup):
-        """Extract judge information"""
-        judge_data = {}
-        
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    label = cells[0].get_text(strip=True).lower()
-                    value = cells[1].get_text(strip=True)
-                    
-                    if 'judge' in label or 'coram' in label:
-                        judge_data['judge_name'] = value
+    def _extract_parties_from_text(self, soup):
+        """Fall back to a "Petitioner vs Respondent" pattern in the page text"""
+        text_content = soup.get_text()
         
-        return judge_data
+        # Pattern for "Petitioner vs Respondent"
+        vs_match = PARTIES_PATTERN.search(text_content)
+        if vs_match:
+            return {
+                'petitioner': vs_match.group(1).strip(),
+                'respondent': vs_match.group(2).strip()
+            }
+        return {}
 
-    def _extract_orders_judgments(self, soup):
+    def _extract_orders_judgments(self, soup, order_rows=None):
         """Extract orders and judgments with PDF links"""
         orders = []
         
         # Look for links to PDF files
-        pdf_links = soup.find_all('a', href=re.compile(r'\.pdf', re.IGNORECASE))
+        pdf_links = soup.find_all('a', href=PDF_HREF_PATTERN)
         
         for link in pdf_links:
             href = link.get('href')
@@ -336,29 +547,27 @@ class DelhiHighCourtScraper:
         
         # If no PDF links found, look for order information in tables
         if not orders:
-            orders = self._extract_orders_from_tables(soup)
+            if order_rows is None:
+                order_rows = self._extract_table_fields(soup)[1]
+            orders = self._extract_orders_from_tables(order_rows)
         
         return orders
 
-    def _extract_orders_from_tables(self, soup):
-        """Extract order information from table structures"""
+    def _extract_orders_from_tables(self, order_rows):
+        """Extract order information from table rows with three or more cells"""
         orders = []
         
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 3:  # Assuming date, type, description columns
-                    row_text = row.get_text(strip=True).lower()
-                    if any(keyword in row_text for keyword in ['order', 'judgment', 'disposed', 'hearing']):
-                        order_data = {
-                            'order_date': self._parse_date(cells[0].get_text(strip=True)),
-                            'order_type': 'Order',
-                            'description': ' '.join(cell.get_text(strip=True) for cell in cells[1:]),
-                            'pdf_url': None
-                        }
-                        orders.append(order_data)
+        for row, cells in order_rows:
+            # Assuming date, type, description columns
+            row_text = row.get_text(strip=True).lower()
+            if contains_any(row_text, ORDER_ROW_KEYWORDS):
+                order_data = {
+                    'order_date': self._parse_date(cells[0].get_text(strip=True)),
+                    'order_type': 'Order',
+                    'description': ' '.join(cell.get_text(strip=True) for cell in cells[1:]),
+                    'pdf_url': None
+                }
+                orders.append(order_data)
         
         return orders
 
@@ -378,15 +587,8 @@ class DelhiHighCourtScraper:
         if not text:
             return None
         
-        # Common date patterns
-        date_patterns = [
-            r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b',  # DD/MM/YYYY or DD-MM-YYYY
-            r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b',  # YYYY/MM/DD or YYYY-MM-DD
-            r'\b(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{4})\b'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in DATE_TEXT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return self._parse_date(match.group(0))
         
@@ -394,43 +596,33 @@ class DelhiHighCourtScraper:
 
     def _parse_date(self, date_str):
         """Parse date string into date object"""
-        if not date_str or date_str.strip() == "":
-            return None
-        
-        date_str = date_str.strip()
-        
-        # Common date formats
-        date_formats = [
-            "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y",
-            "%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d",
-            "%d %b %Y", "%d %B %Y",
-            "%b %d, %Y", "%B %d, %Y"
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        
-        # If no format matches, try to extract year at least
-        year_match = re.search(r'\b(20\d{2})\b', date_str)
-        if year_match:
-            try:
-                return date(int(year_match.group(1)), 1, 1)
-            except ValueError:
-                pass
-        
-        return None
+        return parse_date(date_str)
+
+    # Parsed fields, present in a result only when found on the page
+    RESULT_FIELDS = ('petitioner', 'respondent', 'filing_date', 'next_hearing_date', 'status', 'stage', 'judge_name')
+
+    def stored_result(self, case_details, orders_judgments):
+        """A stored case in the shape _parse_case_details returns it"""
+        details = {key: case_details.get(key) for key in CASE_RESULT_KEYS}
+        details.update(
+            (key, case_details[key]) for key in self.RESULT_FIELDS if case_details.get(key) is not None
+        )
+        return {'case_details': details, 'orders_judgments': stored_orders(orders_judgments)}
+
+    def open_pdf(self, pdf_url, max_bytes=None, timeout=30):
+        """Open a streaming download of a PDF through a warm portal session"""
+        portal_session = self.session_pool.checkout()
+        return open_document(portal_session.session, self.rate_limiter, pdf_url, max_bytes, timeout)
 
-    def download_pdf(self, pdf_url, timeout=30):
+    def download_pdf(self, pdf_url, timeout=30, max_bytes=50 * 1024 * 1024):
         """Download PDF document"""
         try:
-            response = self.session.get(pdf_url, timeout=timeout, stream=True)
-            response.raise_for_status()
+            response = self.open_pdf(pdf_url, max_bytes=max_bytes, timeout=timeout)
+            with response:
+                content = b''.join(iter_bounded(response.iter_content(chunk_size=64 * 1024), max_bytes))
             
             return {
-                'content': response.content,
+                'content': content,
                 'content_type': response.headers.get('content-type', 'application/pdf'),
                 'filename': self._extract_filename_from_url(pdf_url)
             }
@@ -454,10 +646,10 @@ class DelhiHighCourtScraper:
 
 # ECourtsScraper for Faridabad District Court (Haryana)
 class ECourtsScraper:
-    def __init__(self):
+    def __init__(self, rate_limiter=None, pool_size=4, token_ttl=600, base_url=None):
+        portal = (base_url or portal_url()).rstrip('/')
         # Delhi High Court case status endpoint
-        self.base_url = "https://delhihighcourt.nic.in/app/get-case-type-status"
-        self.session = requests.Session()
+        self.base_url = f"{portal}/app/get-case-type-status"
         self.logger = logging.getLogger(__name__)
         # User agents for rotation
         self.user_agents = [
@@ -469,90 +661,150 @@ class ECourtsScraper:
         ]
         import random
         self.random = random
+        self.home_url = f"{portal}/"
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.host = HostRateLimiter.host_for(self.base_url)
+        # Sessions keep the homepage cookies, so the cookie GET is not repeated per search
+        self.session_pool = SessionPool(self._warm_session, self.user_agents, size=pool_size, token_ttl=token_ttl)
 
-    def search_case(self, case_type, case_number, filing_year, max_retries=3):
+    def search_case(self, case_type, case_number, filing_year, max_retries=3, fingerprint=None):
         """
         Search for a case on Delhi High Court website using the new endpoint, with anti-bot evasion.
+
+        With the stored case's fingerprint, the request is made conditional and
+        an unchanged response is returned as unchanged_result without parsing.
         """
-        import time
         last_exception = None
         for attempt in range(1, max_retries + 1):
+            portal_session = None
             try:
-                # Rotate user-agent
-                user_agent = self.random.choice(self.user_agents)
-                # Realistic headers
-                headers = {
-                    'User-Agent': user_agent,
-                    'Content-Type': 'application/json',
-                    'Accept': 'application/json, text/javascript, */*; q=0.01',
-                    'Referer': 'https://delhihighcourt.nic.in/',
-                    'Origin': 'https://delhihighcourt.nic.in',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Sec-Fetch-Dest': 'empty',
-                    'Sec-Fetch-Mode': 'cors',
-                    'Sec-Fetch-Site': 'same-origin',
-                }
-                # Random delay to mimic human
-                delay = self.random.uniform(1.5, 4.0)
-                self.logger.info(f"[AntiBot] Sleeping for {delay:.2f}s before request (attempt {attempt})")
-                time.sleep(delay)
-                # Get cookies by visiting the main page first
-                try:
-                    self.session.get('https://delhihighcourt.nic.in/', headers={'User-Agent': user_agent}, timeout=15)
-                except Exception as e:
-                    self.logger.warning(f"Could not fetch main page for cookies: {e}")
+                # Each pooled session has its own user-agent and cookie jar
+                portal_session = self.session_pool.checkout()
+                headers = self._request_headers(portal_session.user_agent)
+                headers.update(conditional_headers(fingerprint))
                 # Prepare POST data
-                data = {
-                    "case_type": case_type,
-                    "case_no": case_number,
-                    "case_year": str(filing_year)
-                }
-                resp = self.session.post(self.base_url, json=data, headers=headers, timeout=30)
+                data = self._search_payload(case_type, case_number, filing_year)
+                resp = paced_request(portal_session.session, self.rate_limiter, 'POST', self.base_url,
+                                     json=data, headers=headers, timeout=30)
                 resp.raise_for_status()
-                # Log the full response to a file for debugging
-                with open('delhihighcourt_response_debug.json', 'w', encoding='utf-8') as f:
-                    f.write(resp.text)
-                # Try to parse as JSON, fallback to raw text
-                try:
-                    result_json = resp.json()
-                    case_details = self._parse_case_details(result_json, case_type, case_number, filing_year)
-                    return {
-                        'case_details': case_details,
-                        'orders_judgments': [],
-                        'raw_html': resp.text[:5000],
-                        'query_timestamp': datetime.now().isoformat()
-                    }
-                except Exception as json_err:
-                    self.logger.error(f"Response not JSON or unexpected format: {json_err}")
-                    # Return raw response for debugging
-                    return {
-                        'case_details': {
-                            'case_id': f"{case_type}/{case_number}/{filing_year}",
-                            'case_type': case_type,
-                            'case_number': case_number,
-                            'filing_year': filing_year,
-                            'court_name': 'Delhi High Court',
-                            'status': 'Response not JSON or unexpected format',
-                            'raw_response': resp.text[:1000]
-                        },
-                        'orders_judgments': [],
-                        'raw_html': resp.text[:5000],
-                        'query_timestamp': datetime.now().isoformat()
-                    }
+                return self._handle_response(resp, case_type, case_number, filing_year, fingerprint)
+            except CircuitOpen:
+                # The portal is known to be down; further attempts would fail the same way
+                raise
             except Exception as e:
                 last_exception = e
                 self.logger.error(f"Attempt {attempt} failed: {str(e)}")
-                # Exponential backoff
                 if attempt < max_retries:
-                    backoff = self.random.uniform(2, 5) * attempt
-                    self.logger.info(f"[AntiBot] Backing off for {backoff:.2f}s before retry...")
-                    time.sleep(backoff)
+                    SCRAPER_RETRIES.inc(scraper=type(self).__name__)
+                if portal_session is not None:
+                    self.session_pool.invalidate(portal_session)
         # If all attempts fail
         self.logger.error(f"Delhi High Court search error: {str(last_exception)}")
         raise Exception("Network error: Unable to connect to Delhi High Court portal or parse data.")
 
+    # Fields _parse_case_details always returns, with '-' when the portal gave none
+    RESULT_FIELDS = ('status', 'petitioner', 'respondent', 'judge_name', 'filing_date', 'next_hearing_date')
+
+    def stored_result(self, case_details, orders_judgments):
+        """A stored case in the shape _parse_case_details returns it"""
+        details = {key: case_details.get(key) for key in CASE_RESULT_KEYS}
+        details.update(
+            (key, '-' if case_details.get(key) is None else case_details[key]) for key in self.RESULT_FIELDS
+        )
+        return {'case_details': details, 'orders_judgments': stored_orders(orders_judgments)}
+
+    def open_pdf(self, pdf_url, max_bytes=None, timeout=30):
+        """Open a streaming download of a PDF through a warm portal session"""
+        portal_session = self.session_pool.checkout()
+        return open_document(portal_session.session, self.rate_limiter, pdf_url, max_bytes, timeout)
+
+    def _warm_session(self, portal_session):
+        """Visit the main page so the session picks up the portal's cookies"""
+        response = paced_request(portal_session.session, self.rate_limiter, 'GET', self.home_url, timeout=15)
+        response.raise_for_status()
+        return {}
+
+    def _check_blocked(self, response_text):
+        """Report and reject HTML block/captcha pages served instead of JSON"""
+        if response_text.lstrip().startswith('<') and is_blocked_text(response_text):
+            self.logger.warning("Blocked or captcha page detected. Retrying...")
+            self.rate_limiter.report(self.host, blocked=True)
+            raise Exception("Blocked or captcha page detected.")
+        self.rate_limiter.report(self.host)
+
+    def _request_headers(self, user_agent):
+        """Realistic browser headers for the case status endpoint"""
+        return {
+            'User-Agent': user_agent,
+            'Content-Type': 'application/json',
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+            'Referer': self.home_url,
+            'Origin': self.home_url.rstrip('/'),
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Sec-Fetch-Dest': 'empty',
+            'Sec-Fetch-Mode': 'cors',
+            'Sec-Fetch-Site': 'same-origin',
+        }
+
+    def _search_payload(self, case_type, case_number, filing_year):
+        """POST body for the case status endpoint"""
+        return {
+            "case_type": case_type,
+            "case_no": case_number,
+            "case_year": str(filing_year)
+        }
+
+    def _handle_response(self, response, case_type, case_number, filing_year, fingerprint=None):
+        """Validate a case status response and build the result, skipping the parse when unchanged"""
+        if response.status_code == 304:
+            self.rate_limiter.report(self.host)
+            return unchanged_result(response_fingerprint(response, fingerprint))
+        # Keep the raw response for the fixture corpus when recording is enabled
+        record_response('ecourts', case_type, case_number, filing_year, response.text, 'json')
+        self._check_blocked(response.text)
+        current = response_fingerprint(response)
+        if fingerprint and current['content_hash'] == fingerprint.get('content_hash'):
+            return unchanged_result(current, response.text[:5000])
+        result = self._build_result(response.text, case_type, case_number, filing_year)
+        result.update(content='changed', fingerprint=current)
+        return result
+
+    def _build_result(self, response_text, case_type, case_number, filing_year):
+        """Turn a case status response body into the search_case result"""
+        with STAGE_SECONDS.time(stage='parse'):
+            return self._parse_response(response_text, case_type, case_number, filing_year)
+
+    def _parse_response(self, response_text, case_type, case_number, filing_year):
+        # Try to parse as JSON, fallback to raw text
+        try:
+            result_json = json.loads(response_text)
+            case_details = self._parse_case_details(result_json, case_type, case_number, filing_year)
+            return {
+                'case_details': case_details,
+                'orders_judgments': [],
+                'raw_html': response_text[:5000],
+                'query_timestamp': datetime.now().isoformat()
+            }
+        except Exception as json_err:
+            self.logger.error(f"Response not JSON or unexpected format: {json_err}")
+            # Return raw response for debugging
+            return {
+                'case_details': {
+                    'case_id': f"{case_type}/{case_number}/{filing_year}",
+                    'case_type': case_type,
+                    'case_number': case_number,
+                    'filing_year': filing_year,
+                    'court_name': 'Delhi High Court',
+                    'status': 'Response not JSON or unexpected format',
+                    'raw_response': response_text[:1000]
+                },
+                'orders_judgments': [],
+                'raw_html': response_text[:5000],
+                'query_timestamp': datetime.now().isoformat()
+            }
+
     def _parse_case_details(self, result_json, case_type, case_number, filing_year):
         # Minimal parser for the Delhi High Court JSON response
         # Adjust keys as per actual API response structure
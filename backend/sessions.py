@@ -0,0 +1,144 @@
+import itertools
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from breaker import CircuitOpen
+from metrics import STAGE_SECONDS
+
+
+class PortalSession:
+    """A requests.Session plus the portal state it has been warmed with"""
+
+    def __init__(self, index, user_agent, pool_connections, pool_maxsize):
+        self.index = index
+        self.user_agent = user_agent
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['User-Agent'] = user_agent
+        self.tokens = {}
+        self.warmed_at = None
+        self.uses = 0
+        self.lock = threading.Lock()
+
+    def age(self):
+        return time.monotonic() - self.warmed_at if self.warmed_at is not None else None
+
+
+class SessionPool:
+    """Round-robin pool of pre-warmed portal sessions.
+
+    warmup(portal_session) performs whatever requests a fresh session needs
+    (cookie GET, form page) and returns the tokens to reuse, such as
+    __VIEWSTATE fields. Sessions are re-warmed once their tokens are older
+    than token_ttl or after invalidate(); an optional background thread
+    refreshes them before they expire so searches rarely pay for warmup.
+    """
+
+    def __init__(self, warmup, user_agents, size=4, token_ttl=600,
+                 pool_connections=4, pool_maxsize=8):
+        self.warmup = warmup
+        self.token_ttl = token_ttl
+        self.logger = logging.getLogger(__name__)
+        self.sessions = [
+            PortalSession(index, user_agents[index % len(user_agents)], pool_connections, pool_maxsize)
+            for index in range(max(1, size))
+        ]
+        self._cycle = itertools.cycle(self.sessions)
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stop = threading.Event()
+        self.checkouts = 0
+        self.warmups = 0
+        self.warmup_failures = 0
+        self.background_refreshes = 0
+        self.invalidations = 0
+
+    def checkout(self):
+        """Return the next session in round-robin order, warming it if needed"""
+        with self._lock:
+            portal_session = next(self._cycle)
+            self.checkouts += 1
+        if self._needs_warmup(portal_session):
+            self._warm(portal_session)
+        portal_session.uses += 1
+        return portal_session
+
+    def update_tokens(self, portal_session, tokens):
+        """Store tokens returned by a later response (e.g. a new __VIEWSTATE)"""
+        if tokens:
+            with portal_session.lock:
+                portal_session.tokens = tokens
+
+    def invalidate(self, portal_session):
+        """Force a session to be re-warmed, e.g. after a block page or error"""
+        with portal_session.lock:
+            portal_session.warmed_at = None
+            portal_session.tokens = {}
+            portal_session.session.cookies.clear()
+        with self._lock:
+            self.invalidations += 1
+
+    def _needs_warmup(self, portal_session, margin=1.0):
+        age = portal_session.age()
+        return age is None or age >= self.token_ttl * margin
+
+    def _warm(self, portal_session, margin=1.0):
+        with portal_session.lock:
+            # Another thread may have warmed it while we waited for the lock
+            if not self._needs_warmup(portal_session, margin):
+                return
+            try:
+                with STAGE_SECONDS.time(stage='session_warmup'):
+                    portal_session.tokens = self.warmup(portal_session) or {}
+                portal_session.warmed_at = time.monotonic()
+                with self._lock:
+                    self.warmups += 1
+            except CircuitOpen:
+                raise
+            except Exception as e:
+                with self._lock:
+                    self.warmup_failures += 1
+                self.logger.warning(f"Could not warm portal session {portal_session.index}: {e}")
+
+    def start_refresher(self, interval=30):
+        """Refresh sessions in the background once they pass 80% of token_ttl"""
+        if self._refresher is not None:
+            return
+        self._refresher = threading.Thread(target=self._refresh_loop, args=(interval,),
+                                           name='session-refresh', daemon=True)
+        self._refresher.start()
+
+    def stop_refresher(self):
+        self._stop.set()
+
+    def _refresh_loop(self, interval):
+        while not self._stop.wait(interval):
+            for portal_session in self.sessions:
+                if self._needs_warmup(portal_session, margin=0.8):
+                    try:
+                        self._warm(portal_session, margin=0.8)
+                    except CircuitOpen:
+                        # Leave the sessions alone while the portal is known to be down
+                        break
+                    with self._lock:
+                        self.background_refreshes += 1
+
+    def stats(self):
+        """Return pool counters for the stats endpoint"""
+        with self._lock:
+            warm = sum(1 for portal_session in self.sessions if not self._needs_warmup(portal_session))
+            return {
+                'size': len(self.sessions),
+                'warm': warm,
+                'checkouts': self.checkouts,
+                'warmups': self.warmups,
+                'warmup_failures': self.warmup_failures,
+                'background_refreshes': self.background_refreshes,
+                'invalidations': self.invalidations
+            }
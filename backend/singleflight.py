@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; cross-worker coalescing is disabled there
+    fcntl = None
+
+
+class _Call:
+    """An in-flight call that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single execution.
+
+    Callers in the same process wait on the first caller's execution and
+    share its result or its exception. When lock_dir is set, the executing
+    caller also holds an flock on a per-key file so that other gunicorn
+    workers wait for it and then re-check shared storage instead of
+    fetching again.
+    """
+
+    def __init__(self, lock_dir=None, lock_timeout=120):
+        self.lock_dir = lock_dir if fcntl else None
+        self.lock_timeout = lock_timeout
+        self.logger = logging.getLogger(__name__)
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+        self.shared_errors = 0
+        self.cross_worker_waits = 0
+        self.cross_worker_hits = 0
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key, fn, recheck=None):
+        """Run fn() once for all concurrent callers of key.
+
+        recheck(waited_seconds) is called after waiting on another worker's
+        lock; if it returns a value, that value is used instead of calling fn.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.collapsed += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                with self._lock:
+                    self.shared_errors += 1
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._execute(key, fn, recheck)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def _execute(self, key, fn, recheck):
+        if not self.lock_dir:
+            return self._run(fn)
+        path = os.path.join(self.lock_dir, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.lock')
+        with open(path, 'a') as lock_file:
+            started = time.monotonic()
+            waited = not self._try_lock(lock_file)
+            if waited:
+                with self._lock:
+                    self.cross_worker_waits += 1
+                if not self._wait_lock(lock_file, started):
+                    self.logger.warning(f"Timed out waiting for another worker on {key}, fetching anyway")
+                    return self._run(fn)
+            try:
+                if waited and recheck:
+                    result = recheck(time.monotonic() - started)
+                    if result is not None:
+                        with self._lock:
+                            self.cross_worker_hits += 1
+                        return result
+                return self._run(fn)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _run(self, fn):
+        with self._lock:
+            self.executions += 1
+        return fn()
+
+    def _try_lock(self, lock_file):
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _wait_lock(self, lock_file, started):
+        while time.monotonic() - started < self.lock_timeout:
+            if self._try_lock(lock_file):
+                return True
+            time.sleep(0.1)
+        return False
+
+    def stats(self):
+        """Return coalescing counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'collapsed': self.collapsed,
+                'shared_errors': self.shared_errors,
+                'in_flight': len(self._calls),
+                'cross_worker_enabled': bool(self.lock_dir),
+                'cross_worker_waits': self.cross_worker_waits,
+                'cross_worker_hits': self.cross_worker_hits
+            }
@@ -0,0 +1,139 @@
+import logging
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def next_check_delay(case_details, today=None):
+    """Seconds until a watched case should be refreshed again.
+
+    Cases with a hearing in the next couple of days are checked hourly,
+    the rest of the coming month progressively less often, and disposed
+    cases only weekly. A +/-10% jitter keeps checks from bunching up.
+    """
+    today = today or date.today()
+    status = (case_details.get('status') or '').lower()
+    hearing = _as_date(case_details.get('next_hearing_date'))
+    if 'disposed' in status or 'dismissed' in status:
+        delay = 7 * DAY
+    elif hearing and 0 <= (hearing - today).days <= 2:
+        delay = HOUR
+    elif hearing and 0 <= (hearing - today).days <= 7:
+        delay = 6 * HOUR
+    elif hearing and 0 <= (hearing - today).days <= 30:
+        delay = DAY
+    else:
+        delay = 3 * DAY
+    return delay * random.uniform(0.9, 1.1)
+
+
+class CaseWatcher:
+    """Background refresher for watched cases.
+
+    Every tick it claims the watches that are due (claim_due leases them,
+    so several workers can run a watcher without double-fetching), spreads
+    their fetches evenly across the tick instead of bursting them at the
+    rate limiter, applies the results through apply_changes (which writes
+    only differences and returns change events) and schedules each case's
+    next check with next_check_delay.
+    """
+
+    def __init__(self, fetch_case, claim_due, apply_changes, finish_check, on_changes=None,
+                 tick=60, batch=20, lease=600, retry_delay=900):
+        self.fetch_case = fetch_case
+        self.claim_due = claim_due
+        self.apply_changes = apply_changes
+        self.finish_check = finish_check
+        self.on_changes = on_changes
+        self.tick = tick
+        self.batch = batch
+        self.lease = lease
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.checks = 0
+        self.changed_cases = 0
+        self.events = 0
+        self.failures = 0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='case-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Watcher tick failed: {str(e)}")
+            self._stop.wait(max(0.0, self.tick - (time.monotonic() - started)))
+
+    def run_once(self):
+        """Check every due watch once; returns how many were checked"""
+        due = self.claim_due(self.batch, self.lease)
+        spacing = self.tick / len(due) if due else 0
+        for index, watched in enumerate(due):
+            if index and self._stop.wait(spacing):
+                break
+            self._check(watched)
+        return len(due)
+
+    def _check(self, watched):
+        case_id = watched['case_id']
+        try:
+            result = self.fetch_case(watched['case_type'], watched['case_number'], watched['filing_year'],
+                                     watched.get('court'))
+            # Content identical to the stored copy has nothing to diff
+            events = [] if result.get('content') == 'unchanged' else self.apply_changes(result)
+            if events:
+                with self._lock:
+                    self.changed_cases += 1
+                    self.events += len(events)
+                self.logger.info(f"Watched case {case_id} changed: {len(events)} event(s)")
+                if self.on_changes:
+                    self.on_changes(watched, result, events)
+            next_check = datetime.utcnow() + timedelta(seconds=next_check_delay(result['case_details']))
+            self.finish_check(case_id, next_check, None)
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            self.logger.warning(f"Could not refresh watched case {case_id}: {str(e)}")
+            self.finish_check(case_id, datetime.utcnow() + timedelta(seconds=self.retry_delay), str(e))
+        finally:
+            with self._lock:
+                self.checks += 1
+
+    def stats(self):
+        """Return watcher counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'running': self._thread is not None and not self._stop.is_set(),
+                'tick_seconds': self.tick,
+                'checks': self.checks,
+                'changed_cases': self.changed_cases,
+                'events': self.events,
+                'failures': self.failures
+            }
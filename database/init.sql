@@ -11,20 +11,71 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
--- Case queries table for logging all search attempts
+-- Case queries table for logging all search attempts.
+-- Partitioned by month on query_timestamp so old months can be dropped or
+-- archived cheaply (see backend/retention.py). Existing unpartitioned tables
+-- must be migrated by renaming the old table, creating this one and running
+-- INSERT INTO case_queries SELECT ... FROM the renamed table.
 CREATE TABLE IF NOT EXISTS case_queries (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     case_type VARCHAR(100) NOT NULL,
     case_number VARCHAR(100) NOT NULL,
     filing_year INTEGER NOT NULL,
-    query_timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    query_timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
     success BOOLEAN DEFAULT FALSE,
     error_message TEXT,
     raw_response TEXT,
     parsed_data JSONB,
     ip_address INET,
     user_agent TEXT,
+    PRIMARY KEY (id, query_timestamp),
     CONSTRAINT check_filing_year CHECK (filing_year >= 1950 AND filing_year <= EXTRACT(YEAR FROM CURRENT_DATE) + 1)
+) PARTITION BY RANGE (query_timestamp);
+
+-- Catch-all partition so inserts never fail when a month is missing; rows that
+-- land here are moved into their month's partition when it is created, and
+-- retention.py expires old ones
+CREATE TABLE IF NOT EXISTS case_queries_default PARTITION OF case_queries DEFAULT;
+
+-- Create the partition for the month containing month_start, e.g. case_queries_p202401.
+-- The table is filled from the default partition before it is attached, since
+-- attaching a range the default partition still holds rows for would fail.
+CREATE OR REPLACE FUNCTION create_case_queries_partition(month_start DATE)
+RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := DATE_TRUNC('month', month_start);
+    end_date DATE := DATE_TRUNC('month', month_start) + INTERVAL '1 month';
+    partition_name TEXT := 'case_queries_p' || TO_CHAR(start_date, 'YYYYMM');
+BEGIN
+    IF TO_REGCLASS(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    EXECUTE FORMAT(
+        'CREATE TABLE %I (LIKE case_queries INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+    );
+    EXECUTE FORMAT(
+        'WITH moved AS (DELETE FROM case_queries_default WHERE query_timestamp >= %L AND query_timestamp < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE FORMAT(
+        'ALTER TABLE case_queries ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+    RETURN partition_name;
+END;
+$$ language 'plpgsql';
+
+-- Current month plus two ahead; retention.py keeps creating future months
+SELECT create_case_queries_partition((CURRENT_DATE + (n || ' month')::INTERVAL)::DATE)
+FROM generate_series(0, 2) AS n;
+
+-- Compressed raw responses moved out of case_queries by compaction
+CREATE TABLE IF NOT EXISTS case_query_raw (
+    query_id INTEGER PRIMARY KEY,
+    query_timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    raw_response_gz BYTEA NOT NULL
 );
 
 -- Case details table for storing parsed case information
@@ -43,8 +94,11 @@ CREATE TABLE IF NOT EXISTS case_details (
     court_name VARCHAR(200),
     judge_name VARCHAR(200),
     last_updated TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    content_hash VARCHAR(64),
+    etag VARCHAR(200),
+    last_modified VARCHAR(100),
     CONSTRAINT unique_case_id UNIQUE (case_id),
-    CONSTRAINT unique_case_info UNIQUE (case_type, case_number, filing_year)
+    CONSTRAINT unique_case_info UNIQUE (court_name, case_type, case_number, filing_year)
 );
 
 -- Orders and judgments table
@@ -59,8 +113,65 @@ CREATE TABLE IF NOT EXISTS orders_judgments (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Asynchronous search jobs (POST /api/search?async=1)
+CREATE TABLE IF NOT EXISTS search_jobs (
+    id VARCHAR(32) PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    params JSONB,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Maintained statistics, updated by the application write path
+-- (seeded from the base tables on first read, see database.rebuild_statistics)
+CREATE TABLE IF NOT EXISTS stat_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+-- Hourly query rollups per case type
+CREATE TABLE IF NOT EXISTS query_rollups (
+    bucket TIMESTAMP NOT NULL,
+    case_type VARCHAR(100) NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    successful INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, case_type)
+);
+
+-- Cases refreshed in the background by the watcher (see watcher.py)
+CREATE TABLE IF NOT EXISTS watched_cases (
+    id SERIAL PRIMARY KEY,
+    case_id VARCHAR(200) UNIQUE NOT NULL,
+    court VARCHAR(50),
+    case_type VARCHAR(100) NOT NULL,
+    case_number VARCHAR(100) NOT NULL,
+    filing_year INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    last_checked_at TIMESTAMP,
+    next_check_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    check_count INTEGER DEFAULT 0,
+    last_error TEXT
+);
+
+-- Differences the watcher found between consecutive refreshes of a case
+CREATE TABLE IF NOT EXISTS case_change_events (
+    id SERIAL PRIMARY KEY,
+    case_id VARCHAR(200) NOT NULL,
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    event_type VARCHAR(30) NOT NULL,
+    field VARCHAR(50),
+    old_value TEXT,
+    new_value TEXT
+);
+
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_case_queries_timestamp ON case_queries(query_timestamp DESC);
+-- (query_timestamp, id) keyset pagination for /api/history, plus the filtered variants
+CREATE INDEX IF NOT EXISTS idx_case_queries_timestamp ON case_queries(query_timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_case_queries_type_timestamp ON case_queries(case_type, query_timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_case_queries_success_timestamp ON case_queries(success, query_timestamp DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_case_queries_success ON case_queries(success);
 CREATE INDEX IF NOT EXISTS idx_case_queries_case_info ON case_queries(case_type, case_number, filing_year);
 
@@ -71,6 +182,12 @@ CREATE INDEX IF NOT EXISTS idx_case_details_dates ON case_details(filing_date, n
 CREATE INDEX IF NOT EXISTS idx_orders_case_detail ON orders_judgments(case_detail_id);
 CREATE INDEX IF NOT EXISTS idx_orders_date ON orders_judgments(order_date DESC);
 
+CREATE INDEX IF NOT EXISTS idx_search_jobs_created ON search_jobs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_case_query_raw_timestamp ON case_query_raw(query_timestamp);
+CREATE INDEX IF NOT EXISTS idx_watched_cases_next_check ON watched_cases(next_check_at);
+CREATE INDEX IF NOT EXISTS idx_case_change_events_case ON case_change_events(case_id, detected_at DESC);
+CREATE INDEX IF NOT EXISTS idx_case_change_events_detected ON case_change_events(detected_at DESC);
+
 -- Create a function to update last_updated timestamp
 CREATE OR REPLACE FUNCTION update_last_updated_column()
 RETURNS TRIGGER AS $$